@@ -1,7 +1,11 @@
+import json
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from .models import User, UserProfile
+from .models import EmailJob, Skill, SkillAlias, SlowQuery, User, UserImportJob, UserProfile
+from .pagination import ApproximateCountPaginator
 
 
 class UserProfileInline(admin.StackedInline):
@@ -15,7 +19,9 @@ class UserAdmin(BaseUserAdmin):
     list_display = ('email', 'first_name', 'last_name', 'user_type', 'is_email_verified', 'is_active', 'date_joined')
     list_filter = ('user_type', 'is_email_verified', 'is_active', 'date_joined')
     search_fields = ('email', 'first_name', 'last_name')
-    ordering = ('-date_joined',)
+    ordering = ('-date_joined', '-id')
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
@@ -24,7 +30,7 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('user_type', 'is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions'),
         }),
         (_('Important dates'), {'fields': ('last_login', 'date_joined')}),
-        (_('Email verification'), {'fields': ('is_email_verified', 'email_verification_token')}),
+        (_('Email verification'), {'fields': ('is_email_verified',)}),
     )
     
     add_fieldsets = (
@@ -38,7 +44,10 @@ class UserAdmin(BaseUserAdmin):
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'user_type', 'location', 'experience_years', 'company_name')
+    list_select_related = ('user',)
     list_filter = ('user__user_type', 'experience_years', 'created_at')
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
     search_fields = ('user__email', 'user__first_name', 'user__last_name', 'company_name')
     readonly_fields = ('created_at', 'updated_at')
     
@@ -63,4 +72,84 @@ class UserProfileAdmin(admin.ModelAdmin):
     user_type.short_description = 'User Type'
 
 
-admin.site.register(User, UserAdmin) 
\ No newline at end of file
+admin.site.register(User, UserAdmin) 
+
+
+@admin.register(EmailJob)
+class EmailJobAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('subject', 'recipients')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+    ordering = ('-created_at',)
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'normalized_name', 'parent', 'created_at')
+    list_select_related = ('parent',)
+    search_fields = ('normalized_name', 'aliases__name')
+    raw_id_fields = ('parent',)
+    inlines = (SkillAliasInline,)
+
+
+@admin.register(UserImportJob)
+class UserImportJobAdmin(admin.ModelAdmin):
+    list_display = ('file', 'status', 'total_rows', 'created_rows', 'failed_rows', 'created_by', 'created_at')
+    list_filter = ('status', 'created_at')
+    list_select_related = ('created_by',)
+    readonly_fields = (
+        'status', 'total_rows', 'created_rows', 'failed_rows', 'errors', 'last_error',
+        'created_by', 'created_at', 'started_at', 'finished_at',
+    )
+    ordering = ('-created_at',)
+    
+    def get_readonly_fields(self, request, obj=None):
+        if obj is not None:
+            # The upload can't change once the job exists
+            return ('file', 'format', 'send_invitations') + self.readonly_fields
+        return self.readonly_fields
+    
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+        if not change:
+            self.message_user(request, _('Import queued; it runs in the process_user_imports worker.'))
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the slow-query buffer (see ``api.slow_queries``).
+    """
+    list_display = ('captured_at', 'duration_ms', 'route', 'fingerprint', 'statement', 'has_plan')
+    list_filter = ('route', 'database', 'captured_at')
+    search_fields = ('fingerprint', 'sql', 'route')
+    fields = ('captured_at', 'duration_ms', 'database', 'route', 'fingerprint', 'sql', 'stack', 'formatted_plan')
+    readonly_fields = fields
+    ordering = ('-id',)
+    
+    def statement(self, obj):
+        return obj.sql if len(obj.sql) <= 100 else obj.sql[:100] + '...'
+    
+    def has_plan(self, obj):
+        return obj.plan is not None
+    has_plan.boolean = True
+    
+    def formatted_plan(self, obj):
+        if obj.plan is None:
+            return '-'
+        return format_html('<pre>{}</pre>', json.dumps(obj.plan, indent=2))
+    formatted_plan.short_description = 'Plan'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -3,4 +3,14 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'api' 
\ No newline at end of file
+    name = 'api'
+    
+    def ready(self):
+        from django.conf import settings
+        
+        from . import metrics, signals  # noqa: F401
+        from .jwt_keys import install_token_backend
+        
+        install_token_backend()
+        if settings.METRICS_ENABLED:
+            metrics.install()
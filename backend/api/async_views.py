@@ -0,0 +1,168 @@
+"""
+Async variants of the I/O-bound endpoints, routed when the project runs
+under ASGI (``SERVER_MODE = 'asgi'``, see ``hireiq_backend/asgi.py``).
+
+DRF views are synchronous, so ``AsyncAPIView`` runs DRF's request setup
+(authentication, permissions, throttling) in a worker thread and awaits
+the handler on the event loop. While a handler waits on the database or
+cache, the worker keeps serving other connections; under WSGI a sync
+worker would sit blocked. The views reuse the sync views' configuration
+and helpers, so both modes answer identically.
+
+Django has no async database driver yet: the async ORM and cache calls
+run their sync counterparts in a thread, but without holding the loop.
+"""
+import asyncio
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.cache import cache
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .emails import asend_password_reset_email, asend_verification_email
+from .models import User, UserToken
+from .serializers import PasswordResetRequestSerializer, UserRegistrationSerializer, UserSerializer
+from .user_cache import auser_payload_response
+from .views import HealthCheckView, PasswordResetRequestView, UserRegistrationView
+
+
+class AsyncAPIView(APIView):
+    """
+    ``APIView`` whose handlers are coroutines.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # csrf_exempt wraps the view in a plain function; keep it async
+        return markcoroutinefunction(view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncHealthCheckView(AsyncAPIView, HealthCheckView):
+    """
+    Health check endpoint for the API
+    """
+
+    async def get(self, request):
+        database, cache_status = await asyncio.gather(self._acheck_database(), self._acheck_cache())
+        return self._respond({'database': database, 'cache': cache_status})
+
+    async def _acheck_database(self):
+        # Raw cursors have no async API
+        return await sync_to_async(self._check_database)()
+
+    async def _acheck_cache(self):
+        try:
+            await cache.aset('health_check', 'ok', 1)
+            await cache.aget('health_check')
+            result = {'status': 'healthy', 'message': 'Cache connection successful'}
+        except Exception as e:
+            result = {'status': 'unhealthy', 'message': str(e)}
+        return self._describe_cache(result)
+
+
+class AsyncUserInfoView(AsyncAPIView):
+    """
+    Get current user information.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    async def get(self, request):
+        return await auser_payload_response(request, request.user)
+
+
+def _register(serializer):
+    # Validation and hashing touch the database and the hashing pool
+    if not serializer.is_valid():
+        return None, None
+    user = serializer.save()
+    return user, UserSerializer(user).data
+
+
+class AsyncUserRegistrationView(AsyncAPIView, UserRegistrationView):
+    """
+    User registration endpoint.
+    """
+
+    async def post(self, request):
+        serializer = UserRegistrationSerializer(data=request.data)
+        user, data = await sync_to_async(_register)(serializer)
+        if user is None:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        token = await UserToken.objects.aissue(user, UserToken.Purpose.EMAIL_VERIFICATION)
+        await asend_verification_email(user, token)
+
+        return Response({
+            'message': 'User registered successfully. Please check your email for verification.',
+            'user': data
+        }, status=status.HTTP_201_CREATED)
+
+
+class AsyncPasswordResetRequestView(AsyncAPIView, PasswordResetRequestView):
+    """
+    Password reset request endpoint.
+    """
+
+    async def post(self, request):
+        serializer = PasswordResetRequestSerializer(data=request.data)
+        if not await sync_to_async(serializer.is_valid)():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user = await User.objects.aget(email=serializer.validated_data['email'])
+        token = await UserToken.objects.aissue(user, UserToken.Purpose.PASSWORD_RESET)
+        await asend_password_reset_email(user, token)
+
+        return Response({
+            'message': 'Password reset email sent'
+        }, status=status.HTTP_200_OK)
+
+
+class AsyncResendVerificationView(AsyncAPIView):
+    """
+    Resend email verification.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    async def post(self, request):
+        email = request.data.get('email')
+        if not email:
+            return Response({'error': 'Email is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user = await User.objects.aget(email=email)
+        except User.DoesNotExist:
+            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        if user.is_email_verified:
+            return Response({'error': 'Email is already verified'}, status=status.HTTP_400_BAD_REQUEST)
+
+        token = await UserToken.objects.aissue(user, UserToken.Purpose.EMAIL_VERIFICATION)
+        await asend_verification_email(user, token)
+
+        return Response({'message': 'Verification email sent'}, status=status.HTTP_200_OK)
@@ -0,0 +1,43 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication as BaseJWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+from .tokens import TokenUser
+
+
+class JWTAuthentication(BaseJWTAuthentication):
+    """
+    JWT authentication that loads the user together with its profile, so
+    views serializing ``request.user`` need no further queries.
+    """
+    
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        
+        try:
+            user = User.objects.with_profile().get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        
+        return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Lazy variant: builds a ``TokenUser`` from the token's user id instead
+    of querying the user table on every request; the row loads when a view
+    or permission first reads the user.
+    """
+    
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM in validated_token:
+            return TokenUser(validated_token)
+        return super().get_user(validated_token)
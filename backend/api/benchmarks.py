@@ -0,0 +1,24 @@
+"""
+Helpers shared by the ``benchmark_*`` management commands.
+"""
+import statistics
+
+
+def percentile(timings, p):
+    """
+    The ``p`` quantile (0 to 1) of ``timings``, which must be sorted.
+    """
+    return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+
+def summary(timings):
+    """
+    Mean, p50 and p99 of ``timings`` in milliseconds, as one line.
+    """
+    if not timings:
+        return 'no successful requests'
+    timings = sorted(timings)
+    return (
+        f'mean {statistics.mean(timings):.2f}ms  p50 {percentile(timings, 0.50):.2f}ms  '
+        f'p99 {percentile(timings, 0.99):.2f}ms'
+    )
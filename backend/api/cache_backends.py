@@ -0,0 +1,149 @@
+"""
+Cache backends that count hits, misses and call latency.
+
+Django creates one backend instance per thread, so counters are kept in a
+module-level registry keyed by cache location and shared by every thread of
+the process. They are per-process: each gunicorn worker reports its own.
+"""
+import threading
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from .metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class CacheMetrics:
+    """
+    Thread-safe hit/miss/latency counters for one cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.calls = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def record(self, elapsed, hits=0, misses=0, error=False):
+        with self._lock:
+            self.calls += 1
+            self.hits += hits
+            self.misses += misses
+            self.errors += int(error)
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'calls': self.calls,
+                'hits': self.hits,
+                'misses': self.misses,
+                'errors': self.errors,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'avg_latency_ms': round(self.total_seconds * 1000 / self.calls, 3) if self.calls else None,
+                'max_latency_ms': round(self.max_seconds * 1000, 3),
+            }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_metrics(location):
+    with _registry_lock:
+        if location not in _registry:
+            _registry[location] = CacheMetrics()
+        return _registry[location]
+
+
+class InstrumentedCacheMixin:
+    """
+    Records every read and write against the metrics for this cache's
+    location. Reads count towards hits/misses, all calls towards latency.
+Lookups also count towards the current request's metrics (``api.metrics``).
+    """
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        location = server if isinstance(server, str) else ','.join(server)
+        self.metrics = get_metrics(location or 'locmem')
+
+    def _timed(self, func, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except ValueError:
+            # incr()/decr() on a missing key; not a backend failure
+            self.metrics.record(time.perf_counter() - start)
+            raise
+        except Exception:
+            self.metrics.record(time.perf_counter() - start, error=True)
+            raise
+        return result, time.perf_counter() - start
+
+    def get(self, key, default=None, version=None):
+        value, elapsed = self._timed(super().get, key, _MISSING, version=version)
+        hit = value is not _MISSING
+        self.metrics.record(elapsed, hits=int(hit), misses=int(not hit))
+        record_cache_lookup(int(hit), int(not hit))
+        return value if hit else default
+
+    def _record_call(self, func, *args, **kwargs):
+        result, elapsed = self._timed(func, *args, **kwargs)
+        self.metrics.record(elapsed)
+        return result
+
+    def set(self, *args, **kwargs):
+        return self._record_call(super().set, *args, **kwargs)
+
+    def add(self, *args, **kwargs):
+        return self._record_call(super().add, *args, **kwargs)
+
+    def set_many(self, *args, **kwargs):
+        return self._record_call(super().set_many, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._record_call(super().delete, *args, **kwargs)
+
+    def delete_many(self, *args, **kwargs):
+        return self._record_call(super().delete_many, *args, **kwargs)
+
+    def incr(self, *args, **kwargs):
+        return self._record_call(super().incr, *args, **kwargs)
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    """
+    Django's Redis backend with metrics. Connection pool options such as
+    ``max_connections`` go in ``OPTIONS``.
+    """
+
+    def get_many(self, keys, version=None):
+        # Redis fetches all keys in one MGET; the base implementation used by
+        # LocMem loops over get() and is already counted there.
+        keys = list(keys)
+        values, elapsed = self._timed(super().get_many, keys, version=version)
+        self.metrics.record(elapsed, hits=len(values), misses=len(keys) - len(values))
+        record_cache_lookup(len(values), len(keys) - len(values))
+        return values
+
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    """
+    Per-process stand-in used in tests and when no Redis URL is configured.
+    """
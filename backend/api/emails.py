@@ -0,0 +1,213 @@
+"""
+Durable outbound email queue.
+
+Views call the ``send_*`` helpers, which only insert an ``EmailJob`` row.
+Delivery happens in the ``process_email_outbox`` management command, which
+sends due jobs in batches over a single backend connection and retries
+failures with exponential backoff.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailJob
+
+logger = logging.getLogger(__name__)
+
+
+def _outbox_setting(name, default):
+    return getattr(settings, f'EMAIL_OUTBOX_{name}', default)
+
+
+def _job(subject, body, recipients, from_email=None):
+    return EmailJob(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipients),
+    )
+
+
+def queue_email(subject, body, recipients, from_email=None):
+    """
+    Queue an email for delivery by the outbox worker.
+    """
+    job = _job(subject, body, recipients, from_email)
+    job.save(force_insert=True)
+    return job
+
+
+async def aqueue_email(subject, body, recipients, from_email=None):
+    """
+    Async version of ``queue_email``.
+    """
+    job = _job(subject, body, recipients, from_email)
+    await job.asave(force_insert=True)
+    return job
+
+
+def _verification_message(user, token):
+    verification_url = f"http://localhost:8000/api/auth/verify-email/{token}/"
+    return (
+        'Verify your email - HireIQ',
+        f'Click the following link to verify your email: {verification_url}',
+        [user.email],
+    )
+
+
+def _password_reset_message(user, token):
+    reset_url = f"http://localhost:3000/reset-password/{token}"
+    return (
+        'Password Reset - HireIQ',
+        f'Click the following link to reset your password: {reset_url}',
+        [user.email],
+    )
+
+
+def send_verification_email(user, token):
+    """
+    Queue the email verification message for a newly registered user.
+    """
+    return queue_email(*_verification_message(user, token))
+
+
+async def asend_verification_email(user, token):
+    """
+    Async version of ``send_verification_email``.
+    """
+    return await aqueue_email(*_verification_message(user, token))
+
+
+def send_password_reset_email(user, token):
+    """
+    Queue the password reset message.
+    """
+    return queue_email(*_password_reset_message(user, token))
+
+
+async def asend_password_reset_email(user, token):
+    """
+    Async version of ``send_password_reset_email``.
+    """
+    return await aqueue_email(*_password_reset_message(user, token))
+
+
+def queue_invitation_emails(invitations):
+    """
+    Queue invitation messages for ``(user, token)`` pairs of imported
+    users in one insert.
+    """
+    return EmailJob.objects.bulk_create([
+        EmailJob(
+            subject='You have been invited to HireIQ',
+            body=(
+                'An account has been created for you. Choose a password to get started: '
+                f'http://localhost:3000/accept-invite/{token}'
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipients=[user.email],
+        )
+        for user, token in invitations
+    ])
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff for a job that has failed ``attempts`` times.
+    """
+    base = _outbox_setting('RETRY_BACKOFF', 30)
+    cap = _outbox_setting('RETRY_BACKOFF_MAX', 3600)
+    return timedelta(seconds=min(base * (2 ** (attempts - 1)), cap))
+
+
+def _claim_due_jobs(batch_size):
+    """
+    Lock and return the next batch of due jobs.
+
+    ``skip_locked`` lets several workers drain the outbox concurrently without
+    sending the same message twice. The claimed jobs are pushed into the
+    future so a worker that dies mid-batch only delays, never drops, them.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            EmailJob.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailJob.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if jobs:
+            lease = now + timedelta(seconds=_outbox_setting('LEASE_SECONDS', 300))
+            EmailJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                next_attempt_at=lease
+            )
+    return jobs
+
+
+def process_outbox(batch_size=None, backend=None):
+    """
+    Deliver one batch of due jobs over a single connection.
+
+    Returns a ``(sent, failed)`` tuple for the batch.
+    """
+    batch_size = batch_size or _outbox_setting('BATCH_SIZE', 50)
+    jobs = _claim_due_jobs(batch_size)
+    if not jobs:
+        return 0, 0
+
+    max_attempts = _outbox_setting('MAX_ATTEMPTS', 5)
+    backend = backend or _outbox_setting('BACKEND', None)
+    sent = failed = 0
+
+    connection = get_connection(backend=backend)
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning('Could not open email connection: %s', e)
+        for job in jobs:
+            _mark_failed(job, e, max_attempts)
+        return 0, len(jobs)
+
+    try:
+        for job in jobs:
+            message = EmailMessage(
+                subject=job.subject,
+                body=job.body,
+                from_email=job.from_email or settings.DEFAULT_FROM_EMAIL,
+                to=job.recipients,
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                logger.warning('Email job %s failed: %s', job.pk, e)
+                _mark_failed(job, e, max_attempts)
+                failed += 1
+            else:
+                _mark_sent(job)
+                sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def _mark_sent(job):
+    job.status = EmailJob.Status.SENT
+    job.attempts += 1
+    job.sent_at = timezone.now()
+    job.last_error = ''
+    job.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+
+
+def _mark_failed(job, error, max_attempts):
+    job.attempts += 1
+    job.last_error = str(error)
+    if job.attempts >= max_attempts:
+        job.status = EmailJob.Status.FAILED
+    else:
+        job.next_attempt_at = timezone.now() + retry_delay(job.attempts)
+    job.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
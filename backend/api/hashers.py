@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with its cost parameters taken from settings. Changing them
+    rehashes each password the next time it is verified.
+    """
+    
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+    
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+    
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
@@ -0,0 +1,117 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 and Argon2 are deliberately CPU-bound. Run inline in a threaded
+worker, a burst of logins holds the GIL and every request thread, and
+starves cheap read endpoints. The helpers here submit the hash to a
+per-process ``ProcessPoolExecutor`` of ``PASSWORD_HASHING_WORKERS``
+processes instead. The request thread still waits for the result, so the
+limit is on threads: at most ``PASSWORD_HASHING_MAX_PENDING`` of a
+process's threads may be hashing. By default that is one fewer than the
+worker's threads (see ``gunicorn.conf.py``). Beyond that, a request waits
+``PASSWORD_HASHING_QUEUE_TIMEOUT`` seconds for a slot and is then rejected
+with 503, which leaves a thread free for other requests.
+
+A single-threaded worker (sync, or uvicorn's sync thread) cannot serve
+anything else while it waits, so there the default is
+``PASSWORD_HASHING_WORKERS = 0``: everything runs inline and nothing is
+shed.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingCapacityExceeded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('The server is busy, please retry shortly.')
+    default_code = 'hashing_capacity_exceeded'
+    wait = 1  # Sent as Retry-After by DRF's exception handler
+
+
+_executor = None
+_executor_pid = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker():
+    # Spawned (non-forked) workers start without Django configured
+    import django
+    from django.apps import apps
+    
+    if not apps.ready:
+        django.setup()
+
+
+def _get_executor():
+    """
+    Create the pool lazily, and again after fork: a pool inherited from
+    the gunicorn master is not usable in the worker.
+    """
+    global _executor, _executor_pid, _slots
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                initializer=_init_worker,
+            )
+            _executor_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_MAX_PENDING)
+        return _executor, _slots
+
+
+def _run(func, *args):
+    if settings.PASSWORD_HASHING_WORKERS <= 0:
+        return func(*args)
+    
+    executor, slots = _get_executor()
+    if not slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+        raise HashingCapacityExceeded()
+    try:
+        return executor.submit(func, *args).result()
+    finally:
+        slots.release()
+
+
+def make_password(password):
+    return _run(hashers.make_password, password)
+
+
+def check_password(password, encoded):
+    return _run(hashers.check_password, password, encoded)
+
+
+def _must_update(encoded):
+    preferred = hashers.get_hasher('default')
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def check_user_password(user, password):
+    """
+    Pooled equivalent of ``user.check_password()``, including the upgrade
+    of hashes made with an outdated hasher or cost.
+    """
+    is_correct = check_password(password, user.password)
+    if is_correct and _must_update(user.password):
+        set_user_password(user, password)
+        user.save(update_fields=['password'])
+    return is_correct
+
+
+def set_user_password(user, password):
+    """
+    Pooled equivalent of ``user.set_password()``; the caller saves.
+    """
+    user.password = make_password(password)
+    user._password = password
@@ -0,0 +1,236 @@
+"""
+Bulk user import for recruiter onboarding.
+
+Rows stream from a CSV or JSONL file and are validated with the
+registration rules (``UserImportRowSerializer``). Valid rows are inserted a
+chunk at a time with ``bulk_create`` for users, profiles, skill links and
+invitation tokens, so an import costs a handful of statements per chunk
+instead of several per user. Imported users get an unusable password and
+an invitation email to choose one; nothing is hashed during the import.
+
+A row that fails validation, or collides with an existing email, is
+reported with its line number and skipped. It never aborts the import.
+"""
+import codecs
+import csv
+import io
+import json
+import logging
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import matrix_store
+from .emails import queue_invitation_emails
+from .models import ProfileSkill, User, UserImportJob, UserProfile, UserToken, profile_skill_names
+from .serializers import UserImportRowSerializer
+from .skills import resolve_skills
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'jsonl')
+PROFILE_FIELDS = ('location', 'experience_years', 'skills', 'bio')
+
+
+class ImportResult:
+    """
+    Running totals of an import, plus the first ``max_errors`` row errors.
+    """
+
+    def __init__(self, max_errors=1000):
+        self.total = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, row, email, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'email': email, 'errors': errors})
+
+
+def read_rows(stream, file_format):
+    """
+    Yield ``(row_number, data, error)`` from a binary or text stream without
+    reading it all into memory. ``data`` is ``None`` when the row could not
+    be parsed, with the reason in ``error``.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f'Unknown import format {file_format!r}')
+    if not isinstance(stream, io.TextIOBase):
+        stream = codecs.getreader('utf-8-sig')(stream)
+
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for data in reader:
+            # Data rows start on line 2, after the header
+            yield reader.line_num, {key: value for key, value in data.items() if value not in ('', None)}, None
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(data, dict):
+            yield number, None, 'Expected a JSON object'
+            continue
+        yield number, data, None
+
+
+def import_users(rows, chunk_size=500, send_invitations=True, result=None, on_chunk=None):
+    """
+    Import ``rows`` as produced by ``read_rows``. ``on_chunk(result)`` is
+    called after every chunk, e.g. to report progress.
+    """
+    result = result or ImportResult()
+    seen = set()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return result
+        valid = _validate_chunk(chunk, seen, result)
+        if valid:
+            try:
+                _insert(valid, send_invitations, result)
+            except IntegrityError:
+                # Someone registered one of these emails since we checked;
+                # fall back to row-at-a-time inserts to isolate it
+                for row in valid:
+                    try:
+                        _insert([row], send_invitations, result)
+                    except IntegrityError:
+                        result.add_error(row[0], row[1], {'email': ['A user with this email already exists.']})
+        if on_chunk:
+            on_chunk(result)
+
+
+def _validate_chunk(chunk, seen, result):
+    candidates = []
+    for number, data, error in chunk:
+        result.total += 1
+        if error:
+            result.add_error(number, None, {'non_field_errors': [error]})
+            continue
+        serializer = UserImportRowSerializer(data=data)
+        if not serializer.is_valid():
+            result.add_error(number, data.get('email'), serializer.errors)
+            continue
+        attrs = dict(serializer.validated_data)
+        email = User.objects.normalize_email(attrs.pop('email'))
+        if email in seen:
+            result.add_error(number, email, {'email': ['Duplicate email in this file.']})
+            continue
+        seen.add(email)
+        candidates.append((number, email, attrs))
+
+    existing = set(
+        User.objects.filter(email__in=[email for _, email, _ in candidates])
+        .values_list('email', flat=True)
+    )
+    valid = []
+    for number, email, attrs in candidates:
+        if email in existing:
+            result.add_error(number, email, {'email': ['A user with this email already exists.']})
+        else:
+            valid.append((number, email, attrs))
+    return valid
+
+
+def _insert(rows, send_invitations, result):
+    names = [profile_skill_names(attrs.get('skills')) for _, _, attrs in rows]
+    # Outside the transaction, which stays short; skills created for a
+    # chunk that rolls back are kept and reused by the row-at-a-time retry
+    skill_ids = resolve_skills(set().union(*names), create=True)
+
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                email=email,
+                password=make_password(None),
+                **{name: value for name, value in attrs.items() if name not in PROFILE_FIELDS},
+            )
+            for _, email, attrs in rows
+        ])
+        profiles = UserProfile.objects.bulk_create([
+            UserProfile(user=user, **{name: attrs[name] for name in PROFILE_FIELDS if name in attrs})
+            for user, (_, _, attrs) in zip(users, rows)
+        ])
+
+        ProfileSkill.objects.bulk_create([
+            ProfileSkill(profile=profile, skill_id=skill_id)
+            for profile, profile_names in zip(profiles, names)
+            for skill_id in {skill_ids[name] for name in profile_names}
+        ])
+
+        if send_invitations:
+            tokens = UserToken.objects.issue_many(users, UserToken.Purpose.INVITATION)
+            queue_invitation_emails(zip(users, tokens))
+
+        # bulk_create sends no post_save, so journal the matching matrix here
+        matrix_store.profiles_changed(profiles)
+    result.created += len(users)
+
+
+def run_import_job(job, chunk_size=None):
+    """
+    Import the file of a ``UserImportJob`` already marked as running,
+    saving progress after every chunk.
+    """
+    result = ImportResult(max_errors=settings.IMPORT_MAX_STORED_ERRORS)
+
+    def save_progress(result):
+        job.total_rows, job.created_rows, job.failed_rows = result.total, result.created, result.failed
+        job.save(update_fields=['total_rows', 'created_rows', 'failed_rows'])
+
+    try:
+        with job.file.open('rb') as stream:
+            import_users(
+                read_rows(stream, job.format),
+                chunk_size=chunk_size or settings.IMPORT_CHUNK_SIZE,
+                send_invitations=job.send_invitations,
+                result=result,
+                on_chunk=save_progress,
+            )
+    except Exception as e:
+        logger.exception('User import job %s failed', job.pk)
+        job.status = UserImportJob.Status.FAILED
+        job.last_error = f'{type(e).__name__}: {e}'
+    else:
+        job.status = UserImportJob.Status.DONE
+
+    job.errors = result.errors
+    job.finished_at = timezone.now()
+    save_progress(result)
+    job.save(update_fields=['status', 'errors', 'last_error', 'finished_at'])
+    return result
+
+
+def process_next_job(chunk_size=None):
+    """
+    Claim the oldest pending job and run it. Returns the job, or ``None``
+    when there is nothing to do.
+    """
+    with transaction.atomic():
+        job = (
+            UserImportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=UserImportJob.Status.PENDING)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = UserImportJob.Status.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+
+    run_import_job(job, chunk_size=chunk_size)
+    return job
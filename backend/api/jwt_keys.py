@@ -0,0 +1,191 @@
+"""
+Asymmetric JWT signing with key rotation.
+
+Access and refresh tokens are signed with the current RSA private key and
+carry its key id (``kid``) in the header. The public halves of the current
+and previous keys are published at ``/api/auth/jwks/`` so gateways and
+sidecars can verify tokens without calling the backend.
+
+Parsed keys are cached in-process. Key files are re-checked at most every
+``JWT_KEYS_RELOAD_INTERVAL`` seconds, so rotating a key only requires
+replacing the files:
+
+1. Generate a new key with ``manage.py generate_jwt_key``.
+2. Move the old key's public half into ``JWT_PREVIOUS_PUBLIC_KEY_FILES``.
+3. Point ``JWT_PRIVATE_KEY_FILE`` at the new key.
+4. Drop the old public key once ``REFRESH_TOKEN_LIFETIME`` has passed.
+
+Without ``JWT_PRIVATE_KEY_FILE`` tokens are HS256-signed with ``SECRET_KEY``
+as before and the key set is empty.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from jwt.algorithms import RSAAlgorithm
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def key_id(public_key):
+    """
+    RFC 7638 JWK thumbprint, stable for a given key.
+    """
+    jwk = json.loads(RSAAlgorithm.to_jwk(public_key))
+    canonical = json.dumps(
+        {name: jwk[name] for name in ('e', 'kty', 'n')},
+        separators=(',', ':'),
+        sort_keys=True,
+    )
+    return _b64url(hashlib.sha256(canonical.encode()).digest())
+
+
+class KeyRing:
+    """
+    Parsed signing key plus every public key still accepted for verification.
+    """
+
+    def __init__(self, private_key_file, public_key_files):
+        self.signing_key = None
+        self.signing_kid = None
+        self.verifying_keys = {}
+
+        if private_key_file:
+            with open(private_key_file, 'rb') as f:
+                self.signing_key = serialization.load_pem_private_key(f.read(), password=None)
+            public_key = self.signing_key.public_key()
+            self.signing_kid = key_id(public_key)
+            self.verifying_keys[self.signing_kid] = public_key
+
+        for path in public_key_files:
+            with open(path, 'rb') as f:
+                public_key = serialization.load_pem_public_key(f.read())
+            self.verifying_keys.setdefault(key_id(public_key), public_key)
+
+    def jwks(self):
+        keys = []
+        for kid, public_key in self.verifying_keys.items():
+            jwk = json.loads(RSAAlgorithm.to_jwk(public_key))
+            jwk.update({'kid': kid, 'alg': api_settings.ALGORITHM, 'use': 'sig'})
+            keys.append(jwk)
+        return {'keys': keys}
+
+
+_keyring = None
+_keyring_stamp = None
+_keyring_checked_at = 0.0
+_keyring_lock = threading.Lock()
+
+
+def _key_files():
+    private_key_file = getattr(settings, 'JWT_PRIVATE_KEY_FILE', '') or ''
+    public_key_files = tuple(getattr(settings, 'JWT_PREVIOUS_PUBLIC_KEY_FILES', ()) or ())
+    return private_key_file, public_key_files
+
+
+def _stamp(private_key_file, public_key_files):
+    paths = ((private_key_file,) if private_key_file else ()) + public_key_files
+    return tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+
+
+def get_keyring():
+    """
+    Return the cached ``KeyRing``, reloading it when key files change.
+    """
+    global _keyring, _keyring_stamp, _keyring_checked_at
+
+    interval = getattr(settings, 'JWT_KEYS_RELOAD_INTERVAL', 60)
+    if _keyring is not None and time.monotonic() - _keyring_checked_at < interval:
+        return _keyring
+
+    with _keyring_lock:
+        if _keyring is not None and time.monotonic() - _keyring_checked_at < interval:
+            return _keyring
+        private_key_file, public_key_files = _key_files()
+        stamp = _stamp(private_key_file, public_key_files)
+        if _keyring is None or stamp != _keyring_stamp:
+            _keyring = KeyRing(private_key_file, public_key_files)
+            _keyring_stamp = stamp
+        _keyring_checked_at = time.monotonic()
+        return _keyring
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """
+    simplejwt token backend that signs with the current key ring entry and
+    picks the verification key by the token's ``kid`` header.
+    """
+
+    def __init__(self):
+        super().__init__(
+            api_settings.ALGORITHM,
+            api_settings.SIGNING_KEY,
+            api_settings.VERIFYING_KEY,
+            api_settings.AUDIENCE,
+            api_settings.ISSUER,
+            api_settings.JWK_URL,
+            api_settings.LEEWAY,
+            api_settings.JSON_ENCODER,
+        )
+
+    @property
+    def asymmetric(self):
+        return not self.algorithm.startswith('HS')
+
+    def encode(self, payload):
+        if not self.asymmetric:
+            return super().encode(payload)
+
+        keyring = get_keyring()
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload['aud'] = self.audience
+        if self.issuer is not None:
+            jwt_payload['iss'] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            keyring.signing_key,
+            algorithm=self.algorithm,
+            headers={'kid': keyring.signing_kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def get_verifying_key(self, token):
+        if not self.asymmetric:
+            return super().get_verifying_key(token)
+
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+        except jwt.InvalidTokenError as e:
+            raise TokenBackendError(_('Token is invalid')) from e
+
+        try:
+            return get_keyring().verifying_keys[kid]
+        except KeyError:
+            raise TokenBackendError(_('Token is invalid'))
+
+
+def install_token_backend():
+    """
+    Make simplejwt use ``KeyRingTokenBackend`` everywhere.
+
+    Token classes, JWTAuthentication and the token views all resolve
+    ``rest_framework_simplejwt.state.token_backend`` at call time, so
+    replacing it once at startup covers every code path.
+    """
+    from rest_framework_simplejwt import state
+
+    state.token_backend = KeyRingTokenBackend()
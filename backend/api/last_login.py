@@ -0,0 +1,143 @@
+"""
+Coalesced ``last_login`` updates.
+
+Token issuance records the login time in a per-process buffer instead of
+writing the user row. A background thread flushes the buffer every
+``LAST_LOGIN_MAX_STALENESS`` seconds with one bulk ``UPDATE ... FROM
+(VALUES ...)`` per batch, so a login storm costs a handful of statements
+rather than one row lock per login. Repeated logins by the same user
+between flushes collapse into a single row update.
+
+Pending updates are flushed at interpreter exit; a worker that is killed
+loses at most one staleness window of ``last_login`` values.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+_pending = {}
+_lock = threading.Lock()
+_flusher = None
+_flusher_pid = None
+
+
+def _max_staleness():
+    return getattr(settings, 'LAST_LOGIN_MAX_STALENESS', 30)
+
+
+def _batch_size():
+    return getattr(settings, 'LAST_LOGIN_FLUSH_BATCH_SIZE', 1000)
+
+
+def record_login(user_id, when=None):
+    """
+    Queue a ``last_login`` update for ``user_id``.
+
+    With ``LAST_LOGIN_MAX_STALENESS = 0`` the row is written immediately.
+    """
+    when = when or timezone.now()
+    if _max_staleness() <= 0:
+        _write([(user_id, when)])
+        return
+
+    with _lock:
+        _ensure_flusher()
+        previous = _pending.get(user_id)
+        if previous is None or previous < when:
+            _pending[user_id] = when
+
+
+def _ensure_flusher():
+    """
+    Start the flusher thread in this process. Threads do not survive fork,
+    so a forked worker discards the parent's buffer and starts its own.
+    Must be called with ``_lock`` held.
+    """
+    global _flusher, _flusher_pid
+    if _flusher_pid == os.getpid() and _flusher is not None and _flusher.is_alive():
+        return
+    if _flusher_pid != os.getpid():
+        _pending.clear()
+    _flusher_pid = os.getpid()
+    _flusher = threading.Thread(target=_run_flusher, name='last-login-flusher', daemon=True)
+    _flusher.start()
+
+
+def _run_flusher():
+    while True:
+        time.sleep(_max_staleness())
+        try:
+            flush()
+        except Exception:
+            logger.exception('Failed to flush last_login updates')
+        finally:
+            # The flusher is idle between runs; don't hold a connection open
+            connection.close()
+
+
+def flush():
+    """
+    Write all buffered updates. Returns the number of users updated.
+    """
+    with _lock:
+        if not _pending:
+            return 0
+        updates = list(_pending.items())
+        _pending.clear()
+
+    size = _batch_size()
+    for start in range(0, len(updates), size):
+        try:
+            _write(updates[start:start + size])
+        except Exception:
+            _requeue(updates[start:])
+            raise
+    return len(updates)
+
+
+def _requeue(updates):
+    with _lock:
+        for user_id, when in updates:
+            previous = _pending.get(user_id)
+            if previous is None or previous < when:
+                _pending[user_id] = when
+
+
+def _write(updates):
+    table = connection.ops.quote_name(User._meta.db_table)
+    if connection.vendor == 'postgresql':
+        values = ', '.join(['(%s::bigint, %s::timestamptz)'] * len(updates))
+        params = [value for update in updates for value in update]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} AS u SET last_login = v.last_login '
+                f'FROM (VALUES {values}) AS v(id, last_login) '
+                'WHERE u.id = v.id AND (u.last_login IS NULL OR u.last_login < v.last_login)',
+                params,
+            )
+        return
+
+    # Other backends (SQLite in tests): same semantics, one statement per row
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            f'UPDATE {table} SET last_login = %s '
+            'WHERE id = %s AND (last_login IS NULL OR last_login < %s)',
+            [
+                (connection.ops.adapt_datetimefield_value(when), user_id,
+                 connection.ops.adapt_datetimefield_value(when))
+                for user_id, when in updates
+            ],
+        )
+
+
+atexit.register(flush)
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import ProfileSkill, UserProfile, profile_skill_names
+from api.skills import resolve_skills
+
+
+class Command(BaseCommand):
+    help = 'Rebuild profile-to-skill links from UserProfile.skills in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Profiles processed per transaction',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Seconds to sleep between batches to limit load on the database',
+        )
+
+    def handle(self, *args, **options):
+        last_pk = 0
+        profiles = links = 0
+        while True:
+            batch = list(
+                UserProfile.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'skills')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            links += self._rebuild(batch)
+            profiles += len(batch)
+            last_pk = batch[-1][0]
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Linked {profiles} profile(s) to skills with {links} row(s)'
+        ))
+
+    def _rebuild(self, batch):
+        """
+        Replace the links of one batch of profiles. Names are resolved for
+        the whole batch at once, so unseen skills cost one insert per batch.
+        """
+        names = {pk: profile_skill_names(skills) for pk, skills in batch}
+        skill_ids = resolve_skills(set().union(*names.values()), create=True)
+        # A set, since two spellings can resolve to the same skill
+        rows = {
+            (profile_id, skill_ids[name])
+            for profile_id, profile_names in names.items()
+            for name in profile_names
+        }
+        with transaction.atomic():
+            ProfileSkill.objects.filter(profile_id__in=names).delete()
+            ProfileSkill.objects.bulk_create(
+                [ProfileSkill(profile_id=profile_id, skill_id=skill_id) for profile_id, skill_id in rows]
+            )
+        return len(rows)
@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+from api.benchmarks import percentile
+
+
+class Command(BaseCommand):
+    help = 'Measure request latency with and without persistent database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Requests issued per mode',
+        )
+        parser.add_argument(
+            '--path',
+            default='/api/health/',
+            help='Endpoint to request (must hit the database)',
+        )
+        parser.add_argument(
+            '--conn-max-age',
+            type=int,
+            default=600,
+            help='CONN_MAX_AGE used for the pooled run',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                f'Database vendor is {connection.vendor}; connection setup cost '
+                'is only representative against a local Postgres.'
+            ))
+
+        client = Client(SERVER_NAME=settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost')
+        original = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            for label, max_age in (('no pooling', 0), ('persistent', options['conn_max_age'])):
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                self._run(client, label, options['path'], options['requests'])
+        finally:
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = original
+
+    def _run(self, client, label, path, count):
+        opened = []
+
+        def on_connect(sender, connection, **kwargs):
+            opened.append(connection.alias)
+
+        connection_created.connect(on_connect)
+        try:
+            client.get(path)  # Warm up URL resolving and imports
+            opened.clear()
+            timings = []
+            for _ in range(count):
+                start = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code >= 500:
+                    self.stderr.write(f'{path} returned {response.status_code}')
+        finally:
+            connection_created.disconnect(on_connect)
+
+        timings.sort()
+        self.stdout.write(
+            f'{label:>12}: mean {statistics.mean(timings):.2f}ms  '
+            f'p50 {percentile(timings, 0.50):.2f}ms  p95 {percentile(timings, 0.95):.2f}ms  '
+            f'p99 {percentile(timings, 0.99):.2f}ms  connections opened {len(opened)}'
+        )
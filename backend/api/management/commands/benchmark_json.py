@@ -0,0 +1,126 @@
+import io
+import json
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.models import User, UserProfile
+from api.renderers import FastJSONParser, FastJSONRenderer, orjson
+from api.serializers import CandidateSerializer, UserSerializer
+
+
+def sample_profile(index):
+    now = timezone.now()
+    user = User(
+        id=index,
+        email=f'candidate{index}@example.com',
+        first_name='Zoë',
+        last_name=f'Candidate {index}',
+        user_type=User.UserType.CANDIDATE,
+        is_email_verified=True,
+    )
+    profile = UserProfile(
+        id=index,
+        user=user,
+        bio='Backend engineer — distributed systems, data pipelines and APIs. ' * 3,
+        date_of_birth=date(1990, 1, 1) + timedelta(days=index),
+        location='Berlin, Germany',
+        skills=['Python', 'Django', 'PostgreSQL', 'Redis', 'Kubernetes', 'AWS'],
+        experience_years=index % 15,
+        education=[
+            {'degree': 'MSc Computer Science', 'school': 'TU München', 'year': 2014},
+            {'degree': 'BSc Mathematics', 'school': 'Universität Wien', 'year': 2012},
+        ],
+        created_at=now - timedelta(days=index),
+        updated_at=now,
+    )
+    user.profile = profile
+    return user, profile
+
+
+def payloads():
+    """
+    Representative response bodies: the nested user payload, a page of
+    candidate search results and a page of match results.
+    """
+    profiles = [sample_profile(index)[1] for index in range(1, 21)]
+    candidates = CandidateSerializer(profiles, many=True).data
+    breakdown = {'required_skills': 0.75, 'preferred_skills': 0.5, 'experience': 1.0, 'location': 1.0}
+    return {
+        'user': UserSerializer(sample_profile(1)[0]).data,
+        'candidate page': {
+            'next': 'http://localhost:8000/api/candidates/search/?cursor=eyJwIjpbMTIzXX0%3D',
+            'previous': None,
+            'results': candidates,
+        },
+        'match results': {
+            'results': [
+                {'score': 0.8125, 'breakdown': breakdown, 'candidate': candidate}
+                for candidate in candidates
+            ],
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON render and parse throughput of DRF (stdlib json) and api.renderers (orjson)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=1.0,
+            help='Time spent measuring each payload and engine',
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed; api.renderers is using the standard library')
+
+        engines = (
+            ('stdlib', JSONRenderer(), JSONParser()),
+            ('orjson', FastJSONRenderer(), FastJSONParser()),
+        )
+        for name, data in payloads().items():
+            outputs = {label: renderer.render(data) for label, renderer, _ in engines}
+            if json.loads(outputs['stdlib']) != json.loads(outputs['orjson']):
+                self.stderr.write(self.style.ERROR(f'{name}: orjson output differs from stdlib'))
+
+            size = len(outputs['stdlib'])
+            self.stdout.write(f'{name} ({size} bytes)')
+            rates = {}
+            for label, renderer, parser in engines:
+                body = outputs[label]
+                rendered = self._rate(lambda: renderer.render(data), options['seconds'])
+                parsed = self._rate(lambda: parser.parse(io.BytesIO(body)), options['seconds'])
+                rates[label] = (rendered, parsed)
+                self.stdout.write(
+                    f'  {label:<7} render {rendered:>9,.0f}/s ({rendered * size / 1e6:6.1f} MB/s)  '
+                    f'parse {parsed:>9,.0f}/s'
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f'  speedup render {rates["orjson"][0] / rates["stdlib"][0]:.1f}x  '
+                f'parse {rates["orjson"][1] / rates["stdlib"][1]:.1f}x'
+            ))
+
+    def _rate(self, func, seconds):
+        """
+        Calls per second of ``func``, timed in batches to keep clock reads
+        out of the measurement.
+        """
+        func()
+        calls, batch = 0, 10
+        start = time.perf_counter()
+        deadline = start + seconds
+        while True:
+            for _ in range(batch):
+                func()
+            calls += batch
+            now = time.perf_counter()
+            if now >= deadline:
+                return calls / (now - start)
+            batch = min(batch * 2, 10000)
@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks import summary
+
+
+class Command(BaseCommand):
+    help = 'Measure login latency and health-check latency during a login storm against a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            default='http://localhost:8000',
+            help='Base URL of the running server',
+        )
+        parser.add_argument('--email', required=True, help='Email of an existing user')
+        parser.add_argument('--password', required=True, help='Password of that user')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=16,
+            help='Concurrent login requests',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Total login requests',
+        )
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        body = json.dumps({'email': options['email'], 'password': options['password']}).encode()
+        login_timings, health_timings = [], []
+        statuses = {}
+        done = threading.Event()
+
+        def request(url, data=None):
+            req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=30) as response:
+                    response.read()
+                    code = response.status
+            except urllib.error.HTTPError as e:
+                code = e.code
+            return code, (time.perf_counter() - start) * 1000
+
+        def login(_):
+            code, elapsed = request(f'{base_url}/api/auth/login/', body)
+            statuses[code] = statuses.get(code, 0) + 1
+            if code == 200:
+                login_timings.append(elapsed)
+
+        def probe_health():
+            while not done.is_set():
+                code, elapsed = request(f'{base_url}/api/health/')
+                if code == 200:
+                    health_timings.append(elapsed)
+                time.sleep(0.05)
+
+        prober = threading.Thread(target=probe_health, daemon=True)
+        prober.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(login, range(options['requests'])))
+        elapsed = time.perf_counter() - start
+        done.set()
+        prober.join()
+
+        self.stdout.write(f'status codes: {dict(sorted(statuses.items()))}')
+        self.stdout.write(f'throughput:   {options["requests"] / elapsed:.1f} logins/s')
+        self.stdout.write(f'login:        {summary(login_timings)}')
+        self.stdout.write(f'health:       {summary(health_timings)}')
@@ -0,0 +1,100 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import User, UserProfile
+from api.serializers import CandidateSerializer, UserProfileSerializer, UserSerializer
+
+from .benchmark_json import sample_profile
+
+
+def samples(from_db):
+    """
+    Users with profiles, plus the edge cases: a user without a profile and
+    a profile with empty optional fields and an uploaded picture.
+    """
+    if from_db:
+        profiles = list(UserProfile.objects.with_user().order_by('pk')[:from_db])
+        users = [profile.user for profile in profiles]
+        users += list(User.objects.filter(profile__isnull=True)[:5])
+    else:
+        pairs = [sample_profile(index) for index in range(1, 201)]
+        users, profiles = [user for user, _ in pairs], [profile for _, profile in pairs]
+        users.append(User(id=999, email='no-profile@example.com', user_type=User.UserType.RECRUITER))
+        empty = profiles[1]
+        empty.bio = empty.date_of_birth = empty.location = empty.company_website = None
+        empty.education = []
+        profiles[2].profile_picture = 'profile_pictures/avatar.png'
+    return users, profiles
+
+
+class Command(BaseCommand):
+    help = 'Check byte-for-byte parity of compiled serializers with DRF and compare their speed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-db',
+            type=int,
+            default=0,
+            metavar='N',
+            help='Use the first N profiles in the database instead of synthetic ones',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=20,
+            help='Times each object list is serialized per mode',
+        )
+
+    def handle(self, *args, **options):
+        users, profiles = samples(options['from_db'])
+        if not profiles:
+            raise CommandError('No profiles to serialize')
+        request = Request(APIRequestFactory(SERVER_NAME='localhost').get('/api/candidates/search/'))
+        cases = (
+            ('UserSerializer', UserSerializer, users),
+            ('UserProfileSerializer', UserProfileSerializer, profiles),
+            ('CandidateSerializer', CandidateSerializer, profiles),
+        )
+
+        renderer = JSONRenderer()
+        failed = False
+        for name, serializer_class, objects in cases:
+            results = {}
+            for label, enabled in (('drf', False), ('compiled', True)):
+                with override_settings(SERIALIZER_PLANS=enabled):
+                    # Single-object serializers are built per request, so
+                    # measure that rather than one many=True list
+                    outputs = [
+                        renderer.render(serializer_class(obj, context={'request': request}).data)
+                        for obj in objects
+                    ]
+                    start = time.perf_counter()
+                    for _ in range(options['rounds']):
+                        for obj in objects:
+                            serializer_class(obj, context={'request': request}).data
+                    elapsed = time.perf_counter() - start
+                results[label] = (outputs, elapsed / (options['rounds'] * len(objects)) * 1e6)
+
+            mismatches = [
+                index for index, (expected, actual) in enumerate(zip(results['drf'][0], results['compiled'][0]))
+                if expected != actual
+            ]
+            drf_us, compiled_us = results['drf'][1], results['compiled'][1]
+            self.stdout.write(
+                f'{name:<22} drf {drf_us:7.1f}us  compiled {compiled_us:7.1f}us  '
+                f'speedup {drf_us / compiled_us:4.1f}x  ({len(objects)} objects)'
+            )
+            for index in mismatches[:3]:
+                failed = True
+                self.stderr.write(self.style.ERROR(f'  object {index} differs:'))
+                self.stderr.write(f'    drf:      {results["drf"][0][index].decode()}')
+                self.stderr.write(f'    compiled: {results["compiled"][0][index].decode()}')
+
+        if failed:
+            raise CommandError('Compiled serializers do not match DRF output')
+        self.stdout.write(self.style.SUCCESS('Output is byte-for-byte identical'))
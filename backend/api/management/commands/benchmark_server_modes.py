@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks import summary
+
+# GUNICORN_WORKER_CLASS values; gunicorn.conf.py picks the WSGI or ASGI app
+MODES = ('sync', 'gthread', 'uvicorn')
+GUNICORN_CONFIG = settings.BASE_DIR / 'gunicorn.conf.py'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of gunicorn sync and gthread (WSGI) and uvicorn (ASGI) workers '
+        'under concurrent connections'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/health/', help='Endpoint to request')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes per server')
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=64,
+            help='Concurrent client connections',
+        )
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per mode')
+        parser.add_argument('--port', type=int, default=8765, help='Port the servers listen on')
+        parser.add_argument(
+            '--header',
+            action='append',
+            default=[],
+            metavar='NAME:VALUE',
+            help='Extra request header, e.g. "Authorization: Bearer <token>"',
+        )
+
+    def handle(self, *args, **options):
+        headers = {}
+        for header in options['header']:
+            name, _, value = header.partition(':')
+            headers[name.strip()] = value.strip()
+        url = f"http://127.0.0.1:{options['port']}{options['path']}"
+
+        for mode in MODES:
+            server = self._start(mode, options)
+            try:
+                self._wait_ready(server, url)
+                self._run(mode, url, headers, options['concurrency'], options['requests'])
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def _start(self, mode, options):
+        command = [sys.executable, '-m', 'gunicorn', '--config', str(GUNICORN_CONFIG), '--log-level', 'warning']
+        env = {
+            **os.environ,
+            'GUNICORN_WORKER_CLASS': mode,
+            'GUNICORN_BIND': f"127.0.0.1:{options['port']}",
+            'GUNICORN_WORKERS': str(options['workers']),
+            'GUNICORN_MAX_REQUESTS': '0',
+        }
+        return subprocess.Popen(command, env=env, cwd=settings.BASE_DIR)
+
+    def _wait_ready(self, server, url, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'Server exited with status {server.returncode}')
+            try:
+                urllib.request.urlopen(url, timeout=1).read()
+                return
+            except urllib.error.HTTPError:
+                return  # Up, even if the endpoint needs credentials
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not answer {url} within {timeout}s')
+
+    def _run(self, mode, url, headers, concurrency, count):
+        timings, errors = [], []
+        lock = threading.Lock()
+
+        def request(_):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=30) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError) as e:
+                with lock:
+                    errors.append(e)
+                return
+            with lock:
+                timings.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(request, range(count)))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f'{mode + ":":<8} {len(timings) / elapsed:8.1f} req/s  {summary(timings)}  '
+            f'errors {len(errors)}'
+        )
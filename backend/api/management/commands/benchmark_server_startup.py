@@ -0,0 +1,145 @@
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from .benchmark_server_modes import GUNICORN_CONFIG
+
+WORKER_READY = re.compile(r'Worker (\d+) ready in (\d+) ms')
+
+
+def memory(pid):
+    """
+    RSS, PSS and USS of a process in MB, from ``/proc/<pid>/smaps_rollup``.
+    PSS splits shared pages between the processes sharing them, so summing
+    it over the master and workers gives the real footprint.
+    """
+    fields = {}
+    for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines()[1:]:
+        name, value = line.split(':', 1)
+        fields[name] = int(value.split()[0]) / 1024
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def children(pid):
+    pids = []
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields resume after ')'
+        if int(stat.rsplit(')', 1)[1].split()[1]) == pid:
+            pids.append(int(entry.name))
+    return pids
+
+
+class Command(BaseCommand):
+    help = 'Measure gunicorn worker startup time and per-worker memory with and without preload_app'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Worker processes')
+        parser.add_argument(
+            '--worker-class',
+            default='gthread',
+            choices=['sync', 'gthread', 'uvicorn'],
+            help='GUNICORN_WORKER_CLASS to measure',
+        )
+        parser.add_argument('--path', default='/api/health/', help='Endpoint requested to warm workers up')
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Warm-up requests before memory is read',
+        )
+        parser.add_argument('--port', type=int, default=8766, help='Port the server listens on')
+
+    def handle(self, *args, **options):
+        if not Path('/proc/self/smaps_rollup').exists():
+            raise CommandError('Memory is read from /proc/<pid>/smaps_rollup, which needs Linux 4.14+')
+
+        for preload in (False, True):
+            self._measure(preload, options)
+
+    def _measure(self, preload, options):
+        env = {
+            **os.environ,
+            'GUNICORN_PRELOAD': '1' if preload else '0',
+            'GUNICORN_WORKER_CLASS': options['worker_class'],
+            'GUNICORN_BIND': f"127.0.0.1:{options['port']}",
+            'GUNICORN_WORKERS': str(options['workers']),
+            'GUNICORN_MAX_REQUESTS': '0',
+        }
+        command = [sys.executable, '-m', 'gunicorn', '--config', str(GUNICORN_CONFIG), '--log-level', 'info']
+
+        started = time.monotonic()
+        server = subprocess.Popen(
+            command, env=env, cwd=settings.BASE_DIR, stderr=subprocess.PIPE, text=True,
+        )
+        ready, log = [], []
+        all_ready = threading.Event()
+
+        def read_log():
+            for line in server.stderr:
+                log.append(line)
+                match = WORKER_READY.search(line)
+                if match:
+                    ready.append((int(match.group(2)), time.monotonic() - started))
+                    if len(ready) == options['workers']:
+                        all_ready.set()
+
+        threading.Thread(target=read_log, daemon=True).start()
+        try:
+            if not all_ready.wait(60):
+                self.stderr.write(''.join(log[-20:]))
+                raise CommandError(f"{len(ready)} of {options['workers']} workers started within 60s")
+            self._warm_up(f"http://127.0.0.1:{options['port']}{options['path']}", options)
+
+            master = memory(server.pid)
+            workers = [memory(pid) for pid in children(server.pid)]
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        def mean(key):
+            return sum(worker[key] for worker in workers) / len(workers)
+
+        init_ms = sorted(ms for ms, _ in ready)
+        self.stdout.write(self.style.SUCCESS(f"preload_app {'on' if preload else 'off'}"))
+        self.stdout.write(
+            f"  startup  all {options['workers']} workers ready in {max(at for _, at in ready):.2f}s  "
+            f'worker init p50 {init_ms[len(init_ms) // 2]} ms  max {init_ms[-1]} ms'
+        )
+        self.stdout.write(f"  master   RSS {master['rss']:6.1f} MB  PSS {master['pss']:6.1f} MB")
+        self.stdout.write(
+            f"  worker   RSS {mean('rss'):6.1f} MB  PSS {mean('pss'):6.1f} MB  "
+            f"USS {mean('uss'):6.1f} MB  (mean of {len(workers)})"
+        )
+        self.stdout.write(
+            f"  total    PSS {master['pss'] + sum(worker['pss'] for worker in workers):6.1f} MB"
+        )
+
+    def _warm_up(self, url, options):
+        def request(_):
+            try:
+                urllib.request.urlopen(url, timeout=30).read()
+            except urllib.error.HTTPError:
+                pass  # Still served by a worker
+
+        with ThreadPoolExecutor(max_workers=options['workers'] * 2) as pool:
+            list(pool.map(request, range(options['requests'])))
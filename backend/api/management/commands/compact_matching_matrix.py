@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import matrix_store
+
+
+class Command(BaseCommand):
+    help = 'Fold journaled profile changes into a fresh shared matching matrix snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold',
+            type=int,
+            default=None,
+            help='Only compact once the journal holds this many changes (default: MATCHING_COMPACT_THRESHOLD)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Check once and exit instead of polling',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Seconds between journal checks',
+        )
+
+    def handle(self, *args, **options):
+        if not matrix_store.enabled():
+            raise CommandError('MATCHING_MATRIX_DIR is not set')
+
+        from django.conf import settings
+
+        threshold = options['threshold']
+        if threshold is None:
+            threshold = settings.MATCHING_COMPACT_THRESHOLD
+
+        while True:
+            pending = matrix_store.journal_length()
+            if pending >= threshold or self._expiring(matrix_store.current_snapshot()):
+                snapshot = matrix_store.compact()
+                if snapshot is None:
+                    self.stdout.write('Another process is compacting; skipped')
+                else:
+                    self.stdout.write(f'Folded {pending} change(s) into {snapshot}')
+            pruned = matrix_store.prune_journal()
+            if pruned:
+                self.stdout.write(f'Pruned {pruned} journaled change(s)')
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+    def _expiring(self, snapshot):
+        """
+        Whether there is no snapshot, or changes it lacks will soon be pruned.
+        """
+        from django.conf import settings
+
+        if snapshot is None:
+            return True
+        age = time.time() - matrix_store.snapshot_meta(snapshot)['built_at']
+        return age > settings.MATCHING_JOURNAL_RETENTION / 2
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.core.management.base import BaseCommand, CommandError
+
+from api.jwt_keys import key_id
+
+
+class Command(BaseCommand):
+    help = 'Generate an RSA keypair for signing JWTs (see api/jwt_keys.py for rotation)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('private_key_file', help='Where to write the PEM private key')
+        parser.add_argument(
+            '--bits',
+            type=int,
+            default=2048,
+            help='RSA key size',
+        )
+
+    def handle(self, *args, **options):
+        private_path = Path(options['private_key_file'])
+        public_path = private_path.with_suffix('.pub.pem')
+        if private_path.exists():
+            raise CommandError(f'{private_path} already exists')
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=options['bits'])
+        private_path.write_bytes(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ))
+        private_path.chmod(0o600)
+        public_path.write_bytes(private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {private_path} and {public_path} (kid {key_id(private_key.public_key())})'
+        ))
@@ -0,0 +1,161 @@
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What each cold start pays: django.setup() for every management command
+# and cron run; setup plus the WSGI app and URLconf for a server worker
+TARGETS = {
+    'setup': 'import django; django.setup()',
+    'wsgi': (
+        'from hireiq_backend.wsgi import application; '
+        'from django.urls import get_resolver; get_resolver().url_patterns'
+    ),
+}
+# Django's ORM and DRF alone, which any process of ours imports. Budgets are
+# multiples of it, so they hold on a slower or busier machine too
+BASELINE = 'import django.db.models, rest_framework.serializers'
+
+# -X importtime only times the import statement, and Django loads apps,
+# models, admin modules and URLconfs with importlib.import_module; route
+# that through __import__ so they are timed and attributed too
+SCRIPT = '''
+import importlib
+import importlib.util
+import sys
+import time
+
+
+def import_module(name, package=None):
+    if name.startswith('.'):
+        name = importlib.util.resolve_name(name, package)
+    __import__(name)
+    return sys.modules[name]
+
+
+importlib.import_module = import_module
+start = time.perf_counter()
+{code}
+print((time.perf_counter() - start) * 1000)
+'''
+
+
+def run(code, importtime=False, stream='stdout'):
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command += ['-c', SCRIPT.format(code=code)]
+    # Fresh interpreter, same settings, so nothing is imported yet
+    result = subprocess.run(command, cwd=settings.BASE_DIR, capture_output=True, text=True)
+    if result.returncode:
+        raise CommandError(f'Loading {code!r} failed:\n{result.stderr[-2000:]}')
+    return getattr(result, stream)
+
+
+def cold_start(target, runs):
+    """
+    Median cold-start times of ``target`` and of ``BASELINE`` in ms, with
+    the runs interleaved so load on the machine slows both alike.
+    """
+    timings, baselines = [], []
+    for _ in range(runs):
+        baselines.append(float(run(BASELINE).strip().splitlines()[-1]))
+        timings.append(float(run(TARGETS[target]).strip().splitlines()[-1]))
+    return statistics.median(timings), statistics.median(baselines)
+
+
+def parse_importtime(output):
+    """
+    Rows of ``-X importtime`` output as ``(depth, module, self_us,
+    cumulative_us, parent)``. Python prints a module after everything it
+    imports, one indentation level deeper per nesting level.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append([depth, name.strip(), int(self_us), int(cumulative_us), None])
+
+    # A row's parent is the next row printed one level up
+    pending = {}
+    for row in reversed(rows):
+        depth = row[0]
+        row[4] = pending.get(depth - 1)
+        pending[depth] = row[1]
+        for deeper in [level for level in pending if level > depth]:
+            del pending[deeper]
+    return [tuple(row) for row in rows]
+
+
+class Command(BaseCommand):
+    help = 'Report cold-start time and per-module import cost, optionally checking it against a budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            choices=sorted(TARGETS),
+            action='append',
+            help='What to load (default: all); setup is what every management command pays',
+        )
+        parser.add_argument('--runs', type=int, default=5, help='Timed cold starts per target')
+        parser.add_argument('--top', type=int, default=25, help='Modules listed by cumulative time')
+        parser.add_argument(
+            '--all-modules',
+            action='store_true',
+            help='List every module, not just imports that cross into another package',
+        )
+        parser.add_argument(
+            '--budget',
+            type=float,
+            help='Budget for the median cold start as a multiple of the baseline (default: COLD_START_BUDGET)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Exit with an error when a median cold start exceeds its budget',
+        )
+
+    def handle(self, *args, **options):
+        over_budget = []
+        for target in options['target'] or sorted(TARGETS):
+            budget = options['budget'] or settings.COLD_START_BUDGET[target]
+            median, baseline = cold_start(target, options['runs'])
+            ratio = median / baseline
+            rows = parse_importtime(run(TARGETS[target], importtime=True, stream='stderr'))
+
+            style = self.style.SUCCESS if ratio <= budget else self.style.ERROR
+            self.stdout.write(style(
+                f'{target}: cold start {median:.0f} ms, {ratio:.2f}x the {baseline:.0f} ms baseline '
+                f'(medians of {options["runs"]}, budget {budget:.2f}x)'
+            ))
+            self._report(rows, options['top'], options['all_modules'])
+            if ratio > budget:
+                over_budget.append(f'{target} {ratio:.2f}x > {budget:.2f}x')
+
+        if options['check'] and over_budget:
+            raise CommandError(f"Cold start over budget: {', '.join(over_budget)}")
+
+    def _report(self, rows, top, all_modules):
+        listed = rows
+        if not all_modules:
+            # Where one package pulls in another: the imports worth deferring
+            listed = [
+                row for row in rows
+                if row[4] is None or row[4].split('.')[0] != row[1].split('.')[0]
+            ]
+        self.stdout.write('  cumulative      self  module  (imported by)')
+        for _, name, self_us, cumulative_us, parent in sorted(listed, key=lambda row: -row[3])[:top]:
+            imported_by = f'  ({parent})' if parent else ''
+            self.stdout.write(f'  {cumulative_us / 1000:8.1f}ms {self_us / 1000:7.1f}ms  {name}{imported_by}')
+
+        packages = defaultdict(int)
+        for _, name, self_us, _, _ in rows:
+            packages[name.split('.')[0]] += self_us
+        self.stdout.write('  self time by top-level package:')
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:10]:
+            self.stdout.write(f'  {self_us / 1000:8.1f}ms  {package}')
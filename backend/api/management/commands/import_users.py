@@ -0,0 +1,69 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import FORMATS, ImportResult, import_users, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Import users from a CSV or JSONL file and send them invitation links'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default=None,
+            help='File format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Rows inserted per transaction (default: IMPORT_CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '--no-invitations',
+            action='store_true',
+            help='Create the users without queueing invitation emails',
+        )
+        parser.add_argument(
+            '--errors',
+            default=None,
+            help='Write every row error to this JSONL file',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in FORMATS:
+            raise CommandError(f'Cannot tell the format of {path}; pass --format')
+
+        errors_file = open(options['errors'], 'w') if options['errors'] else None
+        # Keep every error when writing them out, else only a sample
+        result = ImportResult(max_errors=float('inf') if errors_file else 20)
+
+        def report(result):
+            self.stdout.write(f'{result.total} row(s) read, {result.created} created, {result.failed} failed')
+
+        try:
+            with open(path, 'rb') as stream:
+                import_users(
+                    read_rows(stream, file_format),
+                    chunk_size=options['chunk_size'] or settings.IMPORT_CHUNK_SIZE,
+                    send_invitations=not options['no_invitations'],
+                    result=result,
+                    on_chunk=report,
+                )
+        finally:
+            if errors_file:
+                for error in result.errors:
+                    errors_file.write(json.dumps(error) + '\n')
+                errors_file.close()
+
+        for error in result.errors[:20]:
+            self.stderr.write(f"Row {error['row']} ({error['email']}): {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} of {result.total} row(s); {result.failed} failed'
+        ))
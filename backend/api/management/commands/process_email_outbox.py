@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.emails import process_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Maximum number of emails sent per connection (default: EMAIL_OUTBOX_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--backend',
+            default=None,
+            help='Email backend dotted path, e.g. django.core.mail.backends.console.EmailBackend',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the outbox once and exit instead of polling',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep between polls when the outbox is empty',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        backend = options['backend']
+
+        while True:
+            sent, failed = process_outbox(batch_size=batch_size, backend=backend)
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} email(s), {failed} failed')
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
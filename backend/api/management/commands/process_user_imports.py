@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.imports import process_next_job
+
+
+class Command(BaseCommand):
+    help = 'Run user import jobs uploaded through the admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Rows inserted per transaction (default: IMPORT_CHUNK_SIZE)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the pending jobs once and exit instead of polling',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10.0,
+            help='Seconds to sleep between polls when no job is pending',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = process_next_job(chunk_size=options['chunk_size'])
+            if job is not None:
+                self.stdout.write(
+                    f'Import job {job.pk} {job.status}: {job.created_rows} created, '
+                    f'{job.failed_rows} failed of {job.total_rows}'
+                )
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
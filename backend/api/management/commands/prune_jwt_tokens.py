@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired outstanding and blacklisted refresh tokens in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Number of rows deleted per statement',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Seconds to sleep between chunks to limit load on the database',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        # Blacklist rows first, so deleting outstanding tokens cascades nothing
+        blacklisted = self._prune(
+            BlacklistedToken.objects.filter(token__expires_at__lte=now),
+            options['chunk_size'],
+            options['pause'],
+        )
+        outstanding = self._prune(
+            OutstandingToken.objects.filter(expires_at__lte=now),
+            options['chunk_size'],
+            options['pause'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {blacklisted} blacklisted and {outstanding} outstanding expired token(s)'
+        ))
+
+    def _prune(self, queryset, chunk_size, pause):
+        """
+        Delete ``queryset`` oldest-first. Tokens share one lifetime, so the
+        expired rows sit at the low end of the primary key index and each
+        chunk is found without scanning the live rows.
+        """
+        model = queryset.model
+        total = 0
+        while True:
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                return total
+            deleted, _ = model.objects.filter(pk__in=pks).delete()
+            total += deleted
+            if pause:
+                time.sleep(pause)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api.models import UserToken
+
+
+class Command(BaseCommand):
+    help = 'Delete expired email verification and password reset tokens'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Number of rows deleted per statement',
+        )
+
+    def handle(self, *args, **options):
+        deleted = UserToken.objects.purge_expired(chunk_size=options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} expired token(s)')
+        )
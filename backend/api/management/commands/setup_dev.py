@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
 from django.db import connection
 
 
@@ -28,15 +28,15 @@ class Command(BaseCommand):
         call_command('migrate')
         
         # Create superuser if it doesn't exist
-        if not User.objects.filter(username='admin').exists():
+        User = get_user_model()
+        if not User.objects.filter(email='admin@hireiq.com').exists():
             self.stdout.write('Creating superuser...')
             User.objects.create_superuser(
-                username='admin',
                 email='admin@hireiq.com',
                 password='admin123'
             )
             self.stdout.write(
-                self.style.SUCCESS('Superuser created: admin/admin123')
+                self.style.SUCCESS('Superuser created: admin@hireiq.com/admin123')
             )
         else:
             self.stdout.write('Superuser already exists')
@@ -0,0 +1,85 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Avg, Count, Max
+
+from api.models import SlowQuery
+
+
+class Command(BaseCommand):
+    help = 'List queries captured by the slow-query recorder, grouped by fingerprint or one by one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Rows listed')
+        parser.add_argument('--route', help='Only queries run by this view name')
+        parser.add_argument(
+            '--recent',
+            action='store_true',
+            help='List captures newest first instead of grouping them by fingerprint',
+        )
+        parser.add_argument(
+            '--fingerprint',
+            help='Show the latest capture of this fingerprint with its stack and plan',
+        )
+        parser.add_argument('--clear', action='store_true', help='Delete every capture')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} slow query capture(s)'))
+            return
+
+        queries = SlowQuery.objects.all()
+        if options['route']:
+            queries = queries.filter(route=options['route'])
+
+        if options['fingerprint']:
+            self._show(queries, options['fingerprint'])
+        elif options['recent']:
+            self._recent(queries, options['limit'])
+        else:
+            self._grouped(queries, options['limit'])
+
+    def _grouped(self, queries, limit):
+        groups = (
+            queries.values('fingerprint')
+            .annotate(count=Count('id'), mean=Avg('duration_ms'), worst=Max('duration_ms'), last_id=Max('id'))
+            .order_by('-count', '-worst')[:limit]
+        )
+        latest = SlowQuery.objects.in_bulk([group['last_id'] for group in groups])
+        self.stdout.write('   count    mean ms     max ms  fingerprint       route  statement')
+        for group in groups:
+            row = latest[group['last_id']]
+            self.stdout.write(
+                f"  {group['count']:6d} {group['mean']:10.1f} {group['worst']:10.1f}  "
+                f"{group['fingerprint']}  {row.route or '-'}  {row.sql[:80]}"
+            )
+
+    def _recent(self, queries, limit):
+        self.stdout.write('  captured at           duration ms  fingerprint       route  statement')
+        for row in queries[:limit]:
+            self.stdout.write(
+                f"  {row.captured_at:%Y-%m-%d %H:%M:%S} {row.duration_ms:12.1f}  "
+                f"{row.fingerprint}  {row.route or '-'}  {row.sql[:80]}"
+            )
+
+    def _show(self, queries, fingerprint):
+        row = queries.filter(fingerprint=fingerprint).first()
+        if row is None:
+            raise CommandError(f'No capture with fingerprint {fingerprint}')
+        # The latest capture that has a plan, if any sampled one does
+        planned = queries.filter(fingerprint=fingerprint, plan__isnull=False).first()
+
+        self.stdout.write(self.style.SUCCESS(f'{row.fingerprint}: {row.duration_ms:.1f} ms at {row.captured_at}'))
+        self.stdout.write(f'  database  {row.database}')
+        self.stdout.write(f"  route     {row.route or '-'}")
+        self.stdout.write(f'  sql       {row.sql}')
+        self.stdout.write('  stack')
+        for frame in row.stack.splitlines() or ['-']:
+            self.stdout.write(f'    {frame}')
+        self.stdout.write('  plan')
+        if planned is None:
+            self.stdout.write('    - (none sampled)')
+        else:
+            for line in json.dumps(planned.plan, indent=2).splitlines():
+                self.stdout.write(f'    {line}')
@@ -0,0 +1,267 @@
+"""
+Vectorized candidate-to-job matching.
+
+Every active candidate profile is packed into a ``CandidateMatrix``:
+skills as a sparse (row, skill id) coordinate list, experience as a float
+vector and location as integer codes into a table of distinct locations.
+A job requirement is scored against the whole population in a handful of
+NumPy passes; no per-candidate Python runs until the top ``k`` rows are
+turned back into profiles.
+
+Scores are a weighted mean of four components in ``[0, 1]``:
+
+* ``required_skills``: share of the required skills the candidate has
+* ``preferred_skills``: share of the preferred skills the candidate has
+* ``experience``: 1 at or above ``min_experience``, linear below it
+* ``location``: 1 when the candidate's location contains the job's
+
+Default weights come from ``MATCHING_DEFAULT_WEIGHTS``; a request may
+override any of them.
+
+With ``MATCHING_MATRIX_DIR`` set the matrix is shared between workers and
+kept current by ``api.matrix_store``; otherwise each worker rebuilds its
+own copy every ``MATCHING_MATRIX_TTL`` seconds.
+"""
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from .models import ProfileSkill, User, UserProfile, normalize_skill
+from .skills import resolve_skills
+
+COMPONENTS = ('required_skills', 'preferred_skills', 'experience', 'location')
+
+
+class CandidateMatrix:
+    """
+    Column-oriented snapshot of candidate features.
+    """
+
+    def __init__(self, profile_ids, experience, location_codes, locations, skill_rows, skill_ids):
+        self.profile_ids = profile_ids
+        self.experience = experience
+        self.location_codes = location_codes
+        self.locations = locations
+        self.skill_rows = skill_rows
+        self.skill_ids = skill_ids
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    @property
+    def max_skill_id(self):
+        if not hasattr(self, '_max_skill_id'):
+            self._max_skill_id = int(self.skill_ids.max(initial=0))
+        return self._max_skill_id
+
+    @classmethod
+    def from_database(cls, chunk_size=5000):
+        profiles = (
+            UserProfile.objects.filter(
+                user__user_type=User.UserType.CANDIDATE,
+                user__is_active=True,
+            )
+            .order_by('pk')
+            .values_list('pk', 'experience_years', 'location')
+        )
+        profile_ids, experience, location_codes = [], [], []
+        location_index = {}
+        for pk, years, location in profiles.iterator(chunk_size=chunk_size):
+            profile_ids.append(pk)
+            experience.append(years)
+            key = normalize_skill(location or '')
+            location_codes.append(location_index.setdefault(key, len(location_index)))
+
+        profile_ids = np.array(profile_ids, dtype=np.int64)
+        links = np.array(
+            list(
+                ProfileSkill.objects.filter(
+                    profile__user__user_type=User.UserType.CANDIDATE,
+                    profile__user__is_active=True,
+                )
+                .values_list('profile_id', 'skill_id')
+                .iterator(chunk_size=chunk_size)
+            ),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        # profile_ids is sorted, so a binary search maps profile id -> row.
+        # Drop links of profiles created between the two queries.
+        rows = np.searchsorted(profile_ids, links[:, 0])
+        known = rows < len(profile_ids)
+        known[known] = profile_ids[rows[known]] == links[known, 0]
+        links, skill_rows = links[known], rows[known].astype(np.int32)
+
+        return cls(
+            profile_ids=profile_ids,
+            experience=np.array(experience, dtype=np.float32),
+            location_codes=np.array(location_codes, dtype=np.int32),
+            locations=list(location_index),
+            skill_rows=skill_rows,
+            skill_ids=links[:, 1].astype(np.int32),
+        )
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a matrix from ``{profile_id: (experience, location, skill_ids)}``
+        with ``location`` already normalized.
+        """
+        profile_ids = sorted(rows)
+        location_index = {}
+        location_codes, skill_rows, skill_ids = [], [], []
+        for row, profile_id in enumerate(profile_ids):
+            _, location, skills = rows[profile_id]
+            location_codes.append(location_index.setdefault(location, len(location_index)))
+            skill_rows.extend([row] * len(skills))
+            skill_ids.extend(skills)
+
+        return cls(
+            profile_ids=np.array(profile_ids, dtype=np.int64),
+            experience=np.array([rows[pk][0] for pk in profile_ids], dtype=np.float32),
+            location_codes=np.array(location_codes, dtype=np.int32),
+            locations=list(location_index),
+            skill_rows=np.array(skill_rows, dtype=np.int32),
+            skill_ids=np.array(skill_ids, dtype=np.int32),
+        )
+
+    def skill_coverage(self, skill_ids):
+        """
+        Share of ``skill_ids`` each candidate has, as a float vector.
+        """
+        if not skill_ids:
+            return np.ones(len(self), dtype=np.float32)
+        known = [skill_id for skill_id in skill_ids if skill_id is not None]
+        if not known:
+            return np.zeros(len(self), dtype=np.float32)
+        size = max(self.max_skill_id, max(known)) + 1
+        weights = np.zeros(size, dtype=np.float32)
+        weights[known] = 1.0 / len(skill_ids)
+        return np.bincount(
+            self.skill_rows,
+            weights=weights[self.skill_ids],
+            minlength=len(self),
+        ).astype(np.float32)
+
+    def experience_score(self, min_experience):
+        if not min_experience:
+            return np.ones(len(self), dtype=np.float32)
+        return np.minimum(self.experience / np.float32(min_experience), 1.0)
+
+    def location_score(self, location):
+        if not location:
+            return np.ones(len(self), dtype=np.float32)
+        needle = normalize_skill(location)
+        # Match each distinct location once, then broadcast through the codes
+        table = np.array([needle in candidate for candidate in self.locations], dtype=np.float32)
+        if not len(table):
+            return np.zeros(len(self), dtype=np.float32)
+        return table[self.location_codes]
+
+
+def score(matrix, required_skills=(), preferred_skills=(), min_experience=0, location='', weights=None):
+    """
+    Score every candidate in ``matrix``. Returns ``(total, components)``
+    where ``components`` maps component name to its score vector.
+    """
+    weights = {**settings.MATCHING_DEFAULT_WEIGHTS, **(weights or {})}
+    resolved = resolve_skills(list(required_skills) + list(preferred_skills))
+
+    def ids(names):
+        # A skill counts once however it is spelled or aliased. Unknown
+        # skills still count towards the denominator, once per name.
+        skill_ids = {}
+        for name in dict.fromkeys(map(normalize_skill, names)):
+            skill_ids.setdefault(resolved.get(name, name), resolved.get(name))
+        return list(skill_ids.values())
+
+    components = {
+        'required_skills': matrix.skill_coverage(ids(required_skills)),
+        'preferred_skills': matrix.skill_coverage(ids(preferred_skills)),
+        'experience': matrix.experience_score(min_experience),
+        'location': matrix.location_score(location),
+    }
+    total = np.zeros(len(matrix), dtype=np.float32)
+    weight_sum = 0.0
+    for name in COMPONENTS:
+        weight = float(weights.get(name, 0))
+        if weight:
+            total += np.float32(weight) * components[name]
+            weight_sum += weight
+    if weight_sum:
+        total /= np.float32(weight_sum)
+    return total, components
+
+
+def top_k(total, k):
+    """
+    Row indices of the ``k`` best scores, best first.
+    """
+    k = min(k, len(total))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    rows = np.argpartition(-total, k - 1)[:k]
+    return rows[np.argsort(-total[rows], kind='stable')]
+
+
+def match_candidates(k=20, **requirement):
+    """
+    Return the best ``k`` matches as ``(profile_id, score, breakdown)``.
+    """
+    matches = []
+    for matrix, dead in get_segments():
+        total, components = score(matrix, **requirement)
+        if dead is not None:
+            # Rows superseded by a later update; scores are never negative
+            total[dead] = -1.0
+        matches.extend(
+            (
+                int(matrix.profile_ids[row]),
+                round(float(total[row]), 4),
+                {name: round(float(values[row]), 4) for name, values in components.items()},
+            )
+            for row in top_k(total, k)
+            if total[row] >= 0
+        )
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches[:k]
+
+
+def get_segments():
+    """
+    Return ``[(matrix, dead_rows_mask_or_None), ...]`` covering every
+    candidate once. Uses the shared memory-mapped matrix when
+    ``MATCHING_MATRIX_DIR`` is set and holds a snapshot, otherwise a
+    per-process copy.
+    """
+    from . import matrix_store
+
+    if matrix_store.enabled():
+        shared = matrix_store.get_shared_matrix()
+        if shared is not None:
+            return shared.segments()
+    return [(get_matrix(), None)]
+
+
+_matrix = None
+_built_at = 0.0
+_lock = threading.Lock()
+
+
+def get_matrix():
+    """
+    Return this process's private matrix, rebuilding it every
+    ``MATCHING_MATRIX_TTL`` seconds.
+    """
+    global _matrix, _built_at
+
+    ttl = getattr(settings, 'MATCHING_MATRIX_TTL', 300)
+    if _matrix is not None and time.monotonic() - _built_at < ttl:
+        return _matrix
+
+    with _lock:
+        if _matrix is None or time.monotonic() - _built_at >= ttl:
+            _matrix = CandidateMatrix.from_database()
+            _built_at = time.monotonic()
+        return _matrix
@@ -0,0 +1,306 @@
+"""
+Candidate matrix shared by all worker processes through memory-mapped files.
+
+Layout of ``MATCHING_MATRIX_DIR`` (local to each host)::
+
+    CURRENT                   name of the live snapshot
+    <snapshot>/*.npy          immutable columns of a ``CandidateMatrix``
+    <snapshot>/meta.json      location table, build time, last journal id
+    .compact.lock             held while a snapshot is being built
+
+Workers map the snapshot columns read-only, so the page cache holds a single
+copy for every worker on the host, and a new worker starts without querying
+the database. Profile saves and deletes insert a ``MatrixChange`` row once
+their transaction commits, so the journal is shared by every host. At most
+every ``MATCHING_JOURNAL_POLL_INTERVAL`` seconds a match request reads the
+rows its worker has not applied yet into a small private overlay that masks
+the snapshot rows they replace.
+
+Snapshots are only built by ``manage.py compact_matching_matrix`` and by the
+gunicorn master at startup, never in a request: until a snapshot exists,
+workers use their private ``matching.get_matrix()`` copy. A snapshot holds
+every change up to the highest journal id seen before it was built.
+"""
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .matching import CandidateMatrix
+from .models import MatrixChange, User, normalize_skill, profile_skill_names
+from .skills import resolve_skills
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('profile_ids', 'experience', 'location_codes', 'skill_rows', 'skill_ids')
+# Ids are allocated before the insert commits, so a row may show up after
+# higher ids have been read; rows this recent are read again on each poll
+SETTLE_SECONDS = 10
+
+
+def enabled():
+    return bool(getattr(settings, 'MATCHING_MATRIX_DIR', ''))
+
+
+def _root():
+    return str(settings.MATCHING_MATRIX_DIR)
+
+
+@contextmanager
+def _locked(name):
+    """
+    Hold an exclusive ``flock`` on ``name`` in the matrix directory, or
+    yield ``False`` if another process holds it.
+    """
+    os.makedirs(_root(), exist_ok=True)
+    with open(os.path.join(_root(), name), 'a') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def current_snapshot():
+    try:
+        with open(os.path.join(_root(), 'CURRENT')) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def snapshot_meta(snapshot):
+    with open(os.path.join(_root(), snapshot, 'meta.json')) as f:
+        return json.load(f)
+
+
+def _append(*records):
+    MatrixChange.objects.bulk_create([MatrixChange(record=record) for record in records])
+
+
+def _record(profile):
+    user = profile.user
+    if user.user_type != User.UserType.CANDIDATE or not user.is_active:
+        return {'op': 'delete', 'id': profile.pk}
+    skill_ids = resolve_skills(profile_skill_names(profile.skills), create=True)
+    return {
+        'op': 'upsert',
+        'id': profile.pk,
+        'experience': profile.experience_years,
+        'location': normalize_skill(profile.location or ''),
+        'skills': sorted(set(skill_ids.values())),
+    }
+
+
+def profile_changed(profile):
+    """
+    Journal the current state of ``profile`` after the transaction commits.
+    """
+    profiles_changed([profile])
+
+
+def profiles_changed(profiles):
+    """
+    Journal several profiles with a single insert, e.g. after a bulk insert.
+    """
+    if not enabled() or not profiles:
+        return
+    transaction.on_commit(lambda: _append(*[_record(profile) for profile in profiles]))
+
+
+def profile_deleted(profile_id):
+    if not enabled():
+        return
+    transaction.on_commit(lambda: _append({'op': 'delete', 'id': profile_id}))
+
+
+def journal_length():
+    """
+    Number of journaled changes newer than this host's snapshot.
+    """
+    snapshot = current_snapshot()
+    changes = MatrixChange.objects.all()
+    if snapshot is not None:
+        changes = changes.filter(id__gt=snapshot_meta(snapshot)['journal_id'])
+    return changes.count()
+
+
+def prune_journal():
+    """
+    Delete journaled changes older than ``MATCHING_JOURNAL_RETENTION``;
+    every host must have compacted past them by then.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.MATCHING_JOURNAL_RETENTION)
+    deleted, _ = MatrixChange.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+def compact():
+    """
+    Build a snapshot from the database and make it current. Returns the
+    snapshot name, or ``None`` if another process is already compacting.
+    """
+    with _locked('.compact.lock') as acquired:
+        if not acquired:
+            return None
+
+        previous = current_snapshot()
+        # Read first: a change journaled before this was committed before
+        # it, so the matrix below already holds it
+        journal_id = MatrixChange.objects.aggregate(last=Max('id'))['last'] or 0
+
+        matrix = CandidateMatrix.from_database()
+        name = f'snapshot-{time.time_ns()}'
+        path = os.path.join(_root(), name)
+        os.makedirs(path)
+        for column in COLUMNS:
+            np.save(os.path.join(path, f'{column}.npy'), getattr(matrix, column))
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'locations': matrix.locations, 'built_at': time.time(), 'journal_id': journal_id}, f)
+
+        pointer = os.path.join(_root(), 'CURRENT.tmp')
+        with open(pointer, 'w') as f:
+            f.write(name)
+        os.replace(pointer, os.path.join(_root(), 'CURRENT'))
+
+        _remove_stale(keep={name, previous})
+        return name
+
+
+def _remove_stale(keep):
+    """
+    Delete snapshots older than the previous one. Workers that still map
+    them keep working: unlinked files stay readable until unmapped.
+    """
+    for entry in os.listdir(_root()):
+        if entry.startswith('snapshot-') and entry not in keep:
+            shutil.rmtree(os.path.join(_root(), entry), ignore_errors=True)
+
+
+class SharedMatrix:
+    """
+    One worker's view of a snapshot: the memory-mapped columns plus the
+    journal replayed into a private overlay.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        path = os.path.join(_root(), snapshot)
+        columns = {
+            column: np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r')
+            for column in COLUMNS
+        }
+        meta = snapshot_meta(snapshot)
+        self.base = CandidateMatrix(locations=meta['locations'], **columns)
+        self.dead = np.zeros(len(self.base), dtype=bool)
+        self.overlay = {}
+        self.overlay_matrix = None
+        # Every change up to ``floor`` is applied; above it, ``applied``
+        # holds the ids already seen and ``versions`` the newest change
+        # applied per profile
+        self.floor = meta['journal_id']
+        self.applied = set()
+        self.versions = {}
+        self.polled_at = None
+        self.lock = threading.Lock()
+
+    def _base_row(self, profile_id):
+        row = int(np.searchsorted(self.base.profile_ids, profile_id))
+        if row < len(self.base) and self.base.profile_ids[row] == profile_id:
+            return row
+        return None
+
+    def refresh(self):
+        """
+        Apply the journaled changes not seen yet, at most once every
+        ``MATCHING_JOURNAL_POLL_INTERVAL`` seconds.
+        """
+        interval = settings.MATCHING_JOURNAL_POLL_INTERVAL
+        if self.polled_at is not None and time.monotonic() - self.polled_at < interval:
+            return
+
+        with self.lock:
+            if self.polled_at is not None and time.monotonic() - self.polled_at < interval:
+                return
+            self.polled_at = time.monotonic()
+            settled = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+            changes = (
+                MatrixChange.objects.filter(id__gt=self.floor)
+                .order_by('id')
+                .values_list('id', 'record', 'created_at')
+            )
+            floor, advancing = self.floor, True
+            for change_id, record, created_at in changes:
+                if change_id not in self.applied:
+                    self.applied.add(change_id)
+                    self._apply(change_id, record)
+                    self.overlay_matrix = None
+                # Past the first recent row, lower ids may still commit
+                advancing = advancing and created_at < settled
+                if advancing:
+                    floor = change_id
+            self.floor = floor
+            self.applied = {change_id for change_id in self.applied if change_id > floor}
+
+    def _apply(self, change_id, record):
+        profile_id = record['id']
+        if self.versions.get(profile_id, 0) > change_id:
+            # A late commit of a change superseded by one already applied
+            return
+        self.versions[profile_id] = change_id
+        row = self._base_row(profile_id)
+        if row is not None:
+            self.dead[row] = True
+        if record['op'] == 'delete':
+            self.overlay.pop(profile_id, None)
+        else:
+            self.overlay[profile_id] = (record['experience'], record['location'], record['skills'])
+
+    def segments(self):
+        self.refresh()
+        with self.lock:
+            if self.overlay_matrix is None:
+                self.overlay_matrix = CandidateMatrix.from_rows(self.overlay)
+            return [(self.base, self.dead), (self.overlay_matrix, None)]
+
+
+_shared = None
+_warned = False
+_shared_lock = threading.Lock()
+
+
+def get_shared_matrix():
+    """
+    Return this process's ``SharedMatrix`` for the current snapshot, or
+    ``None`` until ``compact_matching_matrix`` (or the gunicorn master at
+    startup) has built one.
+    """
+    global _shared, _warned
+
+    snapshot = current_snapshot()
+    if snapshot is None:
+        if not _warned:
+            _warned = True
+            logger.warning('No matching matrix snapshot in %s yet; using a private copy', _root())
+        return None
+
+    if _shared is None or _shared.snapshot != snapshot:
+        with _shared_lock:
+            if _shared is None or _shared.snapshot != snapshot:
+                _shared = SharedMatrix(snapshot)
+    return _shared
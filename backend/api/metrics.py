@@ -0,0 +1,350 @@
+"""
+Per-route request metrics in the Prometheus text format.
+
+``RequestMetricsMiddleware`` times each request and, through the hooks
+installed here, counts the database queries and time (a connection
+``execute_wrapper``), serializer time (``Serializer.data``) and cache
+hits and misses (``api.cache_backends``) it causes. The figures are
+recorded as histograms labelled by the resolved view name, so the
+registry's size depends on the number of routes, not on traffic.
+
+Recording only updates a dict under a lock. With ``METRICS_DIR`` set, a
+background thread writes each process's totals to
+``metrics-<pid>.json`` in that directory every ``METRICS_FLUSH_INTERVAL``
+seconds, and ``/api/metrics/`` merges every file it finds there. That way
+all gunicorn workers are reported together, whichever one serves the
+scrape. When a worker exits, ``mark_process_dead`` (gunicorn's
+``child_exit`` hook) folds its file into ``metrics-archive.json``, so
+counters never go backwards. Without ``METRICS_DIR`` each process only
+reports itself.
+"""
+import atexit
+import bisect
+import contextvars
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# name: (type, help, buckets)
+METRICS = {
+    'hireiq_http_request_duration_seconds': (
+        'histogram', 'Request latency.',
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    ),
+    'hireiq_http_request_db_queries': (
+        'histogram', 'Database queries per request.',
+        (0, 1, 2, 3, 5, 10, 20, 50, 100),
+    ),
+    'hireiq_http_request_db_duration_seconds': (
+        'histogram', 'Time spent in database queries per request.',
+        (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    ),
+    'hireiq_http_request_serializer_duration_seconds': (
+        'histogram', 'Time spent producing serializer output per request.',
+        (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+    ),
+    'hireiq_http_response_size_bytes': (
+        'histogram', 'Response body size (streamed responses are not counted).',
+        (100, 1000, 10000, 100000, 1000000, 10000000),
+    ),
+    'hireiq_http_request_cache_lookups_total': (
+        'counter', 'Cache lookups made while serving requests, by result.', None,
+    ),
+}
+
+ARCHIVE = 'metrics-archive.json'
+
+current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    """
+    Counters for the request being served, reached through ``current``.
+    """
+    __slots__ = ('request', 'queries', 'db_seconds', 'serializer_seconds', 'serializing', 'cache_hits', 'cache_misses')
+
+    def __init__(self, request=None):
+        self.request = request
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializing = False
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+# (name, labels) -> per-bucket counts, +Inf count, then the sum; or a
+# counter's value
+_values = {}
+_lock = threading.Lock()
+_flusher = None
+_flusher_pid = None
+
+
+def _observe(name, labels, value):
+    # Called with _lock held
+    buckets = METRICS[name][2]
+    series = _values.get((name, labels))
+    if series is None:
+        series = _values[(name, labels)] = [0] * (len(buckets) + 1) + [0]
+    series[bisect.bisect_left(buckets, value)] += 1
+    series[-1] += value
+
+
+def _inc(name, labels, amount):
+    # Called with _lock held
+    _values[(name, labels)] = _values.get((name, labels), 0) + amount
+
+
+def record_request(route, method, status, duration, stats, size=None):
+    """
+    Record one finished request.
+    """
+    labels = (('route', route), ('method', method))
+    with _lock:
+        _ensure_flusher()
+        _observe('hireiq_http_request_duration_seconds', labels + (('status', str(status)),), duration)
+        _observe('hireiq_http_request_db_queries', labels, stats.queries)
+        _observe('hireiq_http_request_db_duration_seconds', labels, stats.db_seconds)
+        _observe('hireiq_http_request_serializer_duration_seconds', labels, stats.serializer_seconds)
+        if size is not None:
+            _observe('hireiq_http_response_size_bytes', labels, size)
+        if stats.cache_hits:
+            _inc('hireiq_http_request_cache_lookups_total', labels + (('result', 'hit'),), stats.cache_hits)
+        if stats.cache_misses:
+            _inc('hireiq_http_request_cache_lookups_total', labels + (('result', 'miss'),), stats.cache_misses)
+
+
+def record_cache_lookup(hits, misses):
+    stats = current.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """
+    Database ``execute_wrapper`` counting queries and their time against
+    the current request. Installed on every connection by ``api.signals``.
+    """
+    stats = current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - start
+
+
+def _timed_data(data):
+    def timed(self):
+        stats = current.get()
+        # Only the outermost serializer is timed; nested ones are part of it
+        if stats is None or stats.serializing:
+            return data.fget(self)
+        stats.serializing = True
+        start = time.perf_counter()
+        try:
+            return data.fget(self)
+        finally:
+            stats.serializing = False
+            stats.serializer_seconds += time.perf_counter() - start
+    return property(timed)
+
+
+def install():
+    """
+    Time ``.data`` on DRF serializers. Called from ``ApiConfig.ready``.
+    """
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if 'data' in vars(cls) and not getattr(cls, '_metrics_installed', False):
+            cls.data = _timed_data(vars(cls)['data'])
+            cls._metrics_installed = True
+
+
+def _ensure_flusher():
+    """
+    Start the flusher thread in this process, as ``api.last_login`` does.
+    Must be called with ``_lock`` held.
+    """
+    global _flusher, _flusher_pid
+    if not getattr(settings, 'METRICS_DIR', ''):
+        return
+    if _flusher_pid == os.getpid() and _flusher is not None and _flusher.is_alive():
+        return
+    if _flusher_pid != os.getpid():
+        # Forked from a process that recorded: those totals are its own
+        _values.clear()
+    _flusher_pid = os.getpid()
+    _flusher = threading.Thread(target=_run_flusher, name='metrics-flusher', daemon=True)
+    _flusher.start()
+
+
+def _run_flusher():
+    while True:
+        time.sleep(settings.METRICS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except Exception:
+            logger.exception('Writing metrics failed')
+
+
+def _encode(values):
+    return [[name, [list(label) for label in labels], value] for (name, labels), value in values.items()]
+
+
+def _decode(rows):
+    return {(name, tuple(tuple(label) for label in labels)): value for name, labels, value in rows}
+
+
+def _write(path, values):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(_encode(values), f)
+    os.replace(tmp, path)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return _decode(json.load(f))
+    except FileNotFoundError:
+        return {}
+
+
+def _merge(into, values):
+    for key, value in values.items():
+        existing = into.get(key)
+        if existing is None:
+            into[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            if len(value) == len(existing):  # Buckets unchanged
+                into[key] = [a + b for a, b in zip(existing, value)]
+        else:
+            into[key] = existing + value
+    return into
+
+
+class _DirectoryLock:
+    """
+    ``flock`` on the metrics directory: shared while reading files,
+    exclusive while a dead worker's file moves into the archive.
+    """
+
+    def __init__(self, directory, exclusive=False):
+        self.path = os.path.join(directory, '.lock')
+        self.operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self.fd, self.operation)
+
+    def __exit__(self, *exc_info):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+
+
+def _snapshot():
+    with _lock:
+        return {key: list(value) if isinstance(value, list) else value for key, value in _values.items()}
+
+
+def flush():
+    """
+    Write this process's totals to its file in ``METRICS_DIR``.
+    """
+    directory = getattr(settings, 'METRICS_DIR', '')
+    if not directory or _flusher_pid != os.getpid():
+        return
+    os.makedirs(directory, exist_ok=True)
+    _write(os.path.join(directory, f'metrics-{os.getpid()}.json'), _snapshot())
+
+
+atexit.register(flush)
+
+
+def mark_process_dead(pid, directory):
+    """
+    Fold an exited worker's file into the archive. Needs no Django
+    settings, so gunicorn's master can call it without the app loaded.
+    """
+    path = os.path.join(directory, f'metrics-{pid}.json')
+    if not os.path.exists(path):
+        return
+    with _DirectoryLock(directory, exclusive=True):
+        archive = os.path.join(directory, ARCHIVE)
+        _write(archive, _merge(_read(archive), _read(path)))
+        os.remove(path)
+
+
+def collect():
+    """
+    Totals for every worker sharing ``METRICS_DIR``, or this process alone.
+    """
+    directory = getattr(settings, 'METRICS_DIR', '')
+    if not directory:
+        return _snapshot()
+
+    flush()
+    values = {}
+    os.makedirs(directory, exist_ok=True)
+    with _DirectoryLock(directory):
+        for name in os.listdir(directory):
+            if name.startswith('metrics-') and name.endswith('.json'):
+                _merge(values, _read(os.path.join(directory, name)))
+    return values
+
+
+def _format_labels(labels):
+    def escape(value):
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(values=None):
+    """
+    ``values`` (default: ``collect()``) in the Prometheus text format.
+    """
+    values = collect() if values is None else values
+    by_name = {}
+    for (name, labels), value in sorted(values.items()):
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in by_name.get(name, []):
+            if kind == 'counter':
+                lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+                continue
+            if len(value) != len(buckets) + 2:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), value[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_number(float(bound))
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", le),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(value[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _values.clear()
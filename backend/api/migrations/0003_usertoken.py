@@ -0,0 +1,99 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:31
+
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def move_tokens(apps, schema_editor):
+    """
+    Copy plaintext tokens off the user table as hashed UserToken rows.
+    The old column was shared by both flows, so verified users' tokens can
+    only have been password reset tokens.
+    """
+    User = apps.get_model("api", "User")
+    UserToken = apps.get_model("api", "UserToken")
+    now = timezone.now()
+    lifetimes = {
+        "email_verification": timedelta(seconds=settings.EMAIL_VERIFICATION_TIMEOUT),
+        "password_reset": timedelta(seconds=settings.PASSWORD_RESET_TIMEOUT),
+    }
+
+    batch = []
+    users = (
+        User.objects.exclude(email_verification_token__isnull=True)
+        .exclude(email_verification_token="")
+        .values_list("id", "email_verification_token", "is_email_verified")
+    )
+    for user_id, token, is_verified in users.iterator(chunk_size=2000):
+        purpose = "password_reset" if is_verified else "email_verification"
+        batch.append(
+            UserToken(
+                user_id=user_id,
+                purpose=purpose,
+                token_hash=hashlib.sha256(token.encode()).hexdigest(),
+                expires_at=now + lifetimes[purpose],
+            )
+        )
+        if len(batch) >= 2000:
+            UserToken.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        UserToken.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0002_emailjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "purpose",
+                    models.CharField(
+                        choices=[
+                            ("email_verification", "Email verification"),
+                            ("password_reset", "Password reset"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("token_hash", models.CharField(max_length=64, unique=True)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tokens",
+                        to="api.user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "user token",
+                "verbose_name_plural": "user tokens",
+            },
+        ),
+        migrations.RunPython(move_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="user",
+            name="email_verification_token",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:32
+
+import api.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0003_usertoken"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", api.models.UserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_profile_skills(apps, schema_editor):
+    """
+    Populate the lookup table from existing ``UserProfile.skills`` JSON,
+    using the same normalization as ``api.models.normalize_skill``.
+    """
+    UserProfile = apps.get_model("api", "UserProfile")
+    ProfileSkill = apps.get_model("api", "ProfileSkill")
+
+    batch = []
+    profiles = UserProfile.objects.exclude(skills=[]).values_list("id", "skills")
+    for profile_id, skills in profiles.iterator(chunk_size=2000):
+        names = set()
+        for skill in skills or ():
+            if isinstance(skill, dict):
+                skill = skill.get("name")
+            if skill:
+                name = " ".join(str(skill).split()).casefold()[:100]
+                if name:
+                    names.add(name)
+        batch.extend(ProfileSkill(profile_id=profile_id, name=name) for name in names)
+        if len(batch) >= 2000:
+            ProfileSkill.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        ProfileSkill.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    Trigram GIN index on ``location``. Postgres only. ``icontains`` filters
+    on ``UPPER(location)`` and cannot use it; 0011 replaces it.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS api_profile_location_trgm_idx "
+        "ON api_userprofile USING gin (location gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS api_profile_location_trgm_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0004_user_manager"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileSkill",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+            ],
+            options={
+                "verbose_name": "profile skill",
+                "verbose_name_plural": "profile skills",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["experience_years"], name="api_profile_experience_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="profileskill",
+            name="profile",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="skill_entries",
+                to="api.userprofile",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="profileskill",
+            constraint=models.UniqueConstraint(
+                fields=("name", "profile"), name="api_profileskill_name_profile_uniq"
+            ),
+        ),
+        migrations.RunPython(backfill_profile_skills, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
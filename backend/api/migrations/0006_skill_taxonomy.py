@@ -0,0 +1,119 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def clear_profile_skills(apps, schema_editor):
+    """
+    The name-keyed rows are derived data; drop them so ``skill`` can be
+    added as NOT NULL. Migration 0013 rebuilds them.
+    """
+    apps.get_model("api", "ProfileSkill").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0005_profile_skill_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_profile_skills, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="Skill",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "normalized_name",
+                    models.CharField(editable=False, max_length=100, unique=True),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "skill",
+                "verbose_name_plural": "skills",
+                "ordering": ["normalized_name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SkillAlias",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                "verbose_name": "skill alias",
+                "verbose_name_plural": "skill aliases",
+            },
+        ),
+        migrations.RemoveConstraint(
+            model_name="profileskill",
+            name="api_profileskill_name_profile_uniq",
+        ),
+        migrations.RemoveField(
+            model_name="profileskill",
+            name="name",
+        ),
+        migrations.AddField(
+            model_name="skillalias",
+            name="skill",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="aliases",
+                to="api.skill",
+            ),
+        ),
+        migrations.AddField(
+            model_name="skill",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="children",
+                to="api.skill",
+            ),
+        ),
+        migrations.AddField(
+            model_name="profileskill",
+            name="skill",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="profile_entries",
+                to="api.skill",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="profileskill",
+            constraint=models.UniqueConstraint(
+                fields=("skill", "profile"), name="api_profileskill_skill_profile_uniq"
+            ),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="skill_set",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="profiles",
+                through="api.ProfileSkill",
+                to="api.skill",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0006_skill_taxonomy"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["date_joined", "id"], name="api_user_joined_id_idx"
+            ),
+        ),
+    ]
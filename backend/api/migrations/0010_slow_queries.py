@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0009_export_watermarks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("fingerprint", models.CharField(db_index=True, max_length=16)),
+                ("sql", models.TextField()),
+                ("duration_ms", models.FloatField()),
+                ("database", models.CharField(default="default", max_length=100)),
+                ("route", models.CharField(blank=True, max_length=200)),
+                ("stack", models.TextField(blank=True)),
+                ("plan", models.JSONField(blank=True, null=True)),
+                (
+                    "captured_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "slow query",
+                "verbose_name_plural": "slow queries",
+                "ordering": ["-id"],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def create_upper_trigram_index(apps, schema_editor):
+    """
+    Replace the trigram index on ``location`` with one on the expression
+    ``location__icontains`` filters on: Django compiles it to
+    ``UPPER("location"::text) LIKE UPPER(%s)``, which the planner can only
+    match to an index on ``UPPER(location::text)``. Postgres only.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute("DROP INDEX IF EXISTS api_profile_location_trgm_idx")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS api_profile_location_upper_trgm_idx "
+        "ON api_userprofile USING gin ((UPPER(location::text)) gin_trgm_ops)"
+    )
+
+
+def restore_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS api_profile_location_upper_trgm_idx")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS api_profile_location_trgm_idx "
+        "ON api_userprofile USING gin (location gin_trgm_ops)"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0010_slow_queries"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_upper_trigram_index, restore_trigram_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:47
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0011_location_upper_trgm"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MatrixChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("record", models.JSONField()),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "matrix change",
+                "verbose_name_plural": "matrix changes",
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:10
+
+from django.db import migrations
+
+
+def rebuild_profile_skills(apps, schema_editor):
+    """
+    Link every profile to ``Skill`` rows for its ``skills`` JSON, one batch
+    of profiles at a time, creating the skills as they are first seen. Same
+    normalization as ``api.models.profile_skill_names``, and the same rows
+    ``manage.py backfill_profile_skills`` writes. 0006 dropped the
+    name-keyed rows these replace.
+    """
+    UserProfile = apps.get_model("api", "UserProfile")
+    ProfileSkill = apps.get_model("api", "ProfileSkill")
+    Skill = apps.get_model("api", "Skill")
+
+    skill_ids = {}
+    last_pk = 0
+    while True:
+        batch = list(
+            UserProfile.objects.filter(pk__gt=last_pk)
+            .exclude(skills=[])
+            .order_by("pk")
+            .values_list("id", "skills")[:2000]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+
+        names = {}
+        for profile_id, skills in batch:
+            names[profile_id] = set()
+            for skill in skills or ():
+                if isinstance(skill, dict):
+                    skill = skill.get("name")
+                if skill:
+                    name = " ".join(str(skill).split()).casefold()[:100]
+                    if name:
+                        names[profile_id].add(name)
+
+        unseen = set().union(*names.values()) - skill_ids.keys()
+        if unseen:
+            Skill.objects.bulk_create(
+                [Skill(name=name, normalized_name=name) for name in unseen],
+                ignore_conflicts=True,
+            )
+            skill_ids.update(
+                Skill.objects.filter(normalized_name__in=unseen).values_list(
+                    "normalized_name", "id"
+                )
+            )
+        ProfileSkill.objects.bulk_create(
+            [
+                ProfileSkill(profile_id=profile_id, skill_id=skill_ids[name])
+                for profile_id, profile_names in names.items()
+                for name in profile_names
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own; rerunning after a failure is safe
+    atomic = False
+
+    dependencies = [
+        ("api", "0012_matrix_changes"),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_profile_skills, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,60 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.crypto import get_random_string
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
+class UserQuerySet(models.QuerySet):
+    
+    def with_profile(self):
+        """
+        Join the profile so ``UserSerializer`` renders without extra queries.
+        """
+        return self.select_related('profile')
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    """
+    Manager for the email-based ``User`` model.
+    """
+    use_in_migrations = True
+    
+    def _create_user(self, email, password, **extra_fields):
+        if not email:
+            raise ValueError('The given email must be set')
+        user = self.model(email=self.normalize_email(email), **extra_fields)
+        user.set_password(password)
+        user.save(using=self._db)
+        return user
+    
+    def create_user(self, email, password=None, **extra_fields):
+        extra_fields.setdefault('is_staff', False)
+        extra_fields.setdefault('is_superuser', False)
+        return self._create_user(email, password, **extra_fields)
+    
+    def create_superuser(self, email, password=None, **extra_fields):
+        extra_fields.setdefault('is_staff', True)
+        extra_fields.setdefault('is_superuser', True)
+        extra_fields.setdefault('user_type', User.UserType.ADMIN)
+        
+        if extra_fields.get('is_staff') is not True:
+            raise ValueError('Superuser must have is_staff=True.')
+        if extra_fields.get('is_superuser') is not True:
+            raise ValueError('Superuser must have is_superuser=True.')
+        
+        return self._create_user(email, password, **extra_fields)
+    
+    def get_by_natural_key(self, email):
+        # Login serializes the authenticated user, so fetch the profile with it
+        return self.with_profile().get(email=email)
+
+
 class User(AbstractUser):
     """
     Custom User model with role-based permissions.
@@ -28,7 +80,8 @@ class User(AbstractUser):
     # Additional fields
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     is_email_verified = models.BooleanField(default=False)
-    email_verification_token = models.CharField(max_length=100, blank=True, null=True)
+    # Watermark for incremental exports; last_login writes don't bump it
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     # Override username to use email
     username = models.CharField(max_length=150, unique=True, blank=True, null=True)
@@ -57,13 +110,27 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['user_type']
     
+    objects = UserManager()
+    
     class Meta:
         verbose_name = _('user')
         verbose_name_plural = _('users')
+        indexes = [
+            # Keyset pagination and the admin changelist order by this tuple
+            models.Index(fields=['date_joined', 'id'], name='api_user_joined_id_idx'),
+        ]
     
     def __str__(self):
         return self.email
     
+    def save(self, *args, **kwargs):
+        # auto_now only writes fields that are saved; a partial save must
+        # still move the export watermark
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) - {'last_login'}:
+            kwargs['update_fields'] = {*update_fields, 'updated_at'}
+        super().save(*args, **kwargs)
+    
     @property
     def is_candidate(self):
         return self.user_type == self.UserType.CANDIDATE
@@ -77,6 +144,16 @@ class User(AbstractUser):
         return self.user_type == self.UserType.ADMIN
 
 
+class UserProfileQuerySet(models.QuerySet):
+    
+    def with_user(self):
+        """
+        Join the user so the ``user.*`` fields of ``UserProfileSerializer``
+        do not issue one query per profile.
+        """
+        return self.select_related('user')
+
+
 class UserProfile(models.Model):
     """
     Extended profile information for users.
@@ -93,6 +170,13 @@ class UserProfile(models.Model):
     skills = models.JSONField(default=list, blank=True)
     experience_years = models.PositiveIntegerField(default=0)
     education = models.JSONField(default=list, blank=True)
+    # Normalized view of ``skills``, maintained by ``ProfileSkill.objects.sync``
+    skill_set = models.ManyToManyField(
+        'Skill',
+        through='ProfileSkill',
+        related_name='profiles',
+        blank=True,
+    )
     
     # Recruiter-specific fields
     company_name = models.CharField(max_length=200, blank=True, null=True)
@@ -100,11 +184,400 @@ class UserProfile(models.Model):
     company_description = models.TextField(blank=True, null=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    objects = UserProfileQuerySet.as_manager()
     
     class Meta:
         verbose_name = _('user profile')
         verbose_name_plural = _('user profiles')
+        indexes = [
+            models.Index(fields=['experience_years'], name='api_profile_experience_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.email} - Profile" 
+
+
+class EmailJob(models.Model):
+    """
+    Outbound email queued by request handlers and delivered by the
+    ``process_email_outbox`` worker, so SMTP latency never blocks a request.
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        SENT = 'sent', _('Sent')
+        FAILED = 'failed', _('Failed')
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    recipients = models.JSONField(default=list)
+    
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name = _('email job')
+        verbose_name_plural = _('email jobs')
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='api_emailjob_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+
+class UserTokenManager(models.Manager):
+    """
+    Issues and redeems single-use tokens. Only the SHA-256 of a token is
+    stored, so lookups go through the unique index on ``token_hash``.
+    """
+    
+    def issue(self, user, purpose):
+        """
+        Create a token for ``user`` and return the raw value to email out.
+        Any earlier token for the same purpose is invalidated.
+        """
+        raw_token = get_random_string(64)
+        self.filter(user=user, purpose=purpose).delete()
+        self.create(**self._token_fields(user, purpose, raw_token))
+        return raw_token
+    
+    async def aissue(self, user, purpose):
+        """
+        Async version of ``issue``.
+        """
+        raw_token = get_random_string(64)
+        await self.filter(user=user, purpose=purpose).adelete()
+        await self.acreate(**self._token_fields(user, purpose, raw_token))
+        return raw_token
+    
+    def _token_fields(self, user, purpose, raw_token):
+        return {
+            'user': user,
+            'purpose': purpose,
+            'token_hash': hash_token(raw_token),
+            'expires_at': timezone.now() + UserToken.lifetime(purpose),
+        }
+    
+    def issue_many(self, users, purpose):
+        """
+        Bulk version of ``issue`` for freshly created users with no earlier
+        tokens. Returns the raw tokens in ``users`` order.
+        """
+        expires_at = timezone.now() + UserToken.lifetime(purpose)
+        raw_tokens = [get_random_string(64) for _ in users]
+        self.bulk_create([
+            UserToken(user=user, purpose=purpose, token_hash=hash_token(raw_token), expires_at=expires_at)
+            for user, raw_token in zip(users, raw_tokens)
+        ])
+        return raw_tokens
+    
+    def redeem(self, raw_token, purpose):
+        """
+        Consume a token and return its user, or ``None`` if the token is
+        unknown, expired or already used.
+        """
+        token = (
+            self.select_related('user')
+            .filter(
+                token_hash=hash_token(raw_token),
+                purpose=purpose,
+                expires_at__gt=timezone.now(),
+            )
+            .first()
+        )
+        if token is None:
+            return None
+        # The conditional delete makes redemption single-use under concurrency
+        deleted, _ = self.filter(pk=token.pk).delete()
+        if not deleted:
+            return None
+        return token.user
+    
+    def purge_expired(self, chunk_size=5000):
+        """
+        Delete expired tokens in chunks to keep lock time short.
+        Returns the number of rows removed.
+        """
+        total = 0
+        while True:
+            pks = list(
+                self.filter(expires_at__lte=timezone.now())
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not pks:
+                return total
+            deleted, _ = self.filter(pk__in=pks).delete()
+            total += deleted
+
+
+def hash_token(raw_token):
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+class UserToken(models.Model):
+    """
+    Hashed single-use token for email verification and password reset.
+    """
+    
+    class Purpose(models.TextChoices):
+        EMAIL_VERIFICATION = 'email_verification', _('Email verification')
+        PASSWORD_RESET = 'password_reset', _('Password reset')
+        INVITATION = 'invitation', _('Invitation')
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tokens')
+    purpose = models.CharField(max_length=20, choices=Purpose.choices)
+    token_hash = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = UserTokenManager()
+    
+    class Meta:
+        verbose_name = _('user token')
+        verbose_name_plural = _('user tokens')
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.get_purpose_display()}"
+    
+    @classmethod
+    def lifetime(cls, purpose):
+        if purpose == cls.Purpose.PASSWORD_RESET:
+            return timedelta(seconds=settings.PASSWORD_RESET_TIMEOUT)
+        if purpose == cls.Purpose.INVITATION:
+            return timedelta(seconds=settings.INVITATION_TIMEOUT)
+        return timedelta(seconds=settings.EMAIL_VERIFICATION_TIMEOUT)
+
+
+class UserImportJob(models.Model):
+    """
+    CSV or JSONL file of users uploaded through the admin and imported by
+    the ``process_user_imports`` worker.
+    """
+    
+    class Format(models.TextChoices):
+        CSV = 'csv', _('CSV')
+        JSONL = 'jsonl', _('JSON Lines')
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        RUNNING = 'running', _('Running')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+    
+    file = models.FileField(upload_to='imports/')
+    format = models.CharField(max_length=10, choices=Format.choices, default=Format.CSV)
+    send_invitations = models.BooleanField(default=True)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name='import_jobs',
+        blank=True,
+        null=True,
+    )
+    
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    total_rows = models.PositiveIntegerField(default=0)
+    created_rows = models.PositiveIntegerField(default=0)
+    failed_rows = models.PositiveIntegerField(default=0)
+    # First IMPORT_MAX_STORED_ERRORS row errors: [{"row": 3, "email": ..., "errors": {...}}]
+    errors = models.JSONField(default=list, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name = _('user import job')
+        verbose_name_plural = _('user import jobs')
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='api_importjob_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.file.name} ({self.status})"
+
+
+def normalize_skill(name):
+    """
+    Canonical form used for skill lookups: trimmed, single-spaced, case-folded.
+    """
+    return ' '.join(str(name).split()).casefold()
+
+
+def profile_skill_names(skills):
+    """
+    Normalized, de-duplicated names from a ``UserProfile.skills`` value.
+    Entries may be plain strings or objects with a ``name`` key.
+    """
+    max_length = Skill._meta.get_field('normalized_name').max_length
+    names = set()
+    for skill in skills or ():
+        if isinstance(skill, dict):
+            skill = skill.get('name')
+        if skill:
+            name = normalize_skill(skill)[:max_length]
+            if name:
+                names.add(name)
+    return names
+
+
+class Skill(models.Model):
+    """
+    Canonical skill in the taxonomy. Profiles reference skills by id;
+    spelling variants map onto a skill through ``SkillAlias``.
+    """
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True, editable=False)
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        related_name='children',
+        blank=True,
+        null=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('skill')
+        verbose_name_plural = _('skills')
+        ordering = ['normalized_name']
+    
+    def __str__(self):
+        return self.name
+    
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_skill(self.name)
+        super().save(*args, **kwargs)
+
+
+class SkillAlias(models.Model):
+    """
+    Alternative spelling that resolves to a skill, e.g. "python3" -> Python.
+    """
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    name = models.CharField(max_length=100, unique=True)
+    
+    class Meta:
+        verbose_name = _('skill alias')
+        verbose_name_plural = _('skill aliases')
+    
+    def __str__(self):
+        return f"{self.name} -> {self.skill_id}"
+    
+    def save(self, *args, **kwargs):
+        self.name = normalize_skill(self.name)
+        super().save(*args, **kwargs)
+
+
+class ProfileSkillManager(models.Manager):
+    
+    def sync(self, profile):
+        """
+        Make the rows for ``profile`` match its ``skills`` JSON, creating
+        taxonomy entries for skills not seen before.
+        """
+        from .skills import resolve_skills
+        
+        wanted = set(resolve_skills(profile_skill_names(profile.skills), create=True).values())
+        existing = set(self.filter(profile=profile).values_list('skill_id', flat=True))
+        if existing - wanted:
+            self.filter(profile=profile, skill_id__in=existing - wanted).delete()
+        if wanted - existing:
+            self.bulk_create(
+                [ProfileSkill(profile=profile, skill_id=skill_id) for skill_id in wanted - existing],
+                ignore_conflicts=True,
+            )
+    
+    def profiles_with_all(self, skill_ids):
+        """
+        Subquery of profile ids that have every skill in ``skill_ids``.
+        """
+        skill_ids = set(skill_ids)
+        return (
+            self.filter(skill_id__in=skill_ids)
+            .values('profile')
+            .annotate(matched=models.Count('pk'))
+            .filter(matched=len(skill_ids))
+            .values('profile')
+        )
+
+
+class ProfileSkill(models.Model):
+    """
+    Through table of ``UserProfile.skill_set``, kept in sync with
+    ``UserProfile.skills`` so skill filters are integer index lookups
+    instead of decoding every profile's JSON.
+    """
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='skill_entries')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='profile_entries')
+    
+    objects = ProfileSkillManager()
+    
+    class Meta:
+        verbose_name = _('profile skill')
+        verbose_name_plural = _('profile skills')
+        constraints = [
+            # Leading ``skill`` makes this the lookup index for skill filters
+            models.UniqueConstraint(fields=['skill', 'profile'], name='api_profileskill_skill_profile_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.profile_id} - {self.skill_id}"
+
+
+class SlowQuery(models.Model):
+    """
+    A query that took at least ``SLOW_QUERY_THRESHOLD_MS``, saved by
+    ``api.slow_queries``. Only the newest ``SLOW_QUERY_BUFFER_SIZE`` rows
+    are kept.
+    """
+    fingerprint = models.CharField(max_length=16, db_index=True)
+    # Normalized: literals and parameters are replaced with ``?``
+    sql = models.TextField()
+    duration_ms = models.FloatField()
+    database = models.CharField(max_length=100, default='default')
+    # View name of the request that ran it, empty outside requests
+    route = models.CharField(max_length=200, blank=True)
+    stack = models.TextField(blank=True)
+    plan = models.JSONField(blank=True, null=True)
+    captured_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = _('slow query')
+        verbose_name_plural = _('slow queries')
+        ordering = ['-id']
+    
+    def __str__(self):
+        return f"{self.fingerprint} {self.duration_ms:.0f} ms ({self.route or '-'})"
+
+
+class MatrixChange(models.Model):
+    """
+    A candidate profile change journaled for the shared matching matrix
+    (see ``api.matrix_store``). Every host replays the rows newer than its
+    snapshot; rows older than ``MATCHING_JOURNAL_RETENTION`` are deleted.
+    """
+    # ``{'op': 'upsert' | 'delete', 'id': <profile id>, ...}``
+    record = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        verbose_name = _('matrix change')
+        verbose_name_plural = _('matrix changes')
     
     def __str__(self):
-        return f"{self.user.email} - Profile" 
\ No newline at end of file
+        return f"{self.record.get('op')} {self.record.get('id')}"
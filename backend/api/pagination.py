@@ -0,0 +1,194 @@
+"""
+Keyset pagination.
+
+Pages are addressed by the sort key of a boundary row rather than by an
+offset, so every page is a range scan on the ordering index no matter how
+deep the client pages, and no ``COUNT(*)`` is issued. A view picks its key
+with an ``ordering`` attribute, which must end in a unique column (usually
+the primary key) so positions are unambiguous.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on a composite key: the view's ``ordering``, e.g.
+    ``('-date_joined', '-id')`` for users, or ``-id`` by default.
+
+    DRF's ``CursorPagination`` keys on the first ordering field only and
+    falls back to an offset among ties; this compares the full tuple.
+    """
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        ordering = self.get_ordering(request, queryset, view)
+        self.fields = [field.lstrip('-') for field in ordering]
+        position, self.reverse = self.decode_cursor(request)
+        self.has_cursor = position is not None
+
+        if self.reverse:
+            ordering = [self._flip(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        The view's ``ordering`` if it sets one, else the paginator's; its
+        last field must be unique.
+        """
+        ordering = getattr(view, 'ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        # ``pk`` names no field; the cursor needs the real one
+        pk = queryset.model._meta.pk.name
+        ordering = tuple(
+            field.replace('pk', pk) if field.lstrip('-') == 'pk' else field for field in ordering
+        )
+        tiebreaker = queryset.model._meta.get_field(ordering[-1].lstrip('-'))
+        if not (tiebreaker.primary_key or tiebreaker.unique):
+            raise ImproperlyConfigured(
+                f'{type(self).__name__} ordering {ordering!r} on {queryset.model.__name__} '
+                'must end in a unique field, e.g. the primary key'
+            )
+        return ordering
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def _after(self, ordering, position):
+        """
+        Rows strictly after ``position`` in ``ordering``:
+        ``a > x OR (a = x AND b > y) OR ...`` with the comparison flipped
+        for descending fields. The redundant bound on the leading field
+        lets the database turn the OR into a single index range.
+        """
+        clauses = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {other.lstrip('-'): position[i] for i, other in enumerate(ordering[:index])}
+            clauses.append(Q(**equal, **{f'{name}__{lookup}': position[index]}))
+
+        leading = ordering[0]
+        bound = 'lte' if leading.startswith('-') else 'gte'
+        return Q(**{f'{leading.lstrip("-")}__{bound}': position[0]}) & reduce(lambda a, b: a | b, clauses)
+
+    def _position(self, instance):
+        # Full isoformat: DjangoJSONEncoder would truncate to milliseconds
+        return [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in (getattr(instance, field) for field in self.fields)
+        ]
+
+    def get_next_link(self):
+        if not self.page:
+            return None
+        if self.reverse or self.has_more:
+            return self._link(self._position(self.page[-1]), reverse=False)
+        return None
+
+    def get_previous_link(self):
+        if not self.page:
+            return None
+        if (self.reverse and self.has_more) or (not self.reverse and self.has_cursor):
+            return self._link(self._position(self.page[0]), reverse=True)
+        return None
+
+    def _link(self, position, reverse):
+        return self.encode_cursor((position, reverse))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            values = data['p']
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+            return position, bool(data.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor):
+        position, reverse = cursor
+        data = {'p': position}
+        if reverse:
+            data['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(data, separators=(',', ':')).encode('utf-8')
+        ).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_html_context(self):
+        return {
+            'previous_url': self.get_previous_link(),
+            'next_url': self.get_next_link(),
+        }
+
+
+class CandidateCursorPagination(KeysetPagination):
+    """
+    Candidate search results, newest profile first.
+    """
+    ordering = ('-id',)
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Admin paginator that takes the row count of an unfiltered changelist
+    from the planner statistics (``pg_class.reltuples``) on Postgres instead
+    of running ``COUNT(*)`` over the whole table. Filtered lists, small
+    tables and other databases still get an exact count.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 until the table has been analyzed
+            if row and row[0] >= settings.ADMIN_APPROXIMATE_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
@@ -0,0 +1,37 @@
+import hmac
+
+from django.conf import settings
+from rest_framework import permissions
+
+
+class IsRecruiter(permissions.BasePermission):
+    """
+    Allow recruiters and admins.
+    """
+    
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.is_recruiter or user.is_admin))
+
+
+class IsAdmin(permissions.BasePermission):
+    """
+    Allow admins and staff.
+    """
+    
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.is_admin or user.is_staff))
+
+
+class HasMetricsToken(permissions.BasePermission):
+    """
+    Allow requests bearing ``METRICS_TOKEN``. Without one set, only a
+    ``DEBUG`` server serves metrics, to anyone.
+    """
+    
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        if not token:
+            return settings.DEBUG
+        return hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}')
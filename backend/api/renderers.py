@@ -0,0 +1,119 @@
+"""
+JSON rendering backed by orjson, falling back to the standard library.
+
+``FastJSONRenderer`` and ``FastJSONParser`` are drop-in replacements for
+DRF's ``JSONRenderer`` and ``JSONParser``. orjson handles the common types
+(``str``, numbers, ``dict``, ``list``, ``UUID``) natively. Everything else
+is handed to DRF's own ``JSONEncoder``, so ``Decimal``, ``datetime`` (kept
+in DRF's millisecond ``Z`` format), lazy translations and querysets
+render exactly as before.
+
+Set ``JSON_ENGINE = 'json'`` to force the standard library. That is also
+what happens when orjson is not installed, or for output orjson cannot
+produce: indented output for the browsable API, and integers wider than
+64 bits. Unlike the standard library with ``STRICT_JSON``, orjson renders
+NaN and infinities as ``null`` instead of raising.
+"""
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _encoder.default(obj)
+
+
+def use_orjson():
+    return orjson is not None and getattr(settings, 'JSON_ENGINE', 'auto') != 'json'
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(data, sort_keys=False):
+    """
+    Compact JSON ``bytes`` for ``data``, using the same engine as the API.
+    """
+    if use_orjson():
+        try:
+            return orjson.dumps(
+                data,
+                default=_default,
+                option=ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0),
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(
+        data, cls=JSONEncoder, sort_keys=sort_keys, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that encodes compact output with orjson.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not use_orjson() or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape U+2028/U+2029 like DRF, so output stays a JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """
+    ``JSONParser`` that decodes UTF-8 request bodies with orjson.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not use_orjson() or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        # orjson rejects NaN and Infinity, matching STRICT_JSON
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    """
+    Prometheus text exposition format, for ``api.metrics.render()`` output.
+    Error details are rendered as JSON text.
+    """
+    media_type = 'text/plain'
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode()
+        return dumps(data)
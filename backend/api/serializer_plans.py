@@ -0,0 +1,228 @@
+"""
+Precompiled read path for model serializers.
+
+``Serializer.to_representation`` binds and walks its fields for every
+object: ``get_attribute`` resolves each source through ``isinstance`` and
+callable checks, and a single-object serializer rebuilds its whole field
+set through ``ModelSerializer`` introspection on every request. A
+serializer using ``CompiledReadMixin`` instead compiles its fields once per
+class into a flat plan of ``(key, getter, converter)`` steps and runs that.
+The output is the same dict DRF would produce.
+
+Only fields whose output is known to be context-free are compiled: plain
+model-field sources rendered by the stock string, number, boolean, choice,
+date/time, JSON, file and primary-key fields, plus nested serializers that
+compile themselves. A serializer with any other field keeps DRF's path,
+as does any serializer when ``SERIALIZER_PLANS`` is off.
+"""
+import operator
+import threading
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from rest_framework import fields, relations, serializers
+from rest_framework.fields import SkipField
+from rest_framework.settings import api_settings
+
+_STRING_FIELDS = (fields.CharField, fields.EmailField, fields.URLField, fields.SlugField)
+_CONTEXT_FREE_FIELDS = (
+    fields.ChoiceField, fields.DateTimeField, fields.DateField, fields.TimeField,
+    fields.DecimalField, fields.FloatField, fields.UUIDField, fields.ReadOnlyField,
+)
+
+
+def _string(value, context):
+    return value if type(value) is str else str(value)
+
+
+def _integer(value, context):
+    return value if type(value) is int else int(value)
+
+
+def _identity(value, context):
+    return value
+
+
+def _bound(field):
+    represent = field.to_representation
+    return lambda value, context: represent(value)
+
+
+def _boolean(field):
+    represent = field.to_representation
+    return lambda value, context: value if value is True or value is False else represent(value)
+
+
+def _file(field):
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+    def convert(value, context):
+        # Same as FileField.to_representation, with the caller's context
+        if not value:
+            return None
+        if not use_url:
+            return value.name
+        try:
+            url = value.url
+        except AttributeError:
+            return None
+        request = context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+    return convert
+
+
+def _nested(plan, many):
+    if many:
+        return lambda value, context: [
+            plan.represent(item, context) for item in (value.all() if hasattr(value, 'all') else value)
+        ]
+    return lambda value, context: plan.represent(value, context)
+
+
+class Plan:
+    """
+    Compiled read path of one serializer class for instances of ``model``.
+    """
+
+    def __init__(self, model, steps):
+        self.model = model
+        self.steps = steps
+
+    def represent(self, instance, context):
+        ret = {}
+        for key, getter, convert, field in self.steps:
+            try:
+                value = getter(instance)
+            except ObjectDoesNotExist:
+                value = None
+            except (AttributeError, KeyError):
+                # e.g. a null foreign key in the middle of a dotted source:
+                # let DRF apply the field's default/allow_null/required rules
+                try:
+                    value = field.get_attribute(instance)
+                except SkipField:
+                    continue
+            ret[key] = None if value is None else convert(value, context)
+        return ret
+
+
+def _source_getter(model, attrs, related_pk=False):
+    """
+    Getter for a dotted ``source`` made only of model fields, or ``None``
+    when some part of it is a property, method or unknown name.
+    """
+    names = []
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        last = index == len(attrs) - 1
+        if not last:
+            if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+                return None
+            model = model_field.related_model
+            names.append(attr)
+        elif related_pk:
+            # PrimaryKeyRelatedField only needs the column, not the object
+            if not model_field.many_to_one and not (model_field.one_to_one and model_field.concrete):
+                return None
+            names.append(model_field.attname)
+        elif model_field.many_to_many or model_field.one_to_many:
+            return None
+        else:
+            names.append(attr)
+    return operator.attrgetter('.'.join(names))
+
+
+def _compile_field(model, field):
+    if field.source == '*':
+        return None
+    field_type = type(field)
+
+    if isinstance(field, serializers.ListSerializer):
+        plan = get_plan(type(field.child))
+        getter = _source_getter(model, field.source_attrs)
+        return (getter, _nested(plan, many=True)) if plan and getter else None
+    if isinstance(field, serializers.BaseSerializer):
+        plan = get_plan(field_type)
+        getter = _source_getter(model, field.source_attrs)
+        return (getter, _nested(plan, many=False)) if plan and getter else None
+    if field_type is relations.PrimaryKeyRelatedField:
+        getter = None if field.pk_field else _source_getter(model, field.source_attrs, related_pk=True)
+        return (getter, _identity) if getter else None
+
+    getter = _source_getter(model, field.source_attrs)
+    if getter is None:
+        return None
+    if field_type in _STRING_FIELDS:
+        return getter, _string
+    if field_type is fields.IntegerField:
+        return getter, _integer
+    if field_type is fields.BigIntegerField:
+        coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING)
+        return getter, _bound(field) if coerce else _integer
+    if field_type is fields.BooleanField:
+        return getter, _boolean(field)
+    if field_type is fields.JSONField and not field.binary:
+        return getter, _identity
+    if field_type in (fields.FileField, fields.ImageField):
+        return getter, _file(field)
+    if field_type in _CONTEXT_FREE_FIELDS:
+        return getter, _bound(field)
+    return None
+
+
+def compile_plan(serializer_class):
+    """
+    Compile ``serializer_class`` into a ``Plan``, or return ``None`` if any
+    of its readable fields cannot be compiled.
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return None
+    # Custom to_representation overrides are not reproduced
+    if serializer_class.to_representation not in (
+        serializers.Serializer.to_representation, CompiledReadMixin.to_representation,
+    ):
+        return None
+
+    steps = []
+    for field in serializer_class()._readable_fields:
+        compiled = _compile_field(model, field)
+        if compiled is None:
+            return None
+        getter, convert = compiled
+        steps.append((field.field_name, getter, convert, field))
+    return Plan(model, steps)
+
+
+_plans = {}
+_lock = threading.RLock()  # Compiling a serializer compiles its nested ones
+
+
+def get_plan(serializer_class):
+    try:
+        return _plans[serializer_class]
+    except KeyError:
+        pass
+    with _lock:
+        if serializer_class not in _plans:
+            _plans[serializer_class] = compile_plan(serializer_class)
+        return _plans[serializer_class]
+
+
+class CompiledReadMixin:
+    """
+    Serialize through a compiled ``Plan`` instead of binding fields per
+    object. Only for serializers whose fields do not depend on the
+    instance or context.
+    """
+
+    def to_representation(self, instance):
+        plan = get_plan(type(self))
+        if plan is None or not settings.SERIALIZER_PLANS or not isinstance(instance, plan.model):
+            return super().to_representation(instance)
+        return plan.represent(instance, self.context)
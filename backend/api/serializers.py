@@ -1,7 +1,15 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer as BaseTokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .hashing import check_user_password, set_user_password
+from .last_login import record_login
 from .models import User, UserProfile
+from .serializer_plans import CompiledReadMixin
+from .tokens import UserRefreshToken
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -26,12 +34,55 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
+        password = validated_data.pop('password')
+        validated_data['email'] = User.objects.normalize_email(validated_data['email'])
+        user = User(**validated_data)
+        set_user_password(user, password)
+        user.save()
         # Create user profile
         UserProfile.objects.create(user=user)
         return user
 
 
+class SkillListField(serializers.ListField):
+    """
+    List of skill names; also accepts a ``;``-separated string (CSV cells).
+    """
+    child = serializers.CharField(max_length=100)
+    
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [part.strip() for part in data.split(';') if part.strip()]
+        return super().to_internal_value(data)
+
+
+class UserImportRowSerializer(UserRegistrationSerializer):
+    """
+    Serializer for one row of a bulk user import. Applies the registration
+    rules minus the password, which the user sets from an invitation link.
+    Email uniqueness is checked per chunk by the importer.
+    """
+    password = None
+    password_confirm = None
+    location = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    experience_years = serializers.IntegerField(required=False, min_value=0, default=0)
+    skills = SkillListField(required=False, default=list)
+    bio = serializers.CharField(required=False, allow_blank=True)
+    
+    class Meta(UserRegistrationSerializer.Meta):
+        fields = [
+            'email', 'user_type', 'first_name', 'last_name', 'phone_number',
+            'location', 'experience_years', 'skills', 'bio'
+        ]
+        extra_kwargs = {
+            **UserRegistrationSerializer.Meta.extra_kwargs,
+            'email': {'validators': []},
+        }
+    
+    def validate(self, attrs):
+        return attrs
+
+
 class UserLoginSerializer(serializers.Serializer):
     """
     Serializer for user login.
@@ -55,7 +106,50 @@ class UserLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError('Must include email and password')
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    """
+    Token pair serializer issuing tokens with the user claims embedded.
+    """
+    token_class = UserRefreshToken
+    
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        # UPDATE_LAST_LOGIN is off; record it without writing the row now
+        record_login(self.user.pk)
+        return data
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Token refresh serializer using the cache-fronted blacklist check. The
+    new tokens' user claims are read from the database rather than copied
+    from the old refresh token.
+    """
+    token_class = UserRefreshToken
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            refresh.blacklist()
+        refresh.set_user_claims(user)
+        data = {'access': str(refresh.access_token)}
+        
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
+
+
+class UserProfileSerializer(CompiledReadMixin, serializers.ModelSerializer):
     """
     Serializer for user profile.
     """
@@ -77,7 +171,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CompiledReadMixin, serializers.ModelSerializer):
     """
     Serializer for user information.
     """
@@ -90,6 +184,71 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_email_verified']
 
 
+class CandidateSerializer(CompiledReadMixin, serializers.ModelSerializer):
+    """
+    Serializer for candidate search results.
+    """
+    user = serializers.PrimaryKeyRelatedField(read_only=True)
+    first_name = serializers.CharField(source='user.first_name', read_only=True)
+    last_name = serializers.CharField(source='user.last_name', read_only=True)
+    
+    class Meta:
+        model = UserProfile
+        fields = [
+            'id', 'user', 'first_name', 'last_name', 'bio', 'location',
+            'skills', 'experience_years', 'education'
+        ]
+        read_only_fields = fields
+
+
+class CandidateSearchSerializer(serializers.Serializer):
+    """
+    Serializer for candidate search query parameters.
+    """
+    skills = serializers.CharField(required=False, help_text='Comma-separated; candidates must have all of them')
+    location = serializers.CharField(required=False, max_length=100)
+    min_experience = serializers.IntegerField(required=False, min_value=0)
+    max_experience = serializers.IntegerField(required=False, min_value=0)
+    
+    def validate_skills(self, value):
+        skills = [skill for skill in (part.strip() for part in value.split(',')) if skill]
+        if len(skills) > 20:
+            raise serializers.ValidationError("At most 20 skills can be searched at once.")
+        return skills
+    
+    def validate(self, attrs):
+        minimum, maximum = attrs.get('min_experience'), attrs.get('max_experience')
+        if minimum is not None and maximum is not None and minimum > maximum:
+            raise serializers.ValidationError("min_experience cannot exceed max_experience.")
+        return attrs
+
+
+class MatchWeightsSerializer(serializers.Serializer):
+    """
+    Serializer for per-request overrides of ``MATCHING_DEFAULT_WEIGHTS``.
+    """
+    required_skills = serializers.FloatField(required=False, min_value=0)
+    preferred_skills = serializers.FloatField(required=False, min_value=0)
+    experience = serializers.FloatField(required=False, min_value=0)
+    location = serializers.FloatField(required=False, min_value=0)
+
+
+class MatchRequestSerializer(serializers.Serializer):
+    """
+    Serializer for a job requirement to match candidates against.
+    """
+    required_skills = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False, default=list, max_length=50
+    )
+    preferred_skills = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False, default=list, max_length=50
+    )
+    min_experience = serializers.IntegerField(required=False, default=0, min_value=0)
+    location = serializers.CharField(required=False, default='', allow_blank=True, max_length=100)
+    weights = MatchWeightsSerializer(required=False)
+    top_k = serializers.IntegerField(required=False, default=20, min_value=1, max_value=200)
+
+
 class PasswordChangeSerializer(serializers.Serializer):
     """
     Serializer for password change.
@@ -105,7 +264,7 @@ class PasswordChangeSerializer(serializers.Serializer):
     
     def validate_old_password(self, value):
         user = self.context['request'].user
-        if not user.check_password(value):
+        if not check_user_password(user, value):
             raise serializers.ValidationError('Old password is incorrect')
         return value
 
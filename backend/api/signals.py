@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from . import metrics, skills, slow_queries, tokens
+from .models import ProfileSkill, Skill, SkillAlias, User, UserProfile
+from .user_cache import USER_PAYLOAD_FIELDS, invalidate_user_payload
+
+
+def _matrix_store():
+    # Imported on first use: it pulls in numpy, which django.setup() (and so
+    # every management command) would otherwise pay for
+    from . import matrix_store
+    return matrix_store
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, update_fields=None, **kwargs):
+    """
+    Drop the cached payload when a serialized user field may have changed.
+    """
+    if update_fields and USER_PAYLOAD_FIELDS.isdisjoint(update_fields):
+        return
+    invalidate_user_payload(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    invalidate_user_payload(instance.user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+def sync_profile_skills(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Keep the ``ProfileSkill`` lookup rows in step with ``skills``.
+    """
+    if raw or (update_fields and 'skills' not in update_fields):
+        return
+    if created and not instance.skills:
+        return
+    ProfileSkill.objects.sync(instance)
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+@receiver(post_delete, sender=SkillAlias)
+def invalidate_skill_index(sender, **kwargs):
+    # Reloading before the commit would miss the change
+    transaction.on_commit(skills.invalidate)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def cache_blacklisted_token(sender, instance, raw=False, **kwargs):
+    """
+    Tokens blacklisted outside ``UserRefreshToken.blacklist()`` (the admin,
+    scripts) must replace a cached 'not blacklisted' answer too.
+    """
+    if not raw:
+        tokens.cache_blacklisted(instance.token.jti, instance.token.expires_at)
+
+
+@receiver(post_save, sender=UserProfile)
+def journal_profile_change(sender, instance, raw=False, **kwargs):
+    """
+    Keep the shared matching matrix current (see ``api.matrix_store``).
+    """
+    if not raw:
+        _matrix_store().profile_changed(instance)
+
+
+@receiver(post_delete, sender=UserProfile)
+def journal_profile_delete(sender, instance, **kwargs):
+    _matrix_store().profile_deleted(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def journal_user_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Activating, deactivating or retyping a user moves its profile in or
+    out of the candidate matrix.
+    """
+    matrix_store = _matrix_store()
+    if raw or not matrix_store.enabled():
+        return
+    if update_fields and {'is_active', 'user_type'}.isdisjoint(update_fields):
+        return
+    try:
+        profile = instance.profile
+    except UserProfile.DoesNotExist:
+        return
+    matrix_store.profile_changed(profile)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """
+    Count queries against the current request (see ``api.metrics``) and
+    capture slow ones (``api.slow_queries``). Fired again on reconnect, so
+    only add the wrappers once.
+    """
+    wrappers = [metrics.execute_wrapper]
+    if settings.SLOW_QUERY_ENABLED:
+        wrappers.append(slow_queries.execute_wrapper)
+    for wrapper in wrappers:
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
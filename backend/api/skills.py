@@ -0,0 +1,170 @@
+"""
+In-process map from skill names and aliases to ``Skill`` ids.
+
+Each process loads the whole taxonomy once and resolves names with plain
+dictionary lookups, so matching and filtering work on integer ids. Names
+are interned: the map holds one string per skill no matter how many
+profiles use it.
+
+Editing a skill or alias bumps a version key in the shared cache, and so
+does creating skills on the fly for previously unseen names. Other
+processes notice within ``SKILL_INDEX_CHECK_INTERVAL`` seconds and reload.
+Until then, a name missing from a process's map is looked up in the
+database before it is treated as unknown.
+
+Only committed rows enter the map: inside a transaction an index is built
+for the caller alone and kept once the transaction commits, and ids found
+or created in one are added on commit, so a rollback leaves nothing behind.
+"""
+import sys
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Skill, SkillAlias, normalize_skill
+
+VERSION_KEY = 'skill-index-version'
+
+
+class SkillIndex:
+    """
+    Snapshot of the taxonomy: ``ids`` maps normalized names and aliases to
+    skill ids, ``names`` maps ids back to normalized names.
+    """
+    
+    def __init__(self, version):
+        self.version = version
+        self.ids = {}
+        self.names = {}
+        for skill_id, name in Skill.objects.values_list('pk', 'normalized_name'):
+            self.add(skill_id, name)
+        # Aliases win over auto-created skills with the same spelling
+        for skill_id, name in SkillAlias.objects.values_list('skill_id', 'name'):
+            self.ids[sys.intern(name)] = skill_id
+    
+    def add(self, skill_id, name):
+        name = sys.intern(name)
+        self.ids.setdefault(name, skill_id)
+        self.names[skill_id] = name
+
+
+_index = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def get_index():
+    """
+    Return this process's ``SkillIndex``, reloading it when the taxonomy
+    version has changed.
+    """
+    global _index, _checked_at
+    
+    interval = getattr(settings, 'SKILL_INDEX_CHECK_INTERVAL', 30)
+    if _index is not None and time.monotonic() - _checked_at < interval:
+        return _index
+    
+    with _lock:
+        if _index is not None and time.monotonic() - _checked_at < interval:
+            return _index
+        version = _current_version()
+        if _index is not None and _index.version == version:
+            _checked_at = time.monotonic()
+            return _index
+    
+    index = SkillIndex(version)
+    # It may hold rows of this transaction, which can still roll back
+    transaction.on_commit(partial(_publish, index))
+    return index
+
+
+def _publish(index):
+    global _index, _checked_at
+    with _lock:
+        _index = index
+        _checked_at = time.monotonic()
+
+
+def invalidate():
+    """
+    Drop this process's index and make every other process reload.
+    """
+    global _index
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 2, timeout=None)
+    with _lock:
+        _index = None
+
+
+def resolve_skills(names, create=False):
+    """
+    Map names to skill ids as ``{normalized_name: skill_id}``.
+
+    Names unknown to the taxonomy are left out, or with ``create=True``
+    added to it as new skills.
+    """
+    index = get_index()
+    resolved = {}
+    missing = set()
+    for name in names:
+        name = normalize_skill(name)
+        skill_id = index.ids.get(name)
+        if skill_id is None:
+            missing.add(name)
+        else:
+            resolved[name] = skill_id
+    
+    if missing:
+        # Another process may have added them since our load
+        resolved.update(_load_skills(index, missing))
+        missing -= resolved.keys()
+    if missing and create:
+        resolved.update(_create_skills(index, missing))
+    return resolved
+
+
+def _load_skills(index, names):
+    skills = dict(Skill.objects.filter(normalized_name__in=names).values_list('normalized_name', 'pk'))
+    aliases = dict(SkillAlias.objects.filter(name__in=names).values_list('name', 'skill_id'))
+    # They may be this transaction's own rows
+    transaction.on_commit(partial(_register, index, skills, aliases))
+    return {**skills, **aliases}
+
+
+def _register(index, skills, aliases):
+    with _lock:
+        for name, skill_id in skills.items():
+            index.add(skill_id, name)
+        # Aliases win over skills with the same spelling, as in SkillIndex
+        for name, skill_id in aliases.items():
+            index.ids[sys.intern(name)] = skill_id
+
+
+def _create_skills(index, names):
+    Skill.objects.bulk_create(
+        [Skill(name=name, normalized_name=name) for name in names],
+        ignore_conflicts=True,
+    )
+    found = dict(Skill.objects.filter(normalized_name__in=names).values_list('normalized_name', 'pk'))
+    # bulk_create sends no post_save, so tell every process here, this one
+    # included, once the rows are committed
+    transaction.on_commit(invalidate)
+    return found
+
+
+def skill_name(skill_id):
+    return get_index().names.get(skill_id)
@@ -0,0 +1,228 @@
+"""
+Slow-query capture.
+
+``execute_wrapper`` (installed on every connection by ``api.signals``)
+times each query. When one takes at least ``SLOW_QUERY_THRESHOLD_MS``, it
+is queued together with the view serving the request (through
+``api.metrics.current``) and the project frames of its stack. Everything
+else happens on a background thread, off the request path: the SQL is
+normalized and fingerprinted, a ``SLOW_QUERY_EXPLAIN_SAMPLE_RATE`` share
+of the queries get an ``EXPLAIN (ANALYZE off, FORMAT JSON)`` plan from a
+connection of the thread's own, and a ``SlowQuery`` row is saved. The table
+is a ring buffer that keeps the newest ``SLOW_QUERY_BUFFER_SIZE`` rows,
+trimmed once every ``TRIM_EVERY`` captures rather than on each one.
+
+Parameters are only passed to the EXPLAIN and are never stored, so emails,
+password hashes and token digests stay out of the table. psycopg2 inlines
+them into the statement, so PostgreSQL prints them in plan conditions such
+as ``Filter`` and ``Index Cond``; every literal in a plan is replaced by
+``?`` before it is saved.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from . import metrics
+from .models import SlowQuery
+
+logger = logging.getLogger(__name__)
+
+# Captures waiting for the background thread; more are dropped
+MAX_PENDING = 1000
+# Project frames kept per capture, innermost last
+STACK_DEPTH = 8
+# Captures per trim of the ring buffer, which may overshoot by as many rows
+TRIM_EVERY = 50
+# Statements captured, all of which EXPLAIN accepts; schema changes and
+# transaction control are left out
+CAPTURED = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w."])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b')
+_PARAMETER = re.compile(r'%s')
+_LIST = re.compile(r'\(\?(?:, \?)+\)')
+_ROWS = re.compile(r'\(\.\.\.\)(?:, \(\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+_pending = None
+_pending_pid = None
+_worker = None
+_dropped = 0
+_lock = threading.Lock()
+
+
+def normalize(sql):
+    """
+    ``sql`` with literals and parameters replaced by ``?``, lists of them
+    collapsed to ``(...)`` and whitespace collapsed, so queries that differ
+    only in their values read the same.
+    """
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PARAMETER.sub('?', sql)
+    sql = _LIST.sub('(...)', sql)
+    return _ROWS.sub('(...), ...', sql)
+
+
+def scrub_plan(plan):
+    """
+    ``plan`` with the string and number literals in its strings replaced
+    by ``?``. Numbers outside strings (costs, row estimates) are kept.
+    """
+    if isinstance(plan, dict):
+        return {key: scrub_plan(value) for key, value in plan.items()}
+    if isinstance(plan, list):
+        return [scrub_plan(value) for value in plan]
+    if isinstance(plan, str):
+        return _NUMBER.sub('?', _STRING.sub('?', plan))
+    return plan
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def _stack():
+    base = os.path.join(str(settings.BASE_DIR), '')
+    # The execute wrappers are in every stack
+    wrappers = {__file__, metrics.__file__}
+    frames = []
+    for frame, lineno in traceback.walk_stack(None):
+        filename = frame.f_code.co_filename
+        if not filename.startswith(base) or 'site-packages' in filename or filename in wrappers:
+            continue
+        frames.append(f'{os.path.relpath(filename, base)}:{lineno} in {frame.f_code.co_name}')
+        if len(frames) == STACK_DEPTH:
+            break
+    return '\n'.join(reversed(frames))
+
+
+def _route():
+    stats = metrics.current.get()
+    if stats is None or stats.request is None:
+        return ''
+    match = stats.request.resolver_match
+    return match.view_name if match else 'unmatched'
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    """
+    Database ``execute_wrapper`` capturing queries over the threshold.
+    Failed queries count too: a statement timeout is a slow query.
+    """
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        if (
+            duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS
+            and threading.current_thread() is not _worker
+            and sql.lstrip()[:6].upper().startswith(CAPTURED)
+        ):
+            _capture(sql, params, many, context['connection'].alias, duration_ms)
+
+
+def _capture(sql, params, many, alias, duration_ms):
+    global _dropped
+    sampled = not many and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    item = (sql, params if sampled else None, sampled, alias, duration_ms, _route(), _stack())
+    with _lock:
+        _ensure_worker()
+        try:
+            _pending.put_nowait(item)
+        except queue.Full:
+            _dropped += 1
+
+
+def _ensure_worker():
+    """
+    Start the background thread in this process, as ``api.last_login``
+    does. Must be called with ``_lock`` held.
+    """
+    global _pending, _pending_pid, _worker
+    if _pending_pid == os.getpid() and _worker is not None and _worker.is_alive():
+        return
+    if _pending_pid != os.getpid():
+        # A forked worker starts with a queue of its own
+        _pending = queue.Queue(MAX_PENDING)
+    _pending_pid = os.getpid()
+    _worker = threading.Thread(target=_run_worker, name='slow-query-recorder', daemon=True)
+    _worker.start()
+
+
+def _run_worker():
+    global _dropped
+    while True:
+        item = _pending.get()
+        try:
+            record(*item)
+        except Exception:
+            logger.exception('Recording a slow query failed')
+        if _pending.empty():
+            with _lock:
+                dropped, _dropped = _dropped, 0
+            if dropped:
+                logger.warning('Dropped %d slow queries: the recorder fell behind', dropped)
+            # Idle until the next slow query; don't hold connections open
+            connections.close_all()
+
+
+def explain(sql, params, alias='default'):
+    """
+    The plan for ``sql`` without running it: PostgreSQL's JSON plan with
+    its literals scrubbed, or SQLite's ``EXPLAIN QUERY PLAN`` rows, which
+    print ``?`` for parameters already. ``None`` for other backends.
+    """
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN (ANALYZE off, FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            # psycopg2 decodes the json column; other drivers may not
+            return scrub_plan(plan if isinstance(plan, list) else json.loads(plan))
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [{'id': row[0], 'parent': row[1], 'detail': row[3]} for row in cursor.fetchall()]
+    return None
+
+
+def record(sql, params, explain_query, alias, duration_ms, route='', stack=''):
+    """
+    Save one capture, and every ``TRIM_EVERY`` ids trim the table to the
+    newest ``SLOW_QUERY_BUFFER_SIZE`` rows.
+    """
+    plan = None
+    if explain_query:
+        try:
+            # A savepoint, so a failed EXPLAIN leaves a transaction usable
+            with transaction.atomic(using=alias):
+                plan = explain(sql, params, alias)
+        except Exception as exc:
+            # E.g. a table created inside the request's transaction
+            logger.info('EXPLAIN of a slow query failed: %s', exc)
+
+    normalized = normalize(sql)
+    row = SlowQuery.objects.create(
+        fingerprint=fingerprint(normalized),
+        sql=normalized,
+        duration_ms=duration_ms,
+        database=alias,
+        route=route[:200],
+        stack=stack,
+        plan=plan,
+    )
+    if row.id % TRIM_EVERY == 0:
+        SlowQuery.objects.filter(id__lte=row.id - settings.SLOW_QUERY_BUFFER_SIZE).delete()
+    return row
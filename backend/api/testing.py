@@ -0,0 +1,69 @@
+"""
+Test helpers that pin the number of SQL queries each endpoint may issue.
+
+Usage in a test case::
+
+    class UserEndpointTests(QueryBudgetMixin, APITestCase):
+        def test_user_info(self):
+            with self.assertQueryBudget('api:user-info'):
+                self.client.get(reverse('api:user-info'))
+
+A change that adds a query (e.g. a serializer touching an unjoined
+relation) fails the test with the captured SQL in the message.
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+# Maximum queries per endpoint, keyed by URL name, as counted under the
+# testing settings (SQLite reports the BEGIN/COMMIT around deletes).
+# Authentication counts towards the budget. ClaimsJWTAuthentication needs no
+# query; the token-backed user loads itself (with profile) in one query when
+# the cached payload misses or a permission reads its user_type.
+QUERY_BUDGETS = {
+    'api:user-info': 1,
+    'api:user-detail': 1,
+    'api:user-profile': 1,
+    # Credentials lookup (profile joined) and the OutstandingToken row that
+    # lets the refresh token be blacklisted
+    'api:login': 2,
+    'api:register': 8,
+    # Anonymous link click: token lookup, single-use delete, user update
+    'api:verify-email': 5,
+    # IsRecruiter loads the user; the skill filter is a subquery on the
+    # ProfileSkill lookup table
+    'api:candidate-search': 2,
+    # IsRecruiter loads the user; with the worker's candidate matrix built,
+    # one query for the top-k profiles
+    'api:candidate-match': 2,
+}
+
+
+@contextmanager
+def assert_max_queries(budget, using=DEFAULT_DB_ALIAS, label=None):
+    """
+    Fail if the wrapped block runs more than ``budget`` queries.
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    executed = len(context.captured_queries)
+    if executed > budget:
+        queries = '\n'.join(
+            f'{i}. {query["sql"]}' for i, query in enumerate(context.captured_queries, start=1)
+        )
+        raise AssertionError(
+            f'{label or "Block"} ran {executed} queries, budget is {budget}:\n{queries}'
+        )
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin exposing ``assertQueryBudget`` for the endpoints in
+    ``QUERY_BUDGETS``.
+    """
+    query_budgets = QUERY_BUDGETS
+    
+    def assertQueryBudget(self, url_name, using=DEFAULT_DB_ALIAS):
+        return assert_max_queries(self.query_budgets[url_name], using=using, label=url_name)
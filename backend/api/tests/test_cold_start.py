@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from api.management.commands.import_report import TARGETS, cold_start
+
+
+class ColdStartBudgetTests(SimpleTestCase):
+    """
+    What ``manage.py import_report --check`` enforces, on every test run.
+    """
+
+    def test_cold_start_within_budget(self):
+        for target in TARGETS:
+            with self.subTest(target=target):
+                median, baseline = cold_start(target, runs=3)
+                self.assertLessEqual(
+                    median / baseline,
+                    settings.COLD_START_BUDGET[target],
+                    f'{target} cold start {median:.0f} ms against a {baseline:.0f} ms baseline; '
+                    'run `manage.py import_report` to see which imports grew',
+                )
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.emails import _claim_due_jobs, process_outbox, queue_email, retry_delay
+from api.models import EmailJob
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP unavailable')
+
+
+@override_settings(EMAIL_OUTBOX_LEASE_SECONDS=300, EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+class OutboxTests(TestCase):
+
+    def queue(self, subject, **fields):
+        job = queue_email(subject, 'body', ['ana@example.com'])
+        if fields:
+            EmailJob.objects.filter(pk=job.pk).update(**fields)
+        return job
+
+    def test_claim_takes_due_jobs_oldest_first_and_leases_them(self):
+        now = timezone.now()
+        newer = self.queue('newer', next_attempt_at=now - timedelta(seconds=1))
+        older = self.queue('older', next_attempt_at=now - timedelta(seconds=10))
+        self.queue('later', next_attempt_at=now + timedelta(minutes=5))
+        self.queue('sent', status=EmailJob.Status.SENT)
+
+        self.assertEqual([older.pk, newer.pk], [job.pk for job in _claim_due_jobs(10)])
+        leased = EmailJob.objects.filter(pk__in=[older.pk, newer.pk]).values_list('next_attempt_at', flat=True)
+        self.assertTrue(all(when >= now + timedelta(seconds=299) for when in leased))
+        # Leased jobs are not handed to the next worker
+        self.assertEqual([], _claim_due_jobs(10))
+
+    def test_claim_respects_the_batch_size(self):
+        for subject in 'abc':
+            self.queue(subject)
+        self.assertEqual(2, len(_claim_due_jobs(2)))
+        self.assertEqual(1, len(_claim_due_jobs(2)))
+
+    def test_process_outbox_sends_over_one_connection(self):
+        first, second = self.queue('first'), self.queue('second')
+        self.assertEqual((2, 0), process_outbox())
+        self.assertEqual(['first', 'second'], sorted(message.subject for message in mail.outbox))
+        for job in (first, second):
+            job.refresh_from_db()
+            self.assertEqual((EmailJob.Status.SENT, 1), (job.status, job.attempts))
+
+    def test_failures_are_retried_with_backoff_then_given_up(self):
+        job = self.queue('flaky')
+        backend = 'api.tests.test_emails.FailingBackend'
+        self.assertEqual((0, 1), process_outbox(backend=backend))
+        job.refresh_from_db()
+        self.assertEqual((EmailJob.Status.PENDING, 1), (job.status, job.attempts))
+        self.assertGreater(job.next_attempt_at, timezone.now() + retry_delay(1) - timedelta(seconds=5))
+        self.assertIn('SMTP unavailable', job.last_error)
+
+        EmailJob.objects.filter(pk=job.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual((0, 1), process_outbox(backend=backend))
+        job.refresh_from_db()
+        self.assertEqual((EmailJob.Status.FAILED, 2), (job.status, job.attempts))
+        self.assertEqual((0, 0), process_outbox(backend=backend))
+
+    @override_settings(EMAIL_OUTBOX_RETRY_BACKOFF=30, EMAIL_OUTBOX_RETRY_BACKOFF_MAX=100)
+    def test_retry_delay(self):
+        self.assertEqual([30, 60, 100], [retry_delay(n).total_seconds() for n in (1, 2, 3)])
@@ -0,0 +1,68 @@
+import json
+from datetime import timedelta
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.exports import start_export
+from api.hashing import check_user_password
+from api.models import User
+from api.tokens import UserRefreshToken
+
+
+def export_ids(since):
+    chunks, watermark = start_export('jsonl', since=since)
+    rows = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+    return [row['id'] for row in rows], watermark
+
+
+class IncrementalExportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='a@example.com', password='old-password')
+        User.objects.create_user(email='b@example.com', password='x')
+        self.since = timezone.now()
+
+    def test_partial_save_moves_updated_at(self):
+        self.user.is_email_verified = True
+        self.user.save(update_fields=['is_email_verified'])
+        self.assertEqual([self.user.pk], export_ids(self.since)[0])
+
+    def test_last_login_save_does_not(self):
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual([], export_ids(self.since)[0])
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_rehash_on_login_is_exported(self):
+        self.assertTrue(check_user_password(self.user, 'old-password'))
+        self.assertEqual([self.user.pk], export_ids(self.since)[0])
+
+    @override_settings(EXPORT_WATERMARK_OVERLAP=60)
+    def test_watermark_overlaps_the_previous_export(self):
+        ids, watermark = export_ids(None)
+        self.assertLessEqual(watermark, timezone.now() - timedelta(seconds=60))
+        # Rows changed just before an export are exported again next time
+        self.assertEqual(ids, export_ids(watermark)[0])
+
+
+class InvalidSinceTests(APITestCase):
+
+    def test_view_rejects_invalid_since(self):
+        admin = User.objects.create_user(email='admin@example.com', password='x', user_type=User.UserType.ADMIN)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {UserRefreshToken.for_user(admin).access_token}')
+        url = reverse('api:user-export', kwargs={'file_format': 'jsonl'})
+        for since in ('yesterday', '2024-13-45T00:00:00'):
+            with self.subTest(since=since):
+                self.assertEqual(400, self.client.get(url, {'since': since}).status_code)
+
+    def test_command_rejects_invalid_since(self):
+        for since in ('yesterday', '2024-13-45T00:00:00'):
+            with self.subTest(since=since), self.assertRaises(CommandError):
+                call_command('export_users', since=since)
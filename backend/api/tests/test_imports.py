@@ -0,0 +1,98 @@
+import io
+import json
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from api import skills
+from api.imports import import_users, read_rows
+from api.models import EmailJob, User, UserToken
+
+CSV = (
+    'email,first_name,last_name,user_type,location,experience_years,skills\n'
+    'ana@example.com,Ana,Müller,candidate,Berlin,7,Python; Django\n'
+    'ben@example.com,Ben,Kim,recruiter,,,\n'
+)
+
+
+def jsonl(*rows):
+    return '\n'.join(row if isinstance(row, str) else json.dumps(row) for row in rows).encode()
+
+
+def row(email, **fields):
+    return {'email': email, 'first_name': 'First', 'last_name': 'Last', **fields}
+
+
+class ImportUsersTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        skills.invalidate()
+
+    def run_import(self, data, file_format='jsonl', **kwargs):
+        return import_users(read_rows(io.BytesIO(data), file_format), **kwargs)
+
+    def test_csv(self):
+        result = self.run_import(CSV.encode('utf-8-sig'), 'csv')
+        self.assertEqual((2, 2, 0), (result.total, result.created, result.failed))
+        ana = User.objects.with_profile().get(email='ana@example.com')
+        self.assertEqual(('Ana', 'Müller', User.UserType.CANDIDATE), (ana.first_name, ana.last_name, ana.user_type))
+        self.assertEqual(('Berlin', 7), (ana.profile.location, ana.profile.experience_years))
+        self.assertEqual(User.UserType.RECRUITER, User.objects.get(email='ben@example.com').user_type)
+
+    def test_jsonl_parse_errors_are_reported_by_line(self):
+        result = self.run_import(jsonl(row('ana@example.com'), '', '{not json', '[1, 2]', row('ben@example.com')))
+        self.assertEqual((4, 2, 2), (result.total, result.created, result.failed))
+        self.assertEqual([3, 4], [error['row'] for error in result.errors])
+        self.assertTrue(result.errors[0]['errors']['non_field_errors'][0].startswith('Invalid JSON'))
+        self.assertEqual(['Expected a JSON object'], result.errors[1]['errors']['non_field_errors'])
+
+    def test_invalid_rows_are_skipped(self):
+        result = self.run_import(jsonl(
+            row('ana@example.com'),
+            {'email': 'no-name@example.com'},
+            row('not-an-email'),
+            row('ben@example.com', experience_years=-1),
+        ))
+        self.assertEqual(1, result.created)
+        self.assertEqual([2, 3, 4], [error['row'] for error in result.errors])
+        self.assertIn('first_name', result.errors[0]['errors'])
+        self.assertIn('email', result.errors[1]['errors'])
+        self.assertIn('experience_years', result.errors[2]['errors'])
+        self.assertEqual(['ana@example.com'], list(User.objects.values_list('email', flat=True)))
+
+    def test_duplicates_in_the_file_and_the_database(self):
+        User.objects.create_user(email='taken@example.com', password='x')
+        # chunk_size=1: the file's duplicate lands in a later chunk
+        result = self.run_import(
+            jsonl(row('ana@example.com'), row('ana@EXAMPLE.com'), row('taken@example.com')),
+            chunk_size=1,
+        )
+        self.assertEqual((1, 2), (result.created, result.failed))
+        self.assertEqual(
+            [(2, ['Duplicate email in this file.']), (3, ['A user with this email already exists.'])],
+            [(error['row'], error['errors']['email']) for error in result.errors],
+        )
+
+    def test_skills_are_linked(self):
+        self.run_import(jsonl(
+            row('ana@example.com', skills=['Python', 'python ', 'Django']),
+            row('ben@example.com', skills='Python; Go'),
+        ))
+        linked = {
+            user.email: set(user.profile.skill_set.values_list('normalized_name', flat=True))
+            for user in User.objects.with_profile()
+        }
+        self.assertEqual({'ana@example.com': {'python', 'django'}, 'ben@example.com': {'python', 'go'}}, linked)
+
+    def test_users_get_an_unusable_password_and_an_invitation(self):
+        self.run_import(jsonl(row('ana@example.com')))
+        user = User.objects.get(email='ana@example.com')
+        self.assertFalse(user.has_usable_password())
+        self.assertTrue(UserToken.objects.filter(user=user, purpose=UserToken.Purpose.INVITATION).exists())
+        self.assertEqual([['ana@example.com']], list(EmailJob.objects.values_list('recipients', flat=True)))
+
+    def test_without_invitations(self):
+        self.run_import(jsonl(row('ana@example.com')), send_invitations=False)
+        self.assertFalse(UserToken.objects.exists())
+        self.assertFalse(EmailJob.objects.exists())
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import last_login
+from api.models import User
+
+
+@override_settings(LAST_LOGIN_MAX_STALENESS=30, LAST_LOGIN_FLUSH_BATCH_SIZE=2)
+class LastLoginTests(TestCase):
+
+    def setUp(self):
+        # flush() is called directly; no background thread
+        patcher = mock.patch.object(last_login, '_ensure_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        last_login._pending.clear()
+        self.addCleanup(last_login._pending.clear)
+        self.users = [User.objects.create_user(email=f'user{i}@example.com', password='x') for i in range(3)]
+        self.now = timezone.now()
+
+    def last_logins(self):
+        return list(User.objects.order_by('pk').values_list('last_login', flat=True))
+
+    def test_logins_are_buffered_until_flushed(self):
+        last_login.record_login(self.users[0].pk, self.now)
+        self.assertEqual([None, None, None], self.last_logins())
+        self.assertEqual(1, last_login.flush())
+        self.assertEqual([self.now, None, None], self.last_logins())
+        self.assertEqual(0, last_login.flush())
+
+    def test_repeated_logins_coalesce_to_the_latest(self):
+        user_id = self.users[0].pk
+        for when in (self.now, self.now + timedelta(seconds=5), self.now + timedelta(seconds=1)):
+            last_login.record_login(user_id, when)
+        self.assertEqual(1, last_login.flush())
+        self.assertEqual(self.now + timedelta(seconds=5), self.last_logins()[0])
+
+    def test_flush_writes_every_batch(self):
+        for user in self.users:
+            last_login.record_login(user.pk, self.now)
+        self.assertEqual(3, last_login.flush())
+        self.assertEqual([self.now] * 3, self.last_logins())
+
+    def test_flush_never_moves_last_login_back(self):
+        User.objects.filter(pk=self.users[0].pk).update(last_login=self.now)
+        last_login.record_login(self.users[0].pk, self.now - timedelta(minutes=1))
+        last_login.flush()
+        self.assertEqual(self.now, self.last_logins()[0])
+
+    def test_failed_batch_is_requeued(self):
+        for user in self.users:
+            last_login.record_login(user.pk, self.now)
+        with mock.patch.object(last_login, '_write', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            last_login.flush()
+        self.assertEqual(3, last_login.flush())
+        self.assertEqual([self.now] * 3, self.last_logins())
+
+    @override_settings(LAST_LOGIN_MAX_STALENESS=0)
+    def test_zero_staleness_writes_immediately(self):
+        last_login.record_login(self.users[0].pk, self.now)
+        self.assertEqual([self.now, None, None], self.last_logins())
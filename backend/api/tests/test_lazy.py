@@ -0,0 +1,32 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+from django.views import View
+
+from hireiq_backend.lazy import LazyView
+
+
+class PlainView(View):
+
+    def post(self, request):
+        return HttpResponse('ok')
+
+
+urlpatterns = [
+    path('plain/', LazyView('api.tests.test_lazy.PlainView')),
+    path('schema/', LazyView('drf_spectacular.views.SpectacularAPIView')),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class LazyViewCsrfTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = self.client_class(enforce_csrf_checks=True)
+
+    def test_plain_view_keeps_csrf_protection(self):
+        self.assertFalse(LazyView('api.tests.test_lazy.PlainView').csrf_exempt)
+        self.assertEqual(403, self.client.post('/plain/').status_code)
+
+    def test_api_view_is_exempt_like_the_view_itself(self):
+        self.assertTrue(LazyView('drf_spectacular.views.SpectacularAPIView').csrf_exempt)
@@ -0,0 +1,27 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from api import skills
+from api.matching import CandidateMatrix, score
+from api.models import Skill, SkillAlias
+
+
+class ScoreTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        skills.invalidate()
+        python = Skill.objects.create(name='Python')
+        SkillAlias.objects.create(skill=python, name='py')
+        # One candidate who knows Python and nothing else
+        self.matrix = CandidateMatrix.from_rows({1: (0, '', [python.pk])})
+
+    def required_skills(self, names):
+        _, components = score(self.matrix, required_skills=names)
+        return float(components['required_skills'][0])
+
+    def test_spellings_and_aliases_count_once(self):
+        self.assertEqual(1.0, self.required_skills(['Python', 'python', 'PY']))
+
+    def test_unknown_skills_count_once_each(self):
+        self.assertAlmostEqual(1 / 3, self.required_skills(['Python', 'Cobol', 'cobol', 'Fortran']), places=6)
@@ -0,0 +1,106 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import matrix_store
+from api.models import MatrixChange, User, UserProfile
+
+
+def make_candidate(email, **profile):
+    user = User.objects.create_user(email=email, password='x', user_type=User.UserType.CANDIDATE)
+    return UserProfile.objects.create(user=user, **profile)
+
+
+def upsert(profile_id, experience=1):
+    return {'op': 'upsert', 'id': profile_id, 'experience': experience, 'location': '', 'skills': []}
+
+
+class MatrixStoreTests(TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        overrides = override_settings(MATCHING_MATRIX_DIR=self.root, MATCHING_JOURNAL_POLL_INTERVAL=0)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        matrix_store._shared = None
+        self.addCleanup(setattr, matrix_store, '_shared', None)
+
+    def live(self, shared):
+        """
+        Profile id -> experience of every candidate the segments cover.
+        """
+        rows = {}
+        for matrix, dead in shared.segments():
+            for row, profile_id in enumerate(matrix.profile_ids):
+                if dead is None or not dead[row]:
+                    rows[int(profile_id)] = int(matrix.experience[row])
+        return rows
+
+    def test_no_snapshot_is_built_in_request(self):
+        self.assertIsNone(matrix_store.get_shared_matrix())
+        self.assertIsNone(matrix_store.current_snapshot())
+
+    def test_changes_are_journaled_in_the_database(self):
+        profile = make_candidate('a@example.com', experience_years=2)
+        matrix_store.compact()
+        self.assertEqual(0, matrix_store.journal_length())
+
+        # A host that built the snapshot sees changes made on any other
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.experience_years = 7
+            profile.save()
+            other = make_candidate('b@example.com', experience_years=3)
+        self.assertEqual(2, matrix_store.journal_length())
+        shared = matrix_store.get_shared_matrix()
+        self.assertEqual({profile.pk: 7, other.pk: 3}, self.live(shared))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        self.assertEqual({profile.pk: 7}, self.live(shared))
+
+    def test_snapshot_skips_changes_it_holds(self):
+        profile = make_candidate('a@example.com', experience_years=2)
+        MatrixChange.objects.create(record=upsert(profile.pk, 1))
+        matrix_store.compact()
+        self.assertEqual({profile.pk: 2}, self.live(matrix_store.get_shared_matrix()))
+
+    def test_late_commit_below_the_newest_id_is_applied(self):
+        matrix_store.compact()
+        shared = matrix_store.get_shared_matrix()
+        early, _ = MatrixChange.objects.bulk_create([MatrixChange(record=upsert(1)), MatrixChange(record=upsert(2))])
+        MatrixChange.objects.filter(id=early.id).delete()
+        self.assertEqual({2: 1}, self.live(shared))
+        # The lower id commits after the higher one was read
+        MatrixChange.objects.create(id=early.id, record=upsert(1))
+        self.assertEqual({1: 1, 2: 1}, self.live(shared))
+
+    def test_superseded_change_committed_late_is_ignored(self):
+        matrix_store.compact()
+        shared = matrix_store.get_shared_matrix()
+        older, _ = MatrixChange.objects.bulk_create(
+            [MatrixChange(record=upsert(1, 1)), MatrixChange(record=upsert(1, 5))],
+        )
+        MatrixChange.objects.filter(id=older.id).delete()
+        self.assertEqual({1: 5}, self.live(shared))
+        MatrixChange.objects.create(id=older.id, record=upsert(1, 1))
+        self.assertEqual({1: 5}, self.live(shared))
+
+    def test_settled_changes_are_not_read_again(self):
+        matrix_store.compact()
+        shared = matrix_store.get_shared_matrix()
+        settled = timezone.now() - timedelta(seconds=matrix_store.SETTLE_SECONDS + 1)
+        change = MatrixChange.objects.create(record=upsert(1), created_at=settled)
+        self.live(shared)
+        self.assertEqual(change.id, shared.floor)
+        self.assertEqual(set(), shared.applied)
+
+    def test_prune_journal(self):
+        expired = timezone.now() - timedelta(days=2)
+        MatrixChange.objects.create(record=upsert(1), created_at=expired)
+        kept = MatrixChange.objects.create(record=upsert(2))
+        self.assertEqual(1, matrix_store.prune_journal())
+        self.assertEqual([kept.id], list(MatrixChange.objects.values_list('id', flat=True)))
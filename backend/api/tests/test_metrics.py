@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from api import metrics
+
+LABELS = (('route', 'api:login'), ('method', 'POST'))
+CACHE = 'hireiq_http_request_cache_lookups_total'
+QUERIES = 'hireiq_http_request_db_queries'
+
+
+def queries(*counts):
+    """
+    A db-queries histogram series holding one request per count.
+    """
+    buckets = metrics.METRICS[QUERIES][2]
+    series = [0] * (len(buckets) + 2)
+    for count in counts:
+        series[next((i for i, bound in enumerate(buckets) if count <= bound), len(buckets))] += 1
+        series[-1] += count
+    return series
+
+
+class MergeRenderTests(SimpleTestCase):
+
+    def test_merge_adds_histograms_and_counters(self):
+        into = {(QUERIES, LABELS): queries(1), (CACHE, LABELS): 2}
+        first = into[(QUERIES, LABELS)]
+        metrics._merge(into, {(QUERIES, LABELS): queries(3, 200), (CACHE, LABELS): 5})
+        self.assertEqual(queries(1, 3, 200), into[(QUERIES, LABELS)])
+        self.assertEqual(7, into[(CACHE, LABELS)])
+        self.assertEqual(queries(1), first)
+
+    def test_merge_copies_new_series(self):
+        series = queries(2)
+        merged = metrics._merge({}, {(QUERIES, LABELS): series})
+        merged[(QUERIES, LABELS)][0] += 1
+        self.assertEqual(queries(2), series)
+
+    def test_merge_keeps_series_whose_buckets_changed(self):
+        into = {(QUERIES, LABELS): queries(1)}
+        metrics._merge(into, {(QUERIES, LABELS): [1, 2, 3]})
+        self.assertEqual(queries(1), into[(QUERIES, LABELS)])
+
+    def test_render_histogram(self):
+        text = metrics.render({(QUERIES, LABELS): queries(0, 3, 200)})
+        labels = 'route="api:login",method="POST"'
+        self.assertIn(f'# TYPE {QUERIES} histogram', text)
+        self.assertIn(f'{QUERIES}_bucket{{{labels},le="0.0"}} 1', text)
+        self.assertIn(f'{QUERIES}_bucket{{{labels},le="2.0"}} 1', text)
+        self.assertIn(f'{QUERIES}_bucket{{{labels},le="3.0"}} 2', text)
+        self.assertIn(f'{QUERIES}_bucket{{{labels},le="100.0"}} 2', text)
+        self.assertIn(f'{QUERIES}_bucket{{{labels},le="+Inf"}} 3', text)
+        self.assertIn(f'{QUERIES}_sum{{{labels}}} 203', text)
+        self.assertIn(f'{QUERIES}_count{{{labels}}} 3', text)
+
+    def test_render_counter_and_escaping(self):
+        labels = (('route', 'a"b\\c\nd'), ('method', 'GET'), ('result', 'hit'))
+        text = metrics.render({(CACHE, labels): 4})
+        self.assertIn(f'{CACHE}{{route="a\\"b\\\\c\\nd",method="GET",result="hit"}} 4\n', text)
+
+    def test_render_skips_series_with_other_buckets(self):
+        text = metrics.render({(QUERIES, LABELS): [1, 2, 3]})
+        self.assertNotIn(f'{QUERIES}_count', text)
+
+
+class DeadWorkerArchiveTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        overrides = override_settings(METRICS_DIR=self.directory)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def write(self, pid, values):
+        metrics._write(os.path.join(self.directory, f'metrics-{pid}.json'), values)
+
+    def test_dead_worker_counts_are_kept(self):
+        self.write(101, {(QUERIES, LABELS): queries(1), (CACHE, LABELS): 2})
+        self.write(102, {(QUERIES, LABELS): queries(4)})
+        before = metrics.collect()
+
+        metrics.mark_process_dead(101, self.directory)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'metrics-101.json')))
+        self.assertEqual(before, metrics.collect())
+
+        # A second exit adds to the archive rather than replacing it
+        self.write(103, {(CACHE, LABELS): 3})
+        metrics.mark_process_dead(103, self.directory)
+        values = metrics.collect()
+        self.assertEqual(queries(1, 4), values[(QUERIES, LABELS)])
+        self.assertEqual(5, values[(CACHE, LABELS)])
+
+    def test_unknown_worker_is_ignored(self):
+        metrics.mark_process_dead(999, self.directory)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, metrics.ARCHIVE)))
+
+
+class MetricsTokenTests(SimpleTestCase):
+
+    @override_settings(METRICS_TOKEN='', DEBUG=False)
+    def test_closed_without_token(self):
+        self.assertEqual(403, self.client.get(reverse('api:metrics')).status_code)
+
+    @override_settings(METRICS_TOKEN='', DEBUG=True)
+    def test_open_in_debug_without_token(self):
+        self.assertEqual(200, self.client.get(reverse('api:metrics')).status_code)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_required(self):
+        url = reverse('api:metrics')
+        self.assertEqual(403, self.client.get(url).status_code)
+        self.assertEqual(403, self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code)
+        self.assertEqual(200, self.client.get(url, HTTP_AUTHORIZATION='Bearer s3cret').status_code)
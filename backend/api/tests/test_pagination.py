@@ -0,0 +1,61 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework import generics, serializers
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory
+
+from api.models import Skill
+
+
+class SkillSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Skill
+        fields = ['id', 'name']
+
+
+class SkillListView(generics.ListAPIView):
+    queryset = Skill.objects.all()
+    serializer_class = SkillSerializer
+    permission_classes = [AllowAny]
+    ordering = None
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    ``KeysetPagination`` is the DRF default, so it must page any model.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for name in ['Go', 'Rust', 'Python', 'Java', 'C']:
+            Skill.objects.create(name=name)
+
+    def pages(self, view, page_size=2):
+        factory = APIRequestFactory()
+        url, names = f'/skills/?page_size={page_size}', []
+        while url:
+            response = view(factory.get(url))
+            self.assertEqual(response.status_code, 200)
+            names.extend(row['name'] for row in response.data['results'])
+            url = response.data['next']
+        return names
+
+    def test_model_without_date_joined_pages_by_id(self):
+        self.assertEqual(['C', 'Java', 'Python', 'Rust', 'Go'], self.pages(SkillListView.as_view()))
+
+    def test_view_ordering_is_used(self):
+        view = SkillListView.as_view(ordering=('name', 'pk'))
+        self.assertEqual(['C', 'Go', 'Java', 'Python', 'Rust'], self.pages(view))
+
+    def test_ordering_without_unique_tiebreaker_is_rejected(self):
+        view = SkillListView.as_view(ordering=('-created_at',))
+        with self.assertRaises(ImproperlyConfigured):
+            view(APIRequestFactory().get('/skills/'))
+
+    def test_previous_page(self):
+        factory = APIRequestFactory()
+        view = SkillListView.as_view(ordering=('name', 'id'))
+        first = view(factory.get('/skills/?page_size=2'))
+        second = view(factory.get(first.data['next']))
+        back = view(factory.get(second.data['previous']))
+        self.assertEqual(['C', 'Go'], [row['name'] for row in back.data['results']])
@@ -0,0 +1,109 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from api import matching, skills
+from api.models import User, UserProfile, UserToken
+from api.testing import QUERY_BUDGETS, QueryBudgetMixin
+from api.tokens import UserRefreshToken
+
+PASSWORD = 'Correct-Horse-42'
+
+
+def make_user(email, user_type=User.UserType.CANDIDATE, **profile):
+    user = User.objects.create_user(email=email, password=PASSWORD, user_type=user_type)
+    UserProfile.objects.create(user=user, **profile)
+    return user
+
+
+class QueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """
+    One test per endpoint in ``QUERY_BUDGETS``.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.candidate = make_user(
+            'candidate@example.com', skills=['Python', 'Django'], location='Berlin', experience_years=5,
+        )
+        make_user('other@example.com', skills=['Python'], location='Munich', experience_years=2)
+        cls.recruiter = make_user('recruiter@example.com', User.UserType.RECRUITER)
+
+    def setUp(self):
+        cache.clear()
+        skills.invalidate()
+        # Published by a simulated commit, so it must not outlive the test
+        self.addCleanup(skills.invalidate)
+        # The skill index is per process; load this test's taxonomy up front
+        with self.captureOnCommitCallbacks(execute=True):
+            skills.get_index()
+
+    def authenticate(self, user):
+        token = UserRefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_every_budgeted_endpoint_is_tested(self):
+        tested = {name[len('test_'):].replace('_', '-') for name in dir(self) if name.startswith('test_')}
+        self.assertEqual(set(), {url_name.split(':')[1] for url_name in QUERY_BUDGETS} - tested)
+
+    def test_user_info(self):
+        self.authenticate(self.candidate)
+        with self.assertQueryBudget('api:user-info'):
+            response = self.client.get(reverse('api:user-info'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_detail(self):
+        self.authenticate(self.candidate)
+        with self.assertQueryBudget('api:user-detail'):
+            response = self.client.get(reverse('api:user-detail'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_profile(self):
+        self.authenticate(self.candidate)
+        with self.assertQueryBudget('api:user-profile'):
+            response = self.client.get(reverse('api:user-profile'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_login(self):
+        with self.assertQueryBudget('api:login'):
+            response = self.client.post(
+                reverse('api:login'), {'email': 'candidate@example.com', 'password': PASSWORD}, format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_register(self):
+        data = {
+            'email': 'new@example.com',
+            'password': PASSWORD,
+            'password_confirm': PASSWORD,
+            'user_type': 'candidate',
+            'first_name': 'New',
+            'last_name': 'User',
+        }
+        with self.assertQueryBudget('api:register'):
+            response = self.client.post(reverse('api:register'), data, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_verify_email(self):
+        token = UserToken.objects.issue(self.candidate, UserToken.Purpose.EMAIL_VERIFICATION)
+        with self.assertQueryBudget('api:verify-email'):
+            response = self.client.get(reverse('api:verify-email', args=[token]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_candidate_search(self):
+        self.authenticate(self.recruiter)
+        with self.assertQueryBudget('api:candidate-search'):
+            response = self.client.get(reverse('api:candidate-search'), {'skills': 'python,django'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([self.candidate.pk], [row['user'] for row in response.data['results']])
+
+    def test_candidate_match(self):
+        self.authenticate(self.recruiter)
+        matching._matrix = None
+        matching.get_matrix()
+        with self.assertQueryBudget('api:candidate-match'):
+            response = self.client.post(
+                reverse('api:candidate-match'), {'required_skills': ['python'], 'top_k': 5}, format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(2, len(response.data['results']))
@@ -0,0 +1,77 @@
+from datetime import date
+
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import User, UserProfile
+from api.serializer_plans import get_plan
+from api.serializers import CandidateSerializer, UserProfileSerializer, UserSerializer
+
+
+class SerializerPlanParityTests(TestCase):
+    """
+    Compiled plans must render byte for byte what DRF renders.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.candidate = User.objects.create_user(
+            email='ana@example.com', password='x', first_name='Ana', last_name='Müller',
+        )
+        UserProfile.objects.create(
+            user=cls.candidate,
+            bio='Backend engineer',
+            profile_picture='profile_pictures/ana.png',
+            date_of_birth=date(1990, 5, 17),
+            location='Berlin',
+            skills=['Python', 'Django'],
+            experience_years=7,
+            education=[{'degree': 'MSc', 'year': 2014}],
+        )
+        cls.recruiter = User.objects.create_user(
+            email='rita@example.com', password='x', user_type=User.UserType.RECRUITER,
+        )
+        UserProfile.objects.create(
+            user=cls.recruiter, company_name='Acme', company_website='https://acme.example.com',
+        )
+        # No profile row: the reverse one-to-one raises on access
+        cls.bare = User.objects.create_user(email='bare@example.com', password='x')
+
+    def setUp(self):
+        self.request = Request(APIRequestFactory(SERVER_NAME='localhost').get('/api/'))
+
+    def render(self, enabled, serializer_class, instance, **kwargs):
+        with override_settings(SERIALIZER_PLANS=enabled):
+            data = serializer_class(instance, context={'request': self.request}, **kwargs).data
+            return JSONRenderer().render(data)
+
+    def assertParity(self, serializer_class, instance, **kwargs):
+        expected = self.render(False, serializer_class, instance, **kwargs)
+        self.assertEqual(expected, self.render(True, serializer_class, instance, **kwargs))
+        return expected
+
+    def test_serializers_compile(self):
+        # Otherwise both renders below would take DRF's path
+        for serializer_class in (UserSerializer, UserProfileSerializer, CandidateSerializer):
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertIsNotNone(get_plan(serializer_class))
+
+    def test_user_with_profile(self):
+        for user in User.objects.with_profile().filter(pk__in=[self.candidate.pk, self.recruiter.pk]):
+            with self.subTest(user=user.email):
+                self.assertIn(b'"profile":{', self.assertParity(UserSerializer, user))
+
+    def test_user_without_profile(self):
+        user = User.objects.with_profile().get(pk=self.bare.pk)
+        self.assertIn(b'"profile":null', self.assertParity(UserSerializer, user))
+
+    def test_user_profile(self):
+        for profile in UserProfile.objects.with_user():
+            with self.subTest(user=profile.user.email):
+                self.assertParity(UserProfileSerializer, profile)
+
+    def test_candidate_list(self):
+        profiles = list(UserProfile.objects.with_user().order_by('pk'))
+        self.assertParity(CandidateSerializer, profiles, many=True)
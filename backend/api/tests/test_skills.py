@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+
+from api import skills
+from api.models import Skill, SkillAlias
+
+
+class ResolveSkillsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        skills.invalidate()
+        # Published by a simulated commit, so it must not outlive the test
+        self.addCleanup(skills.invalidate)
+        self.python = Skill.objects.create(name='Python')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.index = skills.get_index()
+
+    def test_skill_created_by_another_process_resolves(self):
+        # bulk_create, as another worker's resolve_skills(create=True) does
+        rust = Skill.objects.bulk_create([Skill(name='Rust', normalized_name='rust')])[0]
+        self.assertEqual({'python': self.python.pk, 'rust': rust.pk}, skills.resolve_skills(['Python', 'rust']))
+
+    def test_alias_created_elsewhere_resolves_to_its_skill(self):
+        SkillAlias.objects.bulk_create([SkillAlias(skill=self.python, name='py')])
+        self.assertEqual({'py': self.python.pk}, skills.resolve_skills(['PY']))
+        self.assertEqual('python', skills.skill_name(self.python.pk))
+
+    def test_unknown_name_is_left_out(self):
+        self.assertEqual({}, skills.resolve_skills(['cobol']))
+        self.assertFalse(Skill.objects.filter(normalized_name='cobol').exists())
+
+    def test_created_skills_bump_the_version(self):
+        version = cache.get(skills.VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            created = skills.resolve_skills(['Go'], create=True)
+        self.assertEqual({'go': Skill.objects.get(normalized_name='go').pk}, created)
+        self.assertNotEqual(version, cache.get(skills.VERSION_KEY))
+
+    def test_rolled_back_skills_are_forgotten(self):
+        try:
+            with transaction.atomic():
+                self.assertIn('go', skills.resolve_skills(['Go'], create=True))
+                Skill.objects.create(name='Rust')
+                self.assertEqual({'go', 'rust'}, skills.resolve_skills(['Go', 'Rust']).keys())
+                raise DatabaseError
+        except DatabaseError:
+            pass
+        self.assertEqual({}, skills.resolve_skills(['Go', 'Rust']))
@@ -0,0 +1,117 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from api import slow_queries
+from api.models import SlowQuery, User
+
+
+class NormalizeTests(TestCase):
+
+    def test_literals_and_parameters(self):
+        self.assertEqual(
+            'SELECT * FROM "api_user" WHERE "email" = ? AND "id" > ? AND "score" < ?',
+            slow_queries.normalize(
+                'SELECT *\n  FROM "api_user"   WHERE "email" = \'o\'\'brien@example.com\' '
+                'AND "id" > %s AND "score" < -1.5e3'
+            ),
+        )
+
+    def test_lists_and_rows_collapse(self):
+        self.assertEqual(
+            'SELECT ? FROM "t" WHERE "id" IN (...)',
+            slow_queries.normalize('SELECT 1 FROM "t" WHERE "id" IN (%s, %s, %s)'),
+        )
+        self.assertEqual(
+            'INSERT INTO "t" ("a", "b") VALUES (...), ...',
+            slow_queries.normalize('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s), (%s, %s)'),
+        )
+
+    def test_identifiers_keep_their_digits(self):
+        sql = 'SELECT "t1"."col2" FROM "api_t1" t1'
+        self.assertEqual(sql, slow_queries.normalize(sql))
+
+    def test_fingerprint_ignores_values(self):
+        first = slow_queries.fingerprint(slow_queries.normalize('SELECT * FROM "t" WHERE "id" IN (1, 2)'))
+        second = slow_queries.fingerprint(slow_queries.normalize("SELECT * FROM \"t\" WHERE \"id\" IN ('a', 'b', 'c')"))
+        other = slow_queries.fingerprint(slow_queries.normalize('SELECT * FROM "u" WHERE "id" IN (1, 2)'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertRegex(first, r'^[0-9a-f]{16}$')
+
+    def test_scrub_plan(self):
+        plan = [{'Plan': {
+            'Node Type': 'Index Scan',
+            'Relation Name': 'api_user2',
+            'Index Cond': "((email)::text = 'o''brien@example.com'::text)",
+            'Filter': '((id > 42) AND (score < -1.5))',
+            'Total Cost': 8.3,
+            'Plan Rows': 1,
+        }}]
+        self.assertEqual([{'Plan': {
+            'Node Type': 'Index Scan',
+            'Relation Name': 'api_user2',
+            'Index Cond': '((email)::text = ?::text)',
+            'Filter': '((id > ?) AND (score < ?))',
+            'Total Cost': 8.3,
+            'Plan Rows': 1,
+        }}], slow_queries.scrub_plan(plan))
+
+
+class RecordTests(TestCase):
+
+    def setUp(self):
+        User.objects.create_user(email='secret@example.com', password='x')
+        self.sql = 'SELECT "id" FROM "api_user" WHERE "email" = %s'
+
+    def test_explain(self):
+        plan = slow_queries.explain(self.sql, ['secret@example.com'])
+        self.assertTrue(plan)
+        self.assertIn('api_user', repr(plan))
+
+    def test_record_saves_normalized_sql_without_parameters(self):
+        row = slow_queries.record(
+            self.sql, ['secret@example.com'], True, 'default', 250.0, 'api:login', 'api/views.py:1 in post',
+        )
+        row.refresh_from_db()
+        self.assertEqual('SELECT "id" FROM "api_user" WHERE "email" = ?', row.sql)
+        self.assertEqual(slow_queries.fingerprint(row.sql), row.fingerprint)
+        self.assertEqual(('default', 250.0, 'api:login'), (row.database, row.duration_ms, row.route))
+        self.assertTrue(row.plan)
+        self.assertNotIn('secret@example.com', repr(row.plan) + row.sql + row.stack)
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL prints parameters in its plans')
+    def test_postgresql_plan_has_no_parameters(self):
+        row = slow_queries.record(
+            'SELECT "id" FROM "api_user" WHERE "email" = %s AND "id" > %s',
+            ['secret@example.com', 987654], True, 'default', 250.0,
+        )
+        row.refresh_from_db()
+        self.assertTrue(row.plan)
+        self.assertNotIn('secret@example.com', repr(row.plan))
+        self.assertNotIn('987654', repr(row.plan))
+
+    def test_record_without_explain(self):
+        row = slow_queries.record(self.sql, None, False, 'default', 250.0)
+        self.assertIsNone(row.plan)
+        self.assertEqual('', row.route)
+
+    def test_failed_explain_still_records(self):
+        row = slow_queries.record('SELECT * FROM "missing_table"', [], True, 'default', 250.0)
+        self.assertIsNone(row.plan)
+        self.assertTrue(SlowQuery.objects.filter(pk=row.pk).exists())
+
+    @override_settings(SLOW_QUERY_BUFFER_SIZE=3)
+    def test_trim_keeps_the_newest_rows(self):
+        with mock.patch.object(slow_queries, 'TRIM_EVERY', 1):
+            rows = [slow_queries.record(self.sql, None, False, 'default', 250.0) for _ in range(5)]
+        self.assertEqual([row.pk for row in rows[-3:]], sorted(SlowQuery.objects.values_list('pk', flat=True)))
+
+    @override_settings(SLOW_QUERY_BUFFER_SIZE=3)
+    def test_trim_runs_every_trim_every_ids(self):
+        with mock.patch.object(slow_queries, 'TRIM_EVERY', 4):
+            rows = [slow_queries.record(self.sql, None, False, 'default', 250.0) for _ in range(6)]
+        trimmed_at = next(row.pk for row in rows if row.pk % 4 == 0)
+        expected = [row.pk for row in rows if row.pk > trimmed_at - 3]
+        self.assertEqual(expected, sorted(SlowQuery.objects.values_list('pk', flat=True)))
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import User
+from api.tokens import UserRefreshToken
+
+
+@override_settings(JWT_BLACKLIST_NEGATIVE_CACHE_SECONDS=60)
+class BlacklistCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(email='user@example.com', password='x')
+        self.token = UserRefreshToken.for_user(user)
+
+    def test_blacklisting_elsewhere_replaces_cached_negative(self):
+        self.token.check_blacklist()  # Caches 'not blacklisted'
+        outstanding = OutstandingToken.objects.get(jti=self.token['jti'])
+        BlacklistedToken.objects.create(token=outstanding)
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            self.token.check_blacklist()
+
+    def test_blacklist_method_is_cached(self):
+        self.token.blacklist()
+        with self.assertNumQueries(0), self.assertRaises(TokenError):
+            UserRefreshToken(str(self.token)).check_blacklist()
+
+
+class TokenClaimsTests(APITestCase):
+    """
+    Token claims are for clients; the server reads the user's row.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='user@example.com', password='x')
+        self.refresh = UserRefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+
+    def test_payload_reflects_the_database(self):
+        # Bypasses the signals, like a change made by another process
+        User.objects.filter(pk=self.user.pk).update(is_email_verified=True)
+        cache.clear()
+        self.assertTrue(self.client.get(reverse('api:user-info')).data['is_email_verified'])
+
+    def test_user_type_change_reaches_permissions(self):
+        url = reverse('api:candidate-search')
+        self.assertEqual(403, self.client.get(url).status_code)
+        User.objects.filter(pk=self.user.pk).update(user_type=User.UserType.RECRUITER)
+        self.assertEqual(200, self.client.get(url).status_code)
+
+    def test_refresh_reissues_claims_from_the_database(self):
+        User.objects.filter(pk=self.user.pk).update(
+            is_email_verified=True, user_type=User.UserType.RECRUITER, email='new@example.com',
+        )
+        response = self.client.post(reverse('api:token_refresh'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(200, response.status_code)
+        for token in (AccessToken(response.data['access']), UserRefreshToken(response.data['refresh'])):
+            self.assertEqual(
+                ('new@example.com', 'recruiter', True),
+                (token['email'], token['user_type'], token['is_email_verified']),
+            )
+
+    def test_refresh_rejects_inactive_user(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.post(reverse('api:token_refresh'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(401, response.status_code)
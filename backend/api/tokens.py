@@ -0,0 +1,155 @@
+"""
+JWT token classes and the token-backed user.
+
+``ClaimsJWTAuthentication`` builds a ``TokenUser`` from the token's user id,
+so an authenticated request only touches the user table when a view reads
+an attribute of the user; a cached payload needs none. Every attribute
+other than the id comes from the database, never from the token.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .models import User
+
+# Claim name -> User attribute, for clients to read. Set from the database
+# at login and on every refresh; the server never trusts them.
+USER_CLAIMS = {
+    'email': 'email',
+    'user_type': 'user_type',
+    'is_email_verified': 'is_email_verified',
+}
+
+
+_BLACKLISTED = 'blacklisted'
+_NOT_BLACKLISTED = 'ok'
+
+
+def _blacklist_cache_key(jti):
+    return f'jwt-blacklist:{jti}'
+
+
+def cache_blacklisted(jti, expires_at):
+    """
+    Remember ``jti`` as blacklisted until ``expires_at``, replacing any
+    cached 'not blacklisted' answer. Called for every new
+    ``BlacklistedToken`` row (see ``api.signals``).
+    """
+    remaining = (expires_at - timezone.now()).total_seconds()
+    cache.set(_blacklist_cache_key(jti), _BLACKLISTED, timeout=max(int(remaining), 1))
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token (and derived access token) with ``USER_CLAIMS`` embedded.
+    
+    Blacklist lookups are fronted by the cache: blacklisted jtis are cached
+    until the token expires, and a negative database answer is cached
+    briefly with ``add()`` so it can never overwrite a concurrent blacklist.
+    Every new ``BlacklistedToken`` row, wherever it is created, overwrites
+    the negative answer. Evicted entries fall through to the database.
+    """
+    
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+    
+    def set_user_claims(self, user):
+        for claim, attr in USER_CLAIMS.items():
+            self[claim] = getattr(user, attr)
+    
+    def _seconds_until_expiry(self):
+        remaining = datetime_from_epoch(self.payload['exp']) - self.current_time
+        return max(int(remaining.total_seconds()), 1)
+    
+    def check_blacklist(self):
+        key = _blacklist_cache_key(self.payload[api_settings.JTI_CLAIM])
+        cached = cache.get(key)
+        if cached == _BLACKLISTED:
+            raise TokenError(_('Token is blacklisted'))
+        if cached == _NOT_BLACKLISTED:
+            return
+        
+        try:
+            super().check_blacklist()
+        except TokenError:
+            cache.set(key, _BLACKLISTED, timeout=self._seconds_until_expiry())
+            raise
+        if settings.JWT_BLACKLIST_NEGATIVE_CACHE_SECONDS > 0:
+            cache.add(key, _NOT_BLACKLISTED, timeout=settings.JWT_BLACKLIST_NEGATIVE_CACHE_SECONDS)
+    
+    def blacklist(self):
+        result = super().blacklist()
+        cache.set(
+            _blacklist_cache_key(self.payload[api_settings.JTI_CLAIM]),
+            _BLACKLISTED,
+            timeout=self._seconds_until_expiry(),
+        )
+        return result
+
+
+class TokenUser:
+    """
+    Authenticated user backed by an access token.
+    
+    Only ``pk``/``id``, which cannot change, are answered from the token.
+    Any other attribute, ``user_type`` for permission checks included,
+    loads the ``User`` row (with its profile) on first use and is delegated
+    to it, as are attribute writes, so views can treat this object like a
+    ``User`` instance.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    # Tokens are only issued to active users; deactivation takes effect
+    # when the access token expires.
+    is_active = True
+    
+    def __init__(self, token):
+        pk = User._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+        object.__setattr__(self, '_claims', {'id': pk, 'pk': pk})
+        object.__setattr__(self, '_user', None)
+    
+    def get_user(self):
+        """
+        The ``User`` row, loaded with its profile on first use.
+        """
+        if self._user is None:
+            object.__setattr__(self, '_user', User.objects.with_profile().get(pk=self._claims['pk']))
+        return self._user
+    
+    def __getattr__(self, name):
+        claims = self.__dict__['_claims']
+        if name in claims:
+            return claims[name]
+        return getattr(self.get_user(), name)
+    
+    def __setattr__(self, name, value):
+        setattr(self.get_user(), name, value)
+    
+    @property
+    def is_candidate(self):
+        return self.user_type == User.UserType.CANDIDATE
+    
+    @property
+    def is_recruiter(self):
+        return self.user_type == User.UserType.RECRUITER
+    
+    @property
+    def is_admin(self):
+        return self.user_type == User.UserType.ADMIN
+    
+    def __str__(self):
+        return self.email
+    
+    def __eq__(self, other):
+        return isinstance(other, (User, TokenUser)) and self.pk == other.pk
+    
+    def __hash__(self):
+        return hash(self.pk)
@@ -1,29 +1,55 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from . import views
 
+if settings.SERVER_MODE == 'asgi':
+    # Coroutine views for endpoints that mostly wait on the database or cache
+    from . import async_views
+    health_view = async_views.AsyncHealthCheckView.as_view()
+    register_view = async_views.AsyncUserRegistrationView.as_view()
+    resend_verification_view = async_views.AsyncResendVerificationView.as_view()
+    password_reset_view = async_views.AsyncPasswordResetRequestView.as_view()
+    user_info_view = async_views.AsyncUserInfoView.as_view()
+else:
+    health_view = views.HealthCheckView.as_view()
+    register_view = views.UserRegistrationView.as_view()
+    resend_verification_view = views.resend_verification
+    password_reset_view = views.PasswordResetRequestView.as_view()
+    user_info_view = views.user_info
+
 app_name = 'api'
 
 urlpatterns = [
-    # Health check
-    path('health/', views.HealthCheckView.as_view(), name='health'),
+    # Health check and metrics
+    path('health/', health_view, name='health'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
     
     # Authentication endpoints
-    path('auth/register/', views.UserRegistrationView.as_view(), name='register'),
+    path('auth/register/', register_view, name='register'),
     path('auth/login/', views.UserLoginView.as_view(), name='login'),
     path('auth/logout/', views.UserLogoutView.as_view(), name='logout'),
     path('auth/verify-email/<str:token>/', views.EmailVerificationView.as_view(), name='verify-email'),
-    path('auth/resend-verification/', views.resend_verification, name='resend-verification'),
-    path('auth/password-reset/', views.PasswordResetRequestView.as_view(), name='password-reset-request'),
+    path('auth/resend-verification/', resend_verification_view, name='resend-verification'),
+    path('auth/password-reset/', password_reset_view, name='password-reset-request'),
     path('auth/password-reset-confirm/', views.PasswordResetConfirmView.as_view(), name='password-reset-confirm'),
     path('auth/password-change/', views.PasswordChangeView.as_view(), name='password-change'),
+    path('auth/accept-invite/', views.AcceptInvitationView.as_view(), name='accept-invite'),
     
     # JWT token endpoints
     path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/jwks/', views.JWKSView.as_view(), name='jwks'),
     
     # User endpoints
-    path('user/', views.user_info, name='user-info'),
+    path('user/', user_info_view, name='user-info'),
     path('user/profile/', views.UserProfileView.as_view(), name='user-profile'),
     path('user/detail/', views.UserDetailView.as_view(), name='user-detail'),
+    
+    # Recruiter endpoints
+    path('candidates/search/', views.CandidateSearchView.as_view(), name='candidate-search'),
+    path('candidates/match/', views.CandidateMatchView.as_view(), name='candidate-match'),
+    
+    # Admin endpoints
+    path('exports/users.<str:file_format>', views.UserExportView.as_view(), name='user-export'),
 ] 
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Per-user cache of the serialized ``UserSerializer`` payload.
+
+Entries live under versioned keys: invalidating a user bumps its version
+instead of deleting the entry, so a request that serialized stale data
+before the bump can only write to a key nobody reads any more. Each entry
+carries an ETag derived from its content, which lets conditional GETs be
+answered from the cache alone.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import User
+from .renderers import dumps
+from .serializers import UserSerializer
+
+# Fields rendered by UserSerializer; saves touching only other columns
+# (e.g. last_login) leave the cached payload valid.
+USER_PAYLOAD_FIELDS = frozenset(UserSerializer.Meta.fields) - {'profile'}
+
+
+def _version_key(user_id):
+    return f'user-payload-version:{user_id}'
+
+
+def _payload_key(user_id, version):
+    return f'user-payload:{user_id}:v{version}'
+
+
+def _timeout():
+    return getattr(settings, 'USER_PAYLOAD_CACHE_TIMEOUT', 300)
+
+
+def _get_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        # add() keeps a concurrent invalidation from being overwritten
+        cache.add(_version_key(user_id), 1, timeout=None)
+        version = cache.get(_version_key(user_id), 1)
+    return version
+
+
+async def _aget_version(user_id):
+    version = await cache.aget(_version_key(user_id))
+    if version is None:
+        await cache.aadd(_version_key(user_id), 1, timeout=None)
+        version = await cache.aget(_version_key(user_id), 1)
+    return version
+
+
+def invalidate_user_payload(user_id):
+    """
+    Make every cached payload for ``user_id`` unreachable.
+    """
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        # No version stored yet (or evicted); start past any old entries
+        cache.add(_version_key(user_id), 2, timeout=None)
+
+
+def _make_etag(data):
+    return '"%s"' % hashlib.md5(dumps(data, sort_keys=True)).hexdigest()
+
+
+def _build_entry(user):
+    data = UserSerializer(user).data
+    return {
+        'data': data,
+        'etag': _make_etag(data),
+        'profile_etag': _make_etag(data['profile']),
+    }
+
+
+def get_user_payload(user):
+    """
+    Return ``(data, etag)`` for ``user``, serializing only on a cache miss.
+
+    Only ``user.pk`` is read on a hit; a miss serializes the ``User`` row.
+    """
+    version = _get_version(user.pk)
+    key = _payload_key(user.pk, version)
+    entry = cache.get(key)
+    if entry is None:
+        if not isinstance(user, User):
+            user = user.get_user()
+        entry = _build_entry(user)
+        cache.set(key, entry, timeout=_timeout())
+    return entry
+
+
+async def aget_user_payload(user):
+    """
+    Async version of ``get_user_payload``. A token-backed user is loaded
+    with the async ORM on a miss, as it cannot lazy-load in async code.
+    """
+    version = await _aget_version(user.pk)
+    key = _payload_key(user.pk, version)
+    entry = await cache.aget(key)
+    if entry is None:
+        if not isinstance(user, User):
+            user = await User.objects.with_profile().aget(pk=user.pk)
+        entry = _build_entry(user)
+        await cache.aset(key, entry, timeout=_timeout())
+    return entry
+
+
+def user_payload_response(request, user, part=None):
+    """
+    Build a response from the cached payload, honouring If-None-Match.
+
+    ``part='profile'`` serves the nested ``UserProfileSerializer`` data.
+    """
+    return _payload_response(request, get_user_payload(user), part)
+
+
+async def auser_payload_response(request, user, part=None):
+    """
+    Async version of ``user_payload_response``.
+    """
+    return _payload_response(request, await aget_user_payload(user), part)
+
+
+def _payload_response(request, entry, part):
+    if part == 'profile':
+        data, etag = entry['data']['profile'], entry['profile_etag']
+        if data is None:
+            raise Http404('User has no profile')
+    else:
+        data, etag = entry['data'], entry['etag']
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
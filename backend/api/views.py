@@ -2,23 +2,40 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.password_validation import validate_password
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
 from django.core.exceptions import ValidationError
-from django.utils.crypto import get_random_string
-from django.core.mail import send_mail
+from django.http import StreamingHttpResponse
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.cache import patch_cache_control
 from django.conf import settings
 from django.urls import reverse
 from django.shortcuts import get_object_or_404
 import json
 
-from .models import User, UserProfile
+from .emails import send_password_reset_email, send_verification_email
+from .exports import CONTENT_TYPES, ExportError, start_export
+from .hashing import set_user_password
+from .jwt_keys import get_keyring
+from .last_login import record_login
+from .matching import match_candidates
+from .metrics import render as render_metrics
+from .models import ProfileSkill, User, UserProfile, UserToken, normalize_skill
+from .pagination import CandidateCursorPagination
+from .permissions import HasMetricsToken, IsAdmin, IsRecruiter
+from .renderers import PrometheusTextRenderer
+from .skills import resolve_skills
+from .user_cache import invalidate_user_payload, user_payload_response
+from .tokens import UserRefreshToken
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserSerializer,
     UserProfileSerializer, PasswordChangeSerializer, PasswordResetRequestSerializer,
-    PasswordResetConfirmSerializer, EmailVerificationSerializer
+    PasswordResetConfirmSerializer, EmailVerificationSerializer,
+    CandidateSerializer, CandidateSearchSerializer, MatchRequestSerializer
 )
 
 
@@ -27,19 +44,23 @@ class HealthCheckView(APIView):
     Health check endpoint for the API
     """
     permission_classes = [permissions.AllowAny]
+    throttle_classes = []  # Polled by load balancers and benchmarks
     
     def get(self, request):
         """
         Check the health of the application
         """
+        return self._respond({
+            'database': self._check_database(),
+            'cache': self._check_cache(),
+        })
+    
+    def _respond(self, services):
         health_status = {
             'status': 'healthy',
             'timestamp': timezone.now().isoformat(),
             'version': '1.0.0',
-            'services': {
-                'database': self._check_database(),
-                'cache': self._check_cache(),
-            }
+            'services': services,
         }
         
         # Check if all services are healthy
@@ -64,13 +85,49 @@ class HealthCheckView(APIView):
             return {'status': 'unhealthy', 'message': str(e)}
     
     def _check_cache(self):
-        """Check cache connectivity"""
+        """Check cache connectivity and report this worker's cache metrics"""
         try:
             cache.set('health_check', 'ok', 1)
             cache.get('health_check')
-            return {'status': 'healthy', 'message': 'Cache connection successful'}
+            result = {'status': 'healthy', 'message': 'Cache connection successful'}
         except Exception as e:
-            return {'status': 'unhealthy', 'message': str(e)}
+            result = {'status': 'unhealthy', 'message': str(e)}
+        return self._describe_cache(result)
+    
+    def _describe_cache(self, result):
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        metrics = getattr(backend, 'metrics', None)
+        result['backend'] = f'{type(backend).__module__}.{type(backend).__name__}'
+        if metrics is not None:
+            result['metrics'] = metrics.snapshot()
+        return result
+
+
+class JWKSView(APIView):
+    """
+    Public keys for verifying access tokens (RFC 7517 JSON Web Key Set).
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = []
+    
+    def get(self, request):
+        response = Response(get_keyring().jwks())
+        patch_cache_control(response, public=True, max_age=settings.JWT_KEYS_RELOAD_INTERVAL)
+        return response
+
+
+class MetricsView(APIView):
+    """
+    Request metrics for every worker, in the Prometheus text format.
+    """
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+    throttle_classes = []  # Scraped every few seconds
+    renderer_classes = [PrometheusTextRenderer]
+    
+    def get(self, request):
+        return Response(render_metrics(), content_type=PrometheusTextRenderer.content_type)
 
 
 class UserRegistrationView(APIView):
@@ -86,19 +143,10 @@ class UserRegistrationView(APIView):
             user = serializer.save()
             
             # Generate email verification token
-            token = get_random_string(64)
-            user.email_verification_token = token
-            user.save()
+            token = UserToken.objects.issue(user, UserToken.Purpose.EMAIL_VERIFICATION)
             
-            # Send verification email (in production, use proper email service)
-            verification_url = f"http://localhost:8000/api/auth/verify-email/{token}/"
-            send_mail(
-                'Verify your email - HireIQ',
-                f'Click the following link to verify your email: {verification_url}',
-                'noreply@hireiq.com',
-                [user.email],
-                fail_silently=True,
-            )
+            # Queue verification email; delivered by the outbox worker
+            send_verification_email(user, token)
             
             return Response({
                 'message': 'User registered successfully. Please check your email for verification.',
@@ -121,7 +169,8 @@ class UserLoginView(APIView):
             user = serializer.validated_data['user']
             
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
+            record_login(user.pk)
             
             return Response({
                 'message': 'Login successful',
@@ -145,7 +194,7 @@ class UserLogoutView(APIView):
         try:
             refresh_token = request.data.get('refresh_token')
             if refresh_token:
-                token = RefreshToken(refresh_token)
+                token = UserRefreshToken(refresh_token)
                 token.blacklist()
             
             return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
@@ -160,19 +209,18 @@ class EmailVerificationView(APIView):
     permission_classes = [permissions.AllowAny]
     
     def get(self, request, token):
-        try:
-            user = User.objects.get(email_verification_token=token)
-            user.is_email_verified = True
-            user.email_verification_token = None
-            user.save()
-            
-            return Response({
-                'message': 'Email verified successfully'
-            }, status=status.HTTP_200_OK)
-        except User.DoesNotExist:
+        user = UserToken.objects.redeem(token, UserToken.Purpose.EMAIL_VERIFICATION)
+        if user is None:
             return Response({
                 'error': 'Invalid verification token'
             }, status=status.HTTP_400_BAD_REQUEST)
+        
+        user.is_email_verified = True
+        user.save(update_fields=['is_email_verified'])
+        
+        return Response({
+            'message': 'Email verified successfully'
+        }, status=status.HTTP_200_OK)
 
 
 class PasswordResetRequestView(APIView):
@@ -189,19 +237,10 @@ class PasswordResetRequestView(APIView):
             user = User.objects.get(email=email)
             
             # Generate reset token
-            token = get_random_string(64)
-            user.email_verification_token = token
-            user.save()
+            token = UserToken.objects.issue(user, UserToken.Purpose.PASSWORD_RESET)
             
-            # Send reset email
-            reset_url = f"http://localhost:3000/reset-password/{token}"
-            send_mail(
-                'Password Reset - HireIQ',
-                f'Click the following link to reset your password: {reset_url}',
-                'noreply@hireiq.com',
-                [email],
-                fail_silently=True,
-            )
+            # Queue reset email
+            send_password_reset_email(user, token)
             
             return Response({
                 'message': 'Password reset email sent'
@@ -223,19 +262,46 @@ class PasswordResetConfirmView(APIView):
             token = serializer.validated_data['token']
             new_password = serializer.validated_data['new_password']
             
-            try:
-                user = User.objects.get(email_verification_token=token)
-                user.set_password(new_password)
-                user.email_verification_token = None
-                user.save()
-                
-                return Response({
-                    'message': 'Password reset successful'
-                }, status=status.HTTP_200_OK)
-            except User.DoesNotExist:
+            user = UserToken.objects.redeem(token, UserToken.Purpose.PASSWORD_RESET)
+            if user is None:
                 return Response({
                     'error': 'Invalid reset token'
                 }, status=status.HTTP_400_BAD_REQUEST)
+            
+            set_user_password(user, new_password)
+            user.save(update_fields=['password'])
+            
+            return Response({
+                'message': 'Password reset successful'
+            }, status=status.HTTP_200_OK)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AcceptInvitationView(APIView):
+    """
+    Set the password of an imported user from their invitation link.
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_scope = 'auth'
+    
+    def post(self, request):
+        serializer = PasswordResetConfirmSerializer(data=request.data)
+        if serializer.is_valid():
+            user = UserToken.objects.redeem(serializer.validated_data['token'], UserToken.Purpose.INVITATION)
+            if user is None:
+                return Response({
+                    'error': 'Invalid invitation token'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            set_user_password(user, serializer.validated_data['new_password'])
+            # The link was delivered to this address
+            user.is_email_verified = True
+            user.save(update_fields=['password', 'is_email_verified'])
+            
+            return Response({
+                'message': 'Invitation accepted'
+            }, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -249,6 +315,13 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         return self.request.user.profile
+    
+    def retrieve(self, request, *args, **kwargs):
+        return user_payload_response(request, request.user, part='profile')
+    
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_user_payload(self.request.user.pk)
 
 
 class UserDetailView(generics.RetrieveUpdateAPIView):
@@ -260,6 +333,108 @@ class UserDetailView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         return self.request.user
+    
+    def retrieve(self, request, *args, **kwargs):
+        return user_payload_response(request, request.user)
+    
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_user_payload(self.request.user.pk)
+
+
+class CandidateSearchView(generics.ListAPIView):
+    """
+    Candidate search by skills, location and experience for recruiters.
+    """
+    permission_classes = [IsRecruiter]
+    serializer_class = CandidateSerializer
+    pagination_class = CandidateCursorPagination
+    
+    def get_queryset(self):
+        params = CandidateSearchSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        
+        queryset = UserProfile.objects.with_user().filter(
+            user__user_type=User.UserType.CANDIDATE,
+            user__is_active=True,
+        )
+        if filters.get('skills'):
+            wanted = {normalize_skill(name) for name in filters['skills']}
+            resolved = resolve_skills(wanted)
+            if len(resolved) < len(wanted):
+                # A skill nobody has can't match
+                return queryset.none()
+            queryset = queryset.filter(
+                pk__in=ProfileSkill.objects.profiles_with_all(resolved.values())
+            )
+        if filters.get('location'):
+            queryset = queryset.filter(location__icontains=filters['location'])
+        if filters.get('min_experience') is not None:
+            queryset = queryset.filter(experience_years__gte=filters['min_experience'])
+        if filters.get('max_experience') is not None:
+            queryset = queryset.filter(experience_years__lte=filters['max_experience'])
+        return queryset
+
+
+class CandidateMatchView(APIView):
+    """
+    Rank all candidates against a job requirement.
+    """
+    permission_classes = [IsRecruiter]
+    
+    def post(self, request):
+        serializer = MatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        requirement = dict(serializer.validated_data)
+        top_k = requirement.pop('top_k')
+        
+        matches = match_candidates(k=top_k, **requirement)
+        profiles = UserProfile.objects.with_user().in_bulk([profile_id for profile_id, _, _ in matches])
+        results = [
+            {
+                'score': score,
+                'breakdown': breakdown,
+                'candidate': CandidateSerializer(profiles[profile_id]).data,
+            }
+            for profile_id, score, breakdown in matches
+            # Skip profiles deleted since the matrix was built
+            if profile_id in profiles
+        ]
+        return Response({'results': results})
+
+
+class UserExportView(APIView):
+    """
+    Stream all users and profiles as CSV, JSONL or Parquet.
+    
+    ``?since=<ISO datetime>`` limits the export to users changed after that
+    time; pass the ``X-Export-Watermark`` header of the previous export.
+    """
+    permission_classes = [IsAdmin]
+    
+    def get(self, request, file_format):
+        since = request.query_params.get('since') or None
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                # Well formed, but not a real date or time
+                since = None
+            if since is None:
+                return Response({'error': 'since must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        
+        try:
+            chunks, watermark = start_export(file_format, since=since)
+        except ExportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[file_format])
+        response['Content-Disposition'] = f'attachment; filename="users.{file_format}"'
+        response['X-Export-Watermark'] = watermark.isoformat()
+        return response
 
 
 class PasswordChangeView(APIView):
@@ -272,8 +447,8 @@ class PasswordChangeView(APIView):
         serializer = PasswordChangeSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             user = request.user
-            user.set_password(serializer.validated_data['new_password'])
-            user.save()
+            set_user_password(user, serializer.validated_data['new_password'])
+            user.save(update_fields=['password'])
             
             return Response({
                 'message': 'Password changed successfully'
@@ -288,7 +463,7 @@ def user_info(request):
     """
     Get current user information.
     """
-    return Response(UserSerializer(request.user).data)
+    return user_payload_response(request, request.user)
 
 
 @api_view(['POST'])
@@ -307,19 +482,10 @@ def resend_verification(request):
             return Response({'error': 'Email is already verified'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Generate new verification token
-        token = get_random_string(64)
-        user.email_verification_token = token
-        user.save()
+        token = UserToken.objects.issue(user, UserToken.Purpose.EMAIL_VERIFICATION)
         
-        # Send verification email
-        verification_url = f"http://localhost:8000/api/auth/verify-email/{token}/"
-        send_mail(
-            'Verify your email - HireIQ',
-            f'Click the following link to verify your email: {verification_url}',
-            'noreply@hireiq.com',
-            [user.email],
-            fail_silently=True,
-        )
+        # Queue verification email
+        send_verification_email(user, token)
         
         return Response({'message': 'Verification email sent'}, status=status.HTTP_200_OK)
     except User.DoesNotExist:
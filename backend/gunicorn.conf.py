@@ -0,0 +1,142 @@
+"""
+Gunicorn configuration, read from the working directory (``/app`` in the
+Docker image) or passed with ``--config``.
+
+The master imports Django and everything a first request would, once
+(``preload_app``, see ``hireiq_backend.lazy.preload``), then freezes the
+garbage collector so forked workers share those pages copy-on-write
+instead of each importing Django, DRF, drf-spectacular and the admin on
+its own. Workers are recycled after ``GUNICORN_MAX_REQUESTS``
+requests, with jitter so they do not all restart at once; with preload a
+recycled worker is a fork, not a fresh import.
+
+``GUNICORN_WORKER_CLASS`` picks the worker type: ``gthread`` (default) or
+``sync`` serve the WSGI app; ``uvicorn`` serves the ASGI app and the async
+views (the default when ``SERVER_MODE=asgi``).
+"""
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+# Module-level names are read as settings; ``config`` is one of them
+import decouple
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn_worker.UvicornWorker',
+}
+
+_worker = decouple.config(
+    'GUNICORN_WORKER_CLASS',
+    default='uvicorn' if decouple.config('SERVER_MODE', default='wsgi') == 'asgi' else 'gthread',
+)
+if _worker not in WORKER_CLASSES:
+    raise RuntimeError(f'GUNICORN_WORKER_CLASS must be one of {", ".join(WORKER_CLASSES)}')
+worker_class = WORKER_CLASSES[_worker]
+if _worker == 'uvicorn':
+    wsgi_app = 'hireiq_backend.asgi:application'
+    os.environ['SERVER_MODE'] = 'asgi'
+else:
+    wsgi_app = 'hireiq_backend.wsgi:application'
+    os.environ['SERVER_MODE'] = 'wsgi'
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = decouple.config('GUNICORN_WORKERS', default=multiprocessing.cpu_count() + 1, cast=int)
+threads = decouple.config('GUNICORN_THREADS', default=4, cast=int)  # gthread only
+timeout = decouple.config('GUNICORN_TIMEOUT', default=60, cast=int)
+graceful_timeout = 30
+keepalive = 5
+
+# Requests a worker serves at once, for the settings sized from it (see
+# api.hashing). A sync worker serves one; under uvicorn, Django runs sync
+# views and sync_to_async calls on a single thread per worker.
+os.environ['SERVER_WORKERS'] = str(workers)
+os.environ['SERVER_THREADS'] = str(threads if _worker == 'gthread' else 1)
+
+preload_app = decouple.config('GUNICORN_PRELOAD', default=True, cast=bool)
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=2000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=200, cast=int)
+
+# Heartbeat files on tmpfs; a slow overlay filesystem can stall workers
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = decouple.config('GUNICORN_ACCESS_LOG', default=None)
+errorlog = '-'
+
+# Workers write their request metrics here for /api/metrics/ to merge
+# (see api.metrics). One directory per server, emptied when it starts and
+# removed when it stops.
+_metrics_dir = os.environ.setdefault('METRICS_DIR', os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), f'hireiq-metrics-{os.getpid()}',
+))
+
+if preload_app:
+    # No collections while the app is imported, so the objects the workers
+    # inherit are not touched (and copied) by a collection in the master
+    gc.disable()
+
+
+def on_starting(server):
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir)
+
+
+def on_exit(server):
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+
+
+def when_ready(server):
+    """
+    Runs in the master after the app is loaded, before any worker forks.
+    """
+    if not preload_app:
+        return
+
+    from django.db import connections
+
+    from hireiq_backend.lazy import preload
+
+    # Import every URLconf, view, admin and serializer module once, here
+    preload()
+    _build_matching_matrix(server)
+    # Workers must open their own connections
+    connections.close_all()
+
+    gc.freeze()
+    gc.enable()
+    server.log.info('Preloaded app; %d objects frozen', gc.get_freeze_count())
+
+
+def _build_matching_matrix(server):
+    """
+    Build the host's first shared matching matrix snapshot before workers
+    serve requests (see api.matrix_store); later ones come from
+    ``manage.py compact_matching_matrix``.
+    """
+    from api import matrix_store
+
+    if matrix_store.enabled() and matrix_store.current_snapshot() is None:
+        snapshot = matrix_store.compact()
+        server.log.info('Built matching matrix snapshot %s', snapshot or '(another process is building one)')
+
+
+def post_fork(server, worker):
+    worker.forked_at = time.monotonic()
+
+
+def post_worker_init(worker):
+    worker.log.info(
+        'Worker %s ready in %.0f ms', worker.pid, (time.monotonic() - worker.forked_at) * 1000,
+    )
+
+
+def child_exit(server, worker):
+    from api.metrics import mark_process_dead
+
+    # Keep the exited worker's counts; its replacement starts from zero
+    mark_process_dead(worker.pid, _metrics_dir)
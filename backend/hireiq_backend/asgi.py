@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hireiq_backend.settings')
+# Serve the async variants of the I/O-bound views (see api.async_views)
+os.environ.setdefault('SERVER_MODE', 'asgi')
 
 application = get_asgi_application()
@@ -0,0 +1,97 @@
+"""
+Deferred loading for parts of the project most processes never use.
+
+Every management command, cron run and server worker pays for
+``django.setup()``, and a worker also pays for the URLconf on its first
+request. The admin's autodiscovery (every app's ``admin.py``) and the
+drf-spectacular schema views are only needed when someone opens the admin
+or the API docs, so they load on first use instead. ``preload()`` loads
+everything up front for a server master that forks its workers.
+"""
+import threading
+
+from django.contrib import admin
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.utils.module_loading import import_string
+
+_views = []
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    """
+    ``django.contrib.admin`` without autodiscovery at startup.
+    """
+    default_site = 'hireiq_backend.lazy.LazyAdminSite'
+
+
+class LazyAdminSite(admin.AdminSite):
+    """
+    Admin site that imports the apps' ``admin`` modules when it is first
+    used: a URL under the admin prefix is resolved, or the checks run.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def discover(self):
+        with self._lock:
+            if not self._discovered:
+                admin.autodiscover()
+                self._discovered = True
+
+    @property
+    def urls(self):
+        # URLResolver reads ``urlpatterns`` from the site itself the first
+        # time it resolves under this prefix, not when the URLconf loads
+        return self, 'admin', self.name
+
+    @property
+    def urlpatterns(self):
+        self.discover()
+        return self.get_urls()
+
+    def check(self, app_configs):
+        self.discover()
+        return super().check(app_configs)
+
+
+class LazyView:
+    """
+    URL view for the class-based view at ``view_path``, imported and built
+    on its first request.
+    """
+
+    def __init__(self, view_path, **initkwargs):
+        self.view_path = view_path
+        self.initkwargs = initkwargs
+        self._view = None
+        _views.append(self)
+
+    def load(self):
+        if self._view is None:
+            self._view = import_string(self.view_path).as_view(**self.initkwargs)
+        return self._view
+
+    @property
+    def csrf_exempt(self):
+        # CsrfViewMiddleware reads this from the URL's view before calling
+        # it; answer for the real view (DRF's APIView.as_view() sets it)
+        return getattr(self.load(), 'csrf_exempt', False)
+
+    def __call__(self, request, *args, **kwargs):
+        return self.load()(request, *args, **kwargs)
+
+
+def preload():
+    """
+    Import everything a first request could: the URLconf, views, admin
+    modules and deferred views.
+    """
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    admin.site.discover()
+    for view in _views:
+        view.load()
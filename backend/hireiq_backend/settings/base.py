@@ -2,6 +2,7 @@
 Base settings for HireIQ Backend
 """
 import os
+from datetime import timedelta
 from pathlib import Path
 from decouple import config
 
@@ -13,7 +14,7 @@ SECRET_KEY = config('SECRET_KEY', default='django-insecure-z)i1sf)ai1x3s_u&p+jf_
 
 # Application definition
 DJANGO_APPS = [
-    'django.contrib.admin',
+    'hireiq_backend.lazy.LazyAdminConfig',  # django.contrib.admin, autodiscovered on first use
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -23,6 +24,8 @@ DJANGO_APPS = [
 
 THIRD_PARTY_APPS = [
     'rest_framework',
+    'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'drf_spectacular',
 ]
@@ -34,6 +37,7 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',  # First, so it times everything below
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -79,6 +83,50 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+AUTHENTICATION_BACKENDS = [
+    'api.backends.PooledModelBackend',
+]
+
+# Password hashing: PASSWORD_HASHER picks the hasher for new passwords; the
+# others stay listed so existing hashes verify and are upgraded on login.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+_PBKDF2_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+_ARGON2_HASHERS = ['api.hashers.TunableArgon2PasswordHasher']
+if PASSWORD_HASHER == 'argon2':
+    PASSWORD_HASHERS = _ARGON2_HASHERS + _PBKDF2_HASHERS
+else:
+    PASSWORD_HASHERS = _PBKDF2_HASHERS + _ARGON2_HASHERS
+
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=102400, cast=int)  # KiB
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=8, cast=int)
+
+# Server processes and request threads per process, exported by
+# gunicorn.conf.py (0 = unknown, e.g. runserver)
+SERVER_WORKERS = config('SERVER_WORKERS', default=0, cast=int)
+SERVER_THREADS = config('SERVER_THREADS', default=0, cast=int)
+
+# Hashing runs in a per-process pool of this many workers (0 = inline); see
+# api.hashing. A single-threaded worker would wait for the pool anyway, so it
+# hashes inline; under gunicorn the pools of all workers together get about
+# one process per CPU.
+if SERVER_THREADS == 1:
+    _hashing_workers = 0
+elif SERVER_WORKERS:
+    _hashing_workers = max(1, (os.cpu_count() or 1) // SERVER_WORKERS)
+else:
+    _hashing_workers = 2
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=_hashing_workers, cast=int)
+# Hashes a process runs or queues at once; one thread below SERVER_THREADS so
+# a login burst always leaves a thread for other endpoints
+PASSWORD_HASHING_MAX_PENDING = config(
+    'PASSWORD_HASHING_MAX_PENDING', default=max(SERVER_THREADS - 1, 1) if SERVER_THREADS else 16, cast=int,
+)
+PASSWORD_HASHING_QUEUE_TIMEOUT = config('PASSWORD_HASHING_QUEUE_TIMEOUT', default=0.5, cast=float)
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -96,24 +144,211 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Custom User Model
+AUTH_USER_MODEL = 'api.User'
+
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'api.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Throttle history is kept in the default cache, so it is only enforced
+    # across workers when CACHES points at a shared backend.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'rest_framework.throttling.AnonRateThrottle',
+        'rest_framework.throttling.UserRateThrottle',
+        'rest_framework.throttling.ScopedRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '100/hour',
+        'user': '1000/hour',
+        'auth': '5/minute',  # Rate limit for auth endpoints
+    },
+}
+
+# Cache: Redis when REDIS_URL is set (shared by all workers), otherwise a
+# per-process local-memory stand-in. Both report hit/miss/latency metrics
+# through /api/health/.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'api.cache_backends.InstrumentedRedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'hireiq',
+            'OPTIONS': {
+                # Passed to redis-py's ConnectionPool
+                'max_connections': config('REDIS_MAX_CONNECTIONS', default=50, cast=int),
+                'socket_connect_timeout': config('REDIS_CONNECT_TIMEOUT', default=1.0, cast=float),
+                'socket_timeout': config('REDIS_SOCKET_TIMEOUT', default=1.0, cast=float),
+                'health_check_interval': 30,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'api.cache_backends.InstrumentedLocMemCache',
+            'LOCATION': 'hireiq-default',
+        }
+    }
+
+# JWT Settings
+# With JWT_PRIVATE_KEY_FILE set, tokens are RS256-signed and verifiable by
+# other services through the key set at /api/auth/jwks/ (see api.jwt_keys).
+JWT_PRIVATE_KEY_FILE = config('JWT_PRIVATE_KEY_FILE', default='')
+JWT_PREVIOUS_PUBLIC_KEY_FILES = [
+    path for path in config('JWT_PREVIOUS_PUBLIC_KEY_FILES', default='').split(',') if path
+]
+JWT_KEYS_RELOAD_INTERVAL = config('JWT_KEYS_RELOAD_INTERVAL', default=60, cast=int)
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    'ROTATE_REFRESH_TOKENS': True,
+    'BLACKLIST_AFTER_ROTATION': True,
+    'UPDATE_LAST_LOGIN': False,  # Coalesced by api.last_login instead
+    'ALGORITHM': 'RS256' if JWT_PRIVATE_KEY_FILE else 'HS256',
+    'SIGNING_KEY': SECRET_KEY,  # Only used for HS256
+    'VERIFYING_KEY': None,
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
+    'USER_ID_FIELD': 'id',
+    'USER_ID_CLAIM': 'user_id',
+    'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    'TOKEN_TYPE_CLAIM': 'token_type',
+    'JTI_CLAIM': 'jti',
+    'TOKEN_OBTAIN_SERIALIZER': 'api.serializers.TokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'api.serializers.TokenRefreshSerializer',
+}
+
+# last_login writes are buffered per process and flushed in bulk; a value
+# may lag by up to this many seconds (0 writes synchronously)
+LAST_LOGIN_MAX_STALENESS = config('LAST_LOGIN_MAX_STALENESS', default=30, cast=int)
+LAST_LOGIN_FLUSH_BATCH_SIZE = config('LAST_LOGIN_FLUSH_BATCH_SIZE', default=1000, cast=int)
+
+# Seconds a 'not blacklisted' answer for a refresh token jti is cached. Off
+# without Redis: a per-process cache would not see another worker's logout.
+JWT_BLACKLIST_NEGATIVE_CACHE_SECONDS = config(
+    'JWT_BLACKLIST_NEGATIVE_CACHE_SECONDS', default=60 if REDIS_URL else 0, cast=int,
+)
+
+# Seconds a serialized user payload stays cached (see api.user_cache)
+USER_PAYLOAD_CACHE_TIMEOUT = config('USER_PAYLOAD_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds between checks for skill taxonomy edits made by other processes
+SKILL_INDEX_CHECK_INTERVAL = config('SKILL_INDEX_CHECK_INTERVAL', default=30, cast=int)
+
+# Candidate matching (see api.matching)
+MATCHING_DEFAULT_WEIGHTS = {
+    'required_skills': 0.6,
+    'preferred_skills': 0.2,
+    'experience': 0.15,
+    'location': 0.05,
 }
+# Seconds a worker reuses its candidate matrix before rebuilding it
+MATCHING_MATRIX_TTL = config('MATCHING_MATRIX_TTL', default=300, cast=int)
+# Directory holding a memory-mapped matrix shared by all workers on the host
+# (see api.matrix_store); when empty each worker keeps a private copy
+MATCHING_MATRIX_DIR = config('MATCHING_MATRIX_DIR', default='')
+# Journaled profile changes before compact_matching_matrix folds them in
+MATCHING_COMPACT_THRESHOLD = config('MATCHING_COMPACT_THRESHOLD', default=10000, cast=int)
+# Seconds between a worker's reads of the change journal (the MatrixChange table)
+MATCHING_JOURNAL_POLL_INTERVAL = config('MATCHING_JOURNAL_POLL_INTERVAL', default=1.0, cast=float)
+# Seconds journaled changes are kept; every host must compact more often
+MATCHING_JOURNAL_RETENTION = config('MATCHING_JOURNAL_RETENTION', default=86400, cast=int)
+
+# Admin changelists above this many rows show the planner's estimated count
+ADMIN_APPROXIMATE_COUNT_THRESHOLD = config('ADMIN_APPROXIMATE_COUNT_THRESHOLD', default=100000, cast=int)
+
+# Bulk user import (see api.imports)
+IMPORT_CHUNK_SIZE = config('IMPORT_CHUNK_SIZE', default=500, cast=int)
+IMPORT_MAX_STORED_ERRORS = config('IMPORT_MAX_STORED_ERRORS', default=1000, cast=int)
+
+# 'asgi' routes the I/O-bound endpoints to async views (api.async_views);
+# hireiq_backend/asgi.py sets it, so only override it for testing
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+
+# JSON engine for API responses and request bodies: 'auto' uses orjson when
+# installed, 'json' forces the standard library (see api.renderers)
+JSON_ENGINE = config('JSON_ENGINE', default='auto')
+
+# Serialize users, profiles and candidates through compiled read plans
+# (see api.serializer_plans); turn off to use DRF's field-by-field path
+SERIALIZER_PLANS = config('SERIALIZER_PLANS', default=True, cast=bool)
+
+# Per-route request metrics served at /api/metrics/ (see api.metrics). With
+# METRICS_DIR set, every process writes its totals there every
+# METRICS_FLUSH_INTERVAL seconds and the endpoint reports them together;
+# gunicorn.conf.py sets it for its workers. Scrapers must send
+# "Authorization: Bearer <METRICS_TOKEN>"; unset, only DEBUG serves metrics.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=float)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Slow-query capture (see api.slow_queries): queries taking at least
+# SLOW_QUERY_THRESHOLD_MS are saved with their view and stack, browsable in
+# the admin and with `manage.py slow_queries`. SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+# of them also get an EXPLAIN plan; the newest SLOW_QUERY_BUFFER_SIZE are kept.
+# On by default in production only (each capture is an INSERT).
+SLOW_QUERY_ENABLED = config('SLOW_QUERY_ENABLED', default=False, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=float)
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = config('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', default=0.2, cast=float)
+SLOW_QUERY_BUFFER_SIZE = config('SLOW_QUERY_BUFFER_SIZE', default=500, cast=int)
+
+# Median cold-start budgets checked by `manage.py import_report --check`, as
+# multiples of a bare Django ORM + DRF import timed on the same machine:
+# django.setup() alone (management commands, cron) and the WSGI app + URLconf.
+# Measured at about 1.45x and 1.7x; absolute times vary by machine and load.
+COLD_START_BUDGET = {
+    'setup': config('COLD_START_BUDGET_SETUP', default=1.75, cast=float),
+    'wsgi': config('COLD_START_BUDGET_WSGI', default=2.1, cast=float),
+}
+
+# Rows fetched and encoded per chunk by streaming exports (see api.exports)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Seconds an export watermark is set back: rows saved by transactions that
+# ran longer than this when the export started may be missed
+EXPORT_WATERMARK_OVERLAP = config('EXPORT_WATERMARK_OVERLAP', default=300, cast=int)
 
 # CORS settings
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='http://localhost:3000,http://127.0.0.1:3000').split(',')
 CORS_ALLOW_CREDENTIALS = True
 
+# Lifetime (seconds) of single-use tokens emailed to users
+EMAIL_VERIFICATION_TIMEOUT = config('EMAIL_VERIFICATION_TIMEOUT', default=60 * 60 * 24 * 3, cast=int)
+PASSWORD_RESET_TIMEOUT = config('PASSWORD_RESET_TIMEOUT', default=60 * 60, cast=int)
+INVITATION_TIMEOUT = config('INVITATION_TIMEOUT', default=60 * 60 * 24 * 14, cast=int)
+
+# Email outbox: views queue EmailJob rows, `manage.py process_email_outbox` delivers them
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@hireiq.com')
+EMAIL_OUTBOX_BACKEND = config('EMAIL_OUTBOX_BACKEND', default=None)  # Falls back to EMAIL_BACKEND
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_BACKOFF = config('EMAIL_OUTBOX_RETRY_BACKOFF', default=30, cast=int)  # Seconds, doubled per attempt
+EMAIL_OUTBOX_RETRY_BACKOFF_MAX = config('EMAIL_OUTBOX_RETRY_BACKOFF_MAX', default=3600, cast=int)
+EMAIL_OUTBOX_LEASE_SECONDS = config('EMAIL_OUTBOX_LEASE_SECONDS', default=300, cast=int)
+EMAIL_FILE_PATH = BASE_DIR / 'logs' / 'emails'  # Used by the filebased backend
+
 # API Documentation
 SPECTACULAR_SETTINGS = {
     'TITLE': 'HireIQ API',
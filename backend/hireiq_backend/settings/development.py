@@ -1,6 +1,8 @@
 """
 Development settings for HireIQ Backend
 """
+import sys
+
 from .base import *
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -23,8 +25,12 @@ DATABASES = {
     }
 }
 
-# Add debug toolbar for development
-if DEBUG:
+# Add debug toolbar for development; only the dev server needs it, so other
+# management commands (migrate, shell, cron jobs) skip importing it
+SERVING = not sys.argv[0].endswith('manage.py') or sys.argv[1:2] == ['runserver']
+DEBUG_TOOLBAR = config('DEBUG_TOOLBAR', default=SERVING, cast=bool)
+
+if DEBUG and DEBUG_TOOLBAR:
     INSTALLED_APPS += ['debug_toolbar']
     MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
     INTERNAL_IPS = ['127.0.0.1', 'localhost']
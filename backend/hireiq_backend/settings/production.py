@@ -11,6 +11,12 @@ ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='').split(',')
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+
+# Set when DB_HOST points at pgbouncer in transaction pooling mode: consecutive
+# transactions may run on different server connections, so named server-side
+# cursors (used by QuerySet.iterator()) cannot be kept open across them.
+DB_PGBOUNCER_TRANSACTION_POOLING = config('DB_PGBOUNCER_TRANSACTION_POOLING', default=False, cast=bool)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -19,12 +25,23 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Persistent connections, reused across requests for up to this many
+        # seconds. Off under ASGI, where each request runs its queries in a new
+        # thread that would leave its connection behind; pool with PgBouncer.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0 if SERVER_MODE == 'asgi' else 600, cast=int),
+        # Verify a reused connection at the start of each request
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER_TRANSACTION_POOLING,
         'OPTIONS': {
-            'CONN_MAX_AGE': 600,  # Connection pooling
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
         },
     }
 }
 
+# A shared cache is required so throttles and cached payloads are common
+# to all workers (base.py selects the Redis backend when this is set)
+REDIS_URL = config('REDIS_URL')
+
 # Security settings for production
 SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
@@ -33,6 +50,9 @@ SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
 
+# Capture slow queries unless turned off (see base.py)
+SLOW_QUERY_ENABLED = config('SLOW_QUERY_ENABLED', default=True, cast=bool)
+
 # Static files
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
@@ -16,10 +16,23 @@ DATABASES = {
     }
 }
 
+# Tests never share a Redis instance
+CACHES = {
+    'default': {
+        'BACKEND': 'api.cache_backends.InstrumentedLocMemCache',
+        'LOCATION': 'hireiq-tests',
+    }
+}
+
 # Disable password hashing for faster tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
+PASSWORD_HASHING_WORKERS = 0
+
+# The recorder saves from a thread of its own, which can't see the
+# per-connection in-memory database
+SLOW_QUERY_ENABLED = False
 
 # Email backend for testing
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
@@ -18,20 +18,28 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+from api.views import JWKSView
+
+from .lazy import LazyView
 
 urlpatterns = [
+    # Admin modules and the schema views load on first use (see lazy.py)
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('.well-known/jwks.json', JWKSView.as_view(), name='jwks'),
+    path('api/schema/', LazyView('drf_spectacular.views.SpectacularAPIView'), name='schema'),
+    path(
+        'api/docs/',
+        LazyView('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'),
+        name='swagger-ui',
+    ),
 ]
 
 # Add debug toolbar URLs in development
-if settings.DEBUG:
-    import debug_toolbar
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     urlpatterns += [
-        path('__debug__/', include(debug_toolbar.urls)),
+        path('__debug__/', include('debug_toolbar.urls')),
     ]
 
 # Serve static and media files in development